@@ -0,0 +1,198 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+
+from anomaly_tracker import drill_plan
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    series_id TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    ended_at REAL
+);
+CREATE TABLE IF NOT EXISTS anomalies (
+    id INTEGER PRIMARY KEY,
+    series_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    type TEXT,
+    player TEXT,
+    message TEXT
+);
+-- Covers the summary queries: range on (series_id, ts), grouped by type or player
+CREATE INDEX IF NOT EXISTS anomalies_series_ts ON anomalies (series_id, ts, type, player);
+"""
+
+_STOP = object()
+
+
+class AnomalyStore:
+    """
+    Anomalies persisted in a local SQLite database (WAL mode).
+
+    add() only puts the row on an in-memory queue; a writer thread drains it
+    and commits up to batch_size rows per transaction, so the telemetry loop
+    never waits on disk. When the queue is full new rows are dropped and
+    counted rather than blocking the caller.
+
+    Anomalies are stored once per series. A session is a (series_id,
+    started_at, ended_at) window over them, so any number of coaches can run
+    overlapping sessions on the same series without touching each other.
+    """
+
+    def __init__(self, path, batch_size=256, flush_interval=0.5, max_queue=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._writer = None
+        self._start_lock = threading.Lock()
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.errors = 0
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @classmethod
+    def from_env(cls):
+        """
+        Store at AEGIS_ANOMALY_DB (default anomalies.db next to this file),
+        batching AEGIS_ANOMALY_BATCH rows. Returns None when AEGIS_ANOMALY_DB is empty.
+        """
+        path = os.getenv('AEGIS_ANOMALY_DB', os.path.join(os.path.dirname(__file__), 'anomalies.db'))
+        if not path:
+            return None
+        return cls(
+            path,
+            batch_size=int(os.getenv('AEGIS_ANOMALY_BATCH', '256')),
+            max_queue=int(os.getenv('AEGIS_ANOMALY_QUEUE', '10000')),
+        )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        # WAL lets readers run while the writer commits; NORMAL is durable across app crashes
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _ensure_writer(self):
+        if self._writer is not None:
+            return
+        with self._start_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name='aegis-anomaly-writer', daemon=True)
+                self._writer.start()
+
+    def add(self, series_id, anomaly, ts=None):
+        """Queue one anomaly for the series; never blocks"""
+        self._ensure_writer()
+        row = (str(series_id), ts if ts is not None else time.time(),
+               anomaly.get('type'), anomaly.get('player'), anomaly.get('message'))
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        conn = self._connect()
+        stop = False
+        while not stop:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [row for row in batch if row is not _STOP]
+            stop = len(rows) != len(batch)
+            try:
+                if rows:
+                    with conn:
+                        conn.execute("BEGIN")
+                        conn.executemany(
+                            "INSERT INTO anomalies (series_id, ts, type, player, message) VALUES (?, ?, ?, ?, ?)", rows
+                        )
+                    self.written += len(rows)
+                    self.batches += 1
+            except sqlite3.Error as e:
+                self.errors += 1
+                print(f"✗ Anomaly store write failed ({len(rows)} rows): {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    def flush(self):
+        """Block until every anomaly queued so far is committed"""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self):
+        """Flush and stop the writer thread"""
+        if self._writer is None:
+            return
+        self._queue.put(_STOP)
+        self._writer.join()
+        self._writer = None
+
+    def start_session(self, series_id):
+        """New session over the series' anomalies from now on; returns its id"""
+        session_id = uuid.uuid4().hex
+        with closing(self._connect()) as conn:
+            conn.execute("INSERT INTO sessions (id, series_id, started_at) VALUES (?, ?, ?)",
+                         (session_id, str(series_id), time.time()))
+        return session_id
+
+    def end_session(self, session_id):
+        """Close the session (first call wins) and return its summary, or None if unknown"""
+        with closing(self._connect()) as conn:
+            conn.execute("UPDATE sessions SET ended_at = ? WHERE id = ? AND ended_at IS NULL",
+                         (time.time(), session_id))
+        return self.summary(session_id)
+
+    def summary(self, session_id):
+        """Per-type and per-player counts of the session's anomalies, plus the drill plan"""
+        self.flush()
+        with closing(self._connect()) as conn:
+            session = conn.execute("SELECT series_id, started_at, ended_at FROM sessions WHERE id = ?",
+                                   (session_id,)).fetchone()
+            if session is None:
+                return None
+            series_id, started_at, ended_at = session
+            window = (series_id, started_at, ended_at if ended_at is not None else time.time())
+            by_type = dict(conn.execute(
+                "SELECT type, COUNT(*) FROM anomalies WHERE series_id = ? AND ts BETWEEN ? AND ? GROUP BY type", window
+            ).fetchall())
+            by_player = dict(conn.execute(
+                "SELECT player, COUNT(*) FROM anomalies WHERE series_id = ? AND ts BETWEEN ? AND ? "
+                "AND player IS NOT NULL GROUP BY player", window
+            ).fetchall())
+        duration = int(window[2] - started_at)
+        return {
+            "session_id": session_id,
+            "series_id": series_id,
+            "match_duration": f"{duration // 60}:{duration % 60:02d}",
+            "total_anomalies": sum(by_type.values()),
+            "anomalies_by_type": by_type,
+            "anomalies_by_player": by_player,
+            "drill_plan": drill_plan(by_type),
+            "status": "Ready for Export" if ended_at is not None else "In Progress",
+        }
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
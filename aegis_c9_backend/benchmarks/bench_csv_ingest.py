@@ -0,0 +1,91 @@
+"""
+LoL training ingest time: sequential read_csv vs the parallel cached loader.
+
+Writes --files synthetic match CSVs of --rows rows (or uses --data, a
+directory of CSVs), then times Phase 1 of train_lol_model.py three ways:
+the previous sequential pd.read_csv(low_memory=False) + concat, a cold
+csv_cache.load_csvs run (empty cache, every file parsed in the pool) and a
+warm run (every file served from the columnar cache). Checks that all three
+produce the same values for the columns training uses.
+
+Usage: python benchmarks/bench_csv_ingest.py [--files N] [--rows N] [--workers N] [--data DIR]
+"""
+import argparse
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from csv_cache import CACHE_FORMAT, load_csvs
+from feature_spec import LOL_SPEC
+
+CSV_DTYPES = {**{name: 'float64' for name in LOL_SPEC.inputs}, 'win': 'object'}
+
+
+def write_matches(directory, files, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    for part in range(files):
+        df = pd.DataFrame({name: rng.integers(0, 20000, rows) for name in LOL_SPEC.inputs})
+        df['kill_participation'] = rng.random(rows)
+        df['win'] = np.where(rng.random(rows) < 0.5, 'TRUE', 'FALSE')
+        # Columns training never reads, as in the real exports
+        for i in range(8):
+            df[f'extra_{i}'] = rng.random(rows)
+        df['champion'] = rng.choice(['Aatrox', 'Ahri', 'Jinx', 'Thresh'], rows)
+        df.to_csv(os.path.join(directory, f'part{part}.csv'), index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=6)
+    parser.add_argument('--rows', type=int, default=150000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--data', help='directory of match CSVs to use instead of synthetic ones')
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    try:
+        data_dir = args.data
+        if data_dir is None:
+            data_dir = os.path.join(tmp, 'matches')
+            os.makedirs(data_dir)
+            write_matches(data_dir, args.files, args.rows)
+        paths = sorted(glob.glob(os.path.join(data_dir, '*.csv')))
+        cache_dir = os.path.join(tmp, 'cache')
+
+        start = time.perf_counter()
+        baseline = pd.concat([pd.read_csv(p, low_memory=False) for p in paths], axis=0, ignore_index=True)
+        sequential = time.perf_counter() - start
+
+        runs = {}
+        for name in ('cold', 'warm'):
+            start = time.perf_counter()
+            df, infos = load_csvs(paths, cache_dir, dtype=CSV_DTYPES, columns=list(CSV_DTYPES), workers=args.workers)
+            runs[name] = (time.perf_counter() - start, sum(i['cached'] for i in infos), df)
+    finally:
+        shutil.rmtree(tmp)
+
+    # read_csv infers TRUE/FALSE as bool, the loader keeps the text; clean_boolean maps both alike
+    numeric = [c for c in LOL_SPEC.inputs if c in baseline.columns]
+    for name, (_, _, df) in runs.items():
+        pd.testing.assert_frame_equal(df[numeric], baseline[numeric].astype('float64'))
+        assert (df['win'].astype(str).str.upper() == baseline['win'].astype(str).str.upper()).all()
+
+    print("=" * 72)
+    print(f"{len(paths)} files, {len(baseline):,} rows, {os.cpu_count()} CPUs, cache format {CACHE_FORMAT}")
+    print("=" * 72)
+    print(f"{'run':<22} {'cached':>7} {'seconds':>9} {'speedup':>9}")
+    print(f"{'sequential read_csv':<22} {'-':>7} {sequential:>9.2f} {'1.00x':>9}")
+    for name, (seconds, cached, _) in runs.items():
+        print(f"{f'load_csvs ({name})':<22} {f'{cached}/{len(paths)}':>7} {seconds:>9.2f} {sequential / seconds:>8.2f}x")
+    print("✓ Same values for every training column")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Time to training-ready features: re-deriving them from CSVs vs the feature store.
+
+For each --sizes row count, writes synthetic LoL match CSVs and times
+  rebuild   load_csvs (warm columnar cache) + Phases 2-4 of train_lol_model.py:
+            dropna, feature kernel, inf handling, clip_outliers
+  open      FeatureStore.open + frame() over the memory-mapped columns
+  read      open, then touching every value (the cost once training reads it)
+The stored frame is checked to equal the rebuilt one.
+
+Usage: python benchmarks/bench_feature_store.py [--sizes 100000,1000000] [--repeats N]
+"""
+import argparse
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_streaming_memory import CRITICAL_FEATURES, CSV_DTYPES, write_matches
+from csv_cache import load_csvs
+from feature_spec import LOL_SPEC
+from feature_store import FeatureStore, feature_key
+from incremental_training import file_keys
+from training_prep import clean_boolean, clip_outliers
+
+
+def rebuild(paths, cache_dir):
+    df, _ = load_csvs(paths, cache_dir, dtype=CSV_DTYPES, columns=list(CSV_DTYPES))
+    df = df.dropna(subset=CRITICAL_FEATURES)
+    df['Target'] = clean_boolean(df['win'])
+    df[LOL_SPEC.feature_names] = LOL_SPEC.bind().transform(df)
+    df = df.dropna(subset=LOL_SPEC.feature_names + ['Target'])
+    X = df[LOL_SPEC.feature_names].replace([np.inf, -np.inf], 0).fillna(0)
+    return clip_outliers(X, z=3), df['Target']
+
+
+def best(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='100000,1000000')
+    parser.add_argument('--file-rows', type=int, default=250000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"{len(LOL_SPEC.feature_names)} LoL features, best of {args.repeats}")
+    print("=" * 70)
+    print(f"{'rows':>10} {'rebuild ms':>11} {'open ms':>9} {'read ms':>9} {'speedup':>9} {'store MB':>9}")
+    for rows in (int(s) for s in args.sizes.split(',')):
+        tmp = tempfile.mkdtemp()
+        try:
+            write_matches(tmp, rows, args.file_rows)
+            paths = sorted(glob.glob(os.path.join(tmp, '*.csv')))
+            cache_dir = os.path.join(tmp, 'cache')
+            rebuild(paths, cache_dir)  # warms the columnar CSV cache, as on any second run
+
+            rebuild_s, (X, y) = best(lambda: rebuild(paths, cache_dir), args.repeats)
+            store = FeatureStore(os.path.join(tmp, 'store'))
+            key = feature_key(LOL_SPEC.features, file_keys(paths))
+            store.save('lol', key, X, y)
+
+            open_s, frame = best(lambda: store.open('lol', key).frame(), args.repeats)
+            read_s, _ = best(lambda: store.open('lol', key).frame().to_numpy().sum(), args.repeats)
+            pd.testing.assert_frame_equal(frame, X.reset_index(drop=True))
+            size = sum(os.path.getsize(p) for p in glob.glob(os.path.join(store.path('lol', key), '*')))
+            print(f"{rows:>10,} {rebuild_s*1e3:>11.0f} {open_s*1e3:>9.1f} {read_s*1e3:>9.1f} "
+                  f"{rebuild_s/open_s:>8.0f}x {size/1e6:>9.1f}")
+        finally:
+            shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main()
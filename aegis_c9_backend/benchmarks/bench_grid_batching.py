@@ -0,0 +1,108 @@
+"""
+Upstream GRID requests and tick latency: one query per series vs batched.
+
+Starts a local stub GraphQL server that answers after --latency seconds and
+resolves both `series(id: $id)` and aliased `s<i>: series(id: $id<i>)`
+fields. Every tick fetches all tracked series concurrently through
+bridge.fetch_aegis_data_async, either directly (one round trip per series)
+or through a GridBatcher (one aliased query per tick).
+
+Usage: python benchmarks/bench_grid_batching.py [--ticks N] [--latency S] [--series 1,5,20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bridge
+from grid_client import GridBatcher, GridClient
+
+
+class StubGraphQL(BaseHTTPRequestHandler):
+    latency = 0.02
+    requests = 0
+    bytes_in = 0
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers['Content-Length']))
+        StubGraphQL.requests += 1
+        StubGraphQL.bytes_in += len(raw)
+        variables = json.loads(raw)['variables']
+        time.sleep(StubGraphQL.latency)
+        data = {
+            ('series' if name == 'id' else f's{name[2:]}'): {"id": value, "status": "live", "teams": []}
+            for name, value in variables.items() if name.startswith('id')
+        }
+        body = json.dumps({"data": data}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    # The default listen backlog (5) resets connections in the per-series runs
+    request_queue_size = 128
+
+
+async def run(url, n_series, ticks, batched):
+    async with GridClient(url=url, api_key='bench', max_concurrency=n_series) as client:
+        batcher = GridBatcher(client, 'series', bridge.LIVE_SERIES_FIELDS, window=0.005,
+                              variables=bridge.LIVE_SERIES_VARIABLES) if batched else None
+        series_ids = [str(2616372 + i) for i in range(n_series)]
+        StubGraphQL.requests = StubGraphQL.bytes_in = 0
+        tick_ms = []
+        for _ in range(ticks):
+            start = time.perf_counter()
+            if batched:
+                await asyncio.gather(*(bridge.fetch_aegis_data_async(s, batcher=batcher) for s in series_ids))
+            else:
+                await asyncio.gather(*(bridge.fetch_aegis_data_async(s, client=client) for s in series_ids))
+            tick_ms.append((time.perf_counter() - start) * 1000)
+        return StubGraphQL.requests, StubGraphQL.bytes_in, statistics.median(tick_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--ticks', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--series', default='1,5,20')
+    args = parser.parse_args()
+
+    StubGraphQL.latency = args.latency
+    server = StubServer(('127.0.0.1', 0), StubGraphQL)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/graphql"
+
+    rows = []
+    real_stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+    try:
+        for n_series in (int(s) for s in args.series.split(',')):
+            for batched in (False, True):
+                rows.append((n_series, batched, *asyncio.run(run(url, n_series, args.ticks, batched))))
+    finally:
+        sys.stdout = real_stdout
+        server.shutdown()
+
+    print("=" * 72)
+    print(f"{args.ticks} ticks, stub latency {args.latency * 1000:.0f} ms")
+    print("=" * 72)
+    print(f"{'series':>6} {'mode':>10} {'requests':>9} {'req/tick':>9} {'KB sent':>9} {'p50 tick (ms)':>14}")
+    for n_series, batched, requests, bytes_in, p50 in rows:
+        print(f"{n_series:>6} {'batched' if batched else 'per-series':>10} {requests:>9} "
+              f"{requests / args.ticks:>9.1f} {bytes_in / 1024:>9.1f} {p50:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Wall-clock and holdout quality: full retrain vs incremental continued training.
+
+Builds --tournaments synthetic tournaments of --rows rows as the training
+history and one new tournament whose win relationship has drifted. The base
+model is 100 trees trained on the history (as train_*_model.py does); then
+the new tournament arrives and the model is updated two ways:
+
+  full retrain   100 new trees over history + new rows (the old behaviour)
+  incremental    --rounds trees added to the base using only the new rows
+                 plus a --replay sample of the history (--incremental)
+
+Both are scored on a held-out 20% of the new tournament, next to the base
+model left as it was.
+
+Usage: python benchmarks/bench_incremental_training.py [--tournaments N] [--rows N] [--rounds N] [--replay F]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from incremental_training import continue_training, training_rows
+
+PARAMS = dict(objective='binary:logistic', eval_metric='logloss', random_state=42, max_depth=5, learning_rate=0.1)
+FEATURES = [f'f{i}' for i in range(11)]
+
+
+def tournament(rows, seed, drift=0.0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(rows, len(FEATURES))), columns=FEATURES)
+    # A later meta shifts weight from f1 to f2 and makes f3 matter non-linearly
+    logit = X['f0'] + (0.8 - drift) * X['f1'] + drift * X['f2'] + drift * (X['f3'] ** 2 - 1) + 0.3 * X['f4'] * X['f5']
+    y = (logit + rng.logistic(size=rows) * 0.7 > 0).astype(int)
+    return X, y
+
+
+def score(model, X, y):
+    from sklearn.metrics import log_loss, roc_auc_score
+    proba = model.predict_proba(X)[:, 1]
+    return roc_auc_score(y, proba), log_loss(y, proba)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tournaments', type=int, default=8)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--replay', type=float, default=0.1)
+    parser.add_argument('--drift', type=float, default=0.6)
+    args = parser.parse_args()
+
+    import xgboost as xgb
+
+    history = [tournament(args.rows, seed) for seed in range(args.tournaments)]
+    X_hist = pd.concat([X for X, _ in history], ignore_index=True)
+    y_hist = pd.concat([y for _, y in history], ignore_index=True)
+    X_new, y_new = tournament(args.rows, seed=1000, drift=args.drift)
+    split = int(len(X_new) * 0.8)
+    X_fit, y_fit, X_hold, y_hold = X_new[:split], y_new[:split], X_new[split:], y_new[split:]
+
+    tmp = tempfile.mkdtemp()
+    try:
+        base_path = os.path.join(tmp, 'lol_model.json')
+        start = time.perf_counter()
+        base = xgb.XGBClassifier(n_estimators=100, **PARAMS).fit(X_hist, y_hist)
+        base_seconds = time.perf_counter() - start
+        base.save_model(base_path)
+
+        X_all = pd.concat([X_hist, X_fit], ignore_index=True)
+        y_all = pd.concat([y_hist, y_fit], ignore_index=True)
+        start = time.perf_counter()
+        full = xgb.XGBClassifier(n_estimators=100, **PARAMS).fit(X_all, y_all)
+        full_seconds = time.perf_counter() - start
+
+        sources = np.repeat(['history', 'new'], [len(X_hist), len(X_fit)])
+        start = time.perf_counter()
+        keep = training_rows(sources, ['new'], args.replay)
+        incremental = continue_training(base_path, X_all[keep], y_all[keep], args.rounds, **PARAMS)
+        incremental_seconds = time.perf_counter() - start
+    finally:
+        shutil.rmtree(tmp)
+
+    print("=" * 72)
+    print(f"history {len(X_hist):,} rows, new tournament {len(X_new):,} rows "
+          f"(holdout {len(X_hold):,}), {os.cpu_count()} CPUs")
+    print(f"incremental: +{args.rounds} trees on {int(keep.sum()):,} rows (replay {args.replay:.0%} of history)")
+    print("=" * 72)
+    print(f"{'model':<16} {'trees':>6} {'train s':>9} {'speedup':>9} {'holdout AUC':>12} {'logloss':>9}")
+    for name, model, seconds in (("base (stale)", base, base_seconds),
+                                 ("full retrain", full, full_seconds),
+                                 ("incremental", incremental, incremental_seconds)):
+        auc, loss = score(model, X_hold, y_hold)
+        speedup = f"{full_seconds / seconds:.1f}x" if name != "base (stale)" else '-'
+        print(f"{name:<16} {model.get_booster().num_boosted_rounds():>6} {seconds:>9.2f} {speedup:>9} {auc:>12.4f} {loss:>9.4f}")
+
+
+if __name__ == '__main__':
+    main()
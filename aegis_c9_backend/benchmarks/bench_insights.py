@@ -0,0 +1,112 @@
+"""
+Added per-request latency of Tree SHAP insights on /lol-predictions.
+
+Scores --requests distinct LoL game states through LoLPredictor.predict with
+and without explain=True (prediction cache off, so every request hits the
+booster) and reports p50/p99 latency. Exits non-zero when explain adds more
+than --max-added-ms at p99, so it can gate CI.
+
+Uses data/lol/lol_model.json when present, otherwise trains a booster with the
+production hyperparameters (100 trees, depth 5) on simulated games.
+
+Usage: python benchmarks/bench_insights.py [--requests N] [--engine numpy|xgboost] [--max-added-ms MS]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('AEGIS_STARTUP_MODE', 'lazy')
+
+
+def simulated_games(predictor, n, seed=5):
+    rng = np.random.default_rng(seed)
+    games = []
+    for _ in range(n):
+        stats = predictor._generate_base_stats('Team')
+        for _ in range(int(rng.integers(0, 300))):
+            predictor._evolve_stats(stats)
+        games.append(stats)
+    return games
+
+
+def train_model(predictor, directory):
+    import joblib
+    import pandas as pd
+    import xgboost as xgb
+    from sklearn.preprocessing import RobustScaler
+    games = simulated_games(predictor, 3000, seed=1)
+    X = np.vstack([predictor.kernel.transform(g) for g in games])
+    margin = (X[:, 1] - X[:, 0]) / 3 + (X[:, 7] - X[:, 7].mean()) / 200 + X[:, 14] * 2
+    y = (np.random.default_rng(2).random(len(X)) < 1 / (1 + np.exp(-margin))).astype(int)
+    scaler = RobustScaler().fit(X)
+    model = xgb.XGBClassifier(n_estimators=100, max_depth=5, learning_rate=0.1, random_state=42)
+    # Named columns like train_lol_model.py, so the booster validates feature names
+    model.fit(pd.DataFrame(scaler.transform(X), columns=predictor.features), y)
+    model.save_model(os.path.join(directory, 'lol_model.json'))
+    joblib.dump(scaler, os.path.join(directory, 'scaler.joblib'))
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--engine', default='numpy', choices=['numpy', 'xgboost'])
+    parser.add_argument('--max-added-ms', type=float, default=2.0, help='p99 latency budget for explain')
+    args = parser.parse_args()
+
+    real_stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+    tmp = None
+    try:
+        import main as app
+        from model_registry import ModelRegistry
+        predictor = app.LoLPredictor(engine=args.engine, load=False)
+        if predictor.registry.candidates():
+            source = 'data/lol'
+        else:
+            tmp = tempfile.mkdtemp()
+            train_model(predictor, tmp)
+            predictor.registry = ModelRegistry('lol', tmp, 'lol_model', predictor.engine, label='LoL')
+            source = 'simulated (100 trees, depth 5)'
+        predictor.registry.ensure_loaded()
+        games = simulated_games(predictor, args.requests)
+        timings = {}
+        for explain in (False, True, False, True):  # interleaved, second pass is measured
+            samples = []
+            for stats in games:
+                start = time.perf_counter()
+                predictor.predict(stats, {}, explain=explain)
+                samples.append((time.perf_counter() - start) * 1000)
+            timings[explain] = samples
+    finally:
+        sys.stdout = real_stdout
+        if tmp:
+            shutil.rmtree(tmp)
+
+    plain, explained = timings[False], timings[True]
+    added_p50 = percentile(explained, 50) - percentile(plain, 50)
+    added_p99 = percentile(explained, 99) - percentile(plain, 99)
+    print("=" * 72)
+    print(f"{args.requests} requests, engine {args.engine}, model {source}")
+    print("=" * 72)
+    print(f"{'mode':<10} {'p50 (ms)':>10} {'p99 (ms)':>10} {'mean (ms)':>10}")
+    for name, samples in (("predict", plain), ("explain", explained)):
+        print(f"{name:<10} {percentile(samples, 50):>10.3f} {percentile(samples, 99):>10.3f} "
+              f"{statistics.fmean(samples):>10.3f}")
+    print(f"added: p50 {added_p50:.3f} ms, p99 {added_p99:.3f} ms (budget {args.max_added_ms} ms)")
+    if added_p99 > args.max_added_ms:
+        print("✗ Tree SHAP insights exceed the latency budget")
+        sys.exit(1)
+    print("✓ Tree SHAP insights within the latency budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Per-match latency of find_live_match.get_live_predictions.
+
+Compares the legacy path (fresh ValorantPredictor per call, one DataFrame and
+DMatrix per player) with the shared, batched predictor.
+
+Usage: python benchmarks/bench_live_predictions.py [--repeats N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+import xgboost as xgb
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from find_live_match import ValorantPredictor, get_live_predictions, get_predictor
+
+PLAYER_COUNTS = [2, 10, 100]
+
+
+def make_match(n_players, seed=42):
+    rng = random.Random(seed)
+    players = []
+    for i in range(n_players):
+        players.append({
+            'name': f'Player {i + 1}',
+            'team': 'Cloud9' if i % 2 == 0 else 'Opponent',
+            'stats': {
+                'Kills': rng.randint(5, 30),
+                'Deaths': rng.randint(5, 25),
+                'Assists': rng.randint(0, 15),
+                'Headshot %': f"{rng.randint(10, 40)}%",
+                'First Kills': rng.randint(0, 6),
+                'First Deaths': rng.randint(0, 6),
+                'Average Damage Per Round': rng.randint(80, 200)
+            }
+        })
+    return {'players': players}
+
+
+def legacy_get_live_predictions(match_data):
+    """The pre-batching implementation, kept here as the baseline."""
+    predictor = ValorantPredictor()
+    predictions = []
+    for player in match_data.get('players', []):
+        X = predictor._preprocess(player.get('stats', {}))
+        if predictor.scaler:
+            X = pd.DataFrame(predictor.scaler.transform(X), columns=predictor.features)
+        dmatrix = xgb.DMatrix(X, feature_names=list(X.columns))
+        prob = float(predictor.model.predict(dmatrix)[0])
+        predictions.append({
+            'name': player.get('name', 'Unknown'),
+            'high_assist_probability': prob,
+        })
+    return predictions
+
+
+def time_call(fn, match, repeats):
+    fn(match)  # warm-up
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(match)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+
+    get_predictor()  # load the shared model outside the timed region
+
+    print("=" * 64)
+    print("AEGIS-C9 | get_live_predictions per-match latency (median)")
+    print("=" * 64)
+    print(f"{'players':>8} | {'legacy (ms)':>12} | {'batched (ms)':>12} | {'speedup':>8}")
+    for n in PLAYER_COUNTS:
+        match = make_match(n)
+        legacy_ms = time_call(legacy_get_live_predictions, match, max(3, args.repeats // 10))
+        batched_ms = time_call(get_live_predictions, match, args.repeats)
+        print(f"{n:>8} | {legacy_ms:>12.3f} | {batched_ms:>12.3f} | {legacy_ms / batched_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Latency, allocations and throughput of the prediction path, with JSON baselines.
+
+Targets, each at every --batches size (items per batch):
+  valorant_high_assists  find_live_match.ValorantPredictor.predict_high_assists, once per player
+  live_predictions       find_live_match.get_live_predictions, one match of <batch> players
+  valorant_predict       main.ValorantPredictor.predict, once per team state
+  lol_predict            main.LoLPredictor.predict, once per game state
+  lol_predict_explain    the same with explain=True, as /lol-predictions calls it
+  tactical_insights      main.generate_ml_tactical_insights, once per game state
+  mie_insights           main.MacroImpactEngine.generate_insights, one frame of <batch> players
+
+Every item in a batch is a distinct input and the prediction caches are off,
+so every call reaches the model. Each case is timed in --repeats separate
+passes; p50 is the best pass's median (the least disturbed by other load on
+the machine) and p99 the median of the passes' p99. A fixed calibration
+workload runs after every pass and is saved with the case, so --compare can
+factor out a machine that is running slower or faster as a whole. Per batch it also
+reports throughput (items/s), the peak Python/NumPy memory allocated during
+one call and what stays allocated afterwards (tracemalloc; memory XGBoost
+allocates in C++ is not visible to it).
+
+--save writes the results with the commit, versions and CPU count as JSON
+(default benchmarks/baselines/predictors.json, which git ignores: baselines
+belong to the machine that recorded them). --compare reads such a baseline
+and exits non-zero when a p50 is both more than --max-regression and more
+than --min-delta-ms slower, so it can gate CI on a dedicated runner. Cases
+that fail are timed again, up to --retries times, and the fastest run is
+kept, so a regression has to reproduce; a noisy run doesn't fail the gate.
+
+Uses data/lol/lol_model.json when present, otherwise trains a booster with the
+production hyperparameters on simulated games (see bench_insights.py).
+
+Usage: python benchmarks/bench_predictors.py [--batches 1,10,100,1000] [--targets a,b] [--save [PATH]] [--compare [PATH]]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+os.environ.setdefault('AEGIS_STARTUP_MODE', 'lazy')
+
+from bench_insights import simulated_games, train_model
+from bench_live_predictions import make_match
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'predictors.json')
+TARGETS = ['valorant_high_assists', 'live_predictions', 'valorant_predict', 'lol_predict',
+           'lol_predict_explain', 'tactical_insights', 'mie_insights']
+
+
+def valorant_team_states(n, seed=3):
+    rng = random.Random(seed)
+    return [{
+        'kills': rng.randint(5, 30), 'deaths': rng.randint(5, 25), 'assists': rng.randint(0, 15),
+        'hs_pct': rng.uniform(0.1, 0.4), 'first_kills': rng.randint(0, 6), 'first_deaths': rng.randint(0, 6),
+        'adr': rng.randint(80, 200),
+    } for _ in range(n)]
+
+
+def build_targets(app, live, lol, size):
+    """name -> make(batch) -> zero-argument callable that processes one batch"""
+    players = make_match(size)['players']
+    player_stats = [p['stats'] for p in players]
+    team_states = valorant_team_states(size)
+    games = simulated_games(lol, size)
+    lol_players = lol._generate_players('Cloud9')
+    predictions = [lol.predict(stats, {}, explain=True) for stats in games]
+    valorant = app.ValorantPredictor(cache=None)
+    mie = app.MacroImpactEngine(load=False)
+
+    def per_item(fn, items):
+        def make(batch):
+            chosen = items[:batch]
+            return lambda: [fn(item) for item in chosen]
+        return make
+
+    def per_frame(fn):
+        def make(batch):
+            frame = {'players': players[:batch]}
+            return lambda: fn(frame)
+        return make
+
+    def insights(i):
+        app._last_anomaly_time = 0  # the endpoint rate-limits insights to one every 12s
+        return app.generate_ml_tactical_insights(games[i], {}, predictions[i], lol_players)
+
+    return {
+        'valorant_high_assists': per_item(live.predict_high_assists, player_stats),
+        'live_predictions': per_frame(lambda match: app.get_live_predictions(match, live)),
+        'valorant_predict': per_item(lambda stats: valorant.predict(stats, {}), team_states),
+        'lol_predict': per_item(lambda stats: lol.predict(stats, {}), games),
+        'lol_predict_explain': per_item(lambda stats: lol.predict(stats, {}, explain=True), games),
+        'tactical_insights': per_item(insights, list(range(size))),
+        'mie_insights': per_frame(mie.generate_insights),
+    }
+
+
+def calibration_ms(repeats=3):
+    """Best time of a fixed Python + NumPy workload: how fast the machine is running right now"""
+    data = np.random.default_rng(0).random(20000)
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        np.sort(data)
+        counts = {}
+        for i in range(5000):
+            counts[i % 97] = counts.get(i % 97, 0) + i
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def timing_pass(call, seconds, min_samples=3):
+    """Latency samples until `seconds` is spent (at least min_samples)"""
+    samples = []
+    deadline = time.perf_counter() + seconds
+    while len(samples) < min_samples or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def measure(call, batch, seconds, repeats=5, alloc_calls=5):
+    """
+    `repeats` timing passes sharing `seconds`, each followed by a calibration
+    run, then tracemalloc over alloc_calls
+    """
+    call()  # warm-up
+    passes, calibration = [], []
+    for _ in range(repeats):
+        passes.append(timing_pass(call, seconds / repeats))
+        calibration.append(calibration_ms())
+
+    tracemalloc.start()
+    try:
+        call()
+        peaks = []
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(alloc_calls):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            call()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        retained = (tracemalloc.get_traced_memory()[0] - before) / alloc_calls
+    finally:
+        tracemalloc.stop()
+
+    p50s, p99s = np.array([np.percentile(samples, [50, 99]) for samples in passes]).T
+    p50 = float(p50s.min())
+    return {
+        "samples": sum(len(samples) for samples in passes),
+        "p50_ms": round(p50 * 1e3, 4),
+        "p50_spread_ms": round(float(p50s.max() - p50s.min()) * 1e3, 4),
+        "p99_ms": round(float(np.median(p99s)) * 1e3, 4),
+        "items_per_s": round(batch / p50, 1),
+        "calibration_ms": round(min(calibration), 4),
+        "alloc_kb_per_call": round(float(np.median(peaks)) / 1024, 2),
+        "retained_b_per_call": round(retained, 1),
+    }
+
+
+def environment():
+    import xgboost
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "created_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "xgboost": xgboost.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, max_regression, min_delta_ms=0.25):
+    """
+    Lines comparing p50 to the baseline, and the (target, batch) cases that
+    regressed past max_regression. p50 is first divided by how much slower
+    the machine ran the calibration workload next to it than next to the
+    baseline's, so a busier or throttled machine doesn't read as a
+    regression. A case must also be min_delta_ms slower: below that, timer
+    and scheduler noise alone moves p50 by tens of percent.
+    """
+    lines, regressed = [], []
+    for name, batches in results.items():
+        for batch, now in batches.items():
+            then = baseline["results"].get(name, {}).get(batch)
+            if not then:
+                continue
+            machine = now["calibration_ms"] / then["calibration_ms"] if "calibration_ms" in then else 1.0
+            p50 = now["p50_ms"] / machine
+            change = p50 / then["p50_ms"] - 1
+            slower = change > max_regression and p50 - then["p50_ms"] > min_delta_ms
+            if slower:
+                regressed.append((name, batch))
+            mark = ('✗' if slower else '✓') + ('*' if now.get("retimed") else ' ')
+            lines.append(f"{mark} {name:<22} {batch:>5} {then['p50_ms']:>10.3f} "
+                         f"{now['p50_ms']:>10.3f} {machine:>8.2f} {p50:>10.3f} {change*100:>+8.1f}%")
+    return lines, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--batches', default='1,10,100,1000')
+    parser.add_argument('--targets', default=','.join(TARGETS))
+    parser.add_argument('--seconds', type=float, default=1.0, help='timing budget per target and batch size')
+    parser.add_argument('--repeats', type=int, default=5, help='timing passes per case; p50 is the best pass')
+    parser.add_argument('--engine', default=None, choices=['numpy', 'xgboost'])
+    parser.add_argument('--save', nargs='?', const=DEFAULT_BASELINE, help='write the results as a JSON baseline')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, help='JSON baseline to compare p50 against')
+    parser.add_argument('--retries', type=int, default=2, help='times --compare re-times a failing case')
+    parser.add_argument('--max-regression', type=float, default=0.25, help='allowed p50 slowdown vs the baseline')
+    parser.add_argument('--min-delta-ms', type=float, default=0.25, help='smallest p50 slowdown (ms) that counts')
+    args = parser.parse_args()
+    batches = [int(b) for b in args.batches.split(',')]
+    targets = [t for t in args.targets.split(',') if t]
+    unknown = set(targets) - set(TARGETS)
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(sorted(unknown))}")
+    if args.compare and not os.path.exists(args.compare):
+        parser.error(f"no baseline at {args.compare}; record one with --save first")
+
+    random.seed(0)
+    real_stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+    tmp = None
+    try:
+        import main as app
+        from find_live_match import ValorantPredictor
+        from model_registry import ModelRegistry
+        lol = app.LoLPredictor(engine=args.engine, load=False)
+        if lol.registry.candidates():
+            lol_source = 'data/lol'
+        else:
+            tmp = tempfile.mkdtemp()
+            train_model(lol, tmp)
+            lol.registry = ModelRegistry('lol', tmp, 'lol_model', lol.engine, label='LoL')
+            lol_source = 'simulated (100 trees, depth 5)'
+        lol.registry.ensure_loaded()
+        live = ValorantPredictor()
+        make = build_targets(app, live, lol, max(batches))
+        results = {}
+        for name in targets:
+            results[name] = {str(batch): measure(make[name](batch), batch, args.seconds, args.repeats) for batch in batches}
+
+        baseline = None
+        if args.compare:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+            # A regression has to reproduce: re-time failing cases and keep each one's fastest run
+            for _ in range(args.retries):
+                for name, batch in compare(results, baseline, args.max_regression, args.min_delta_ms)[1]:
+                    again = measure(make[name](int(batch)), int(batch), args.seconds, args.repeats)
+                    first = results[name][batch]
+                    if again["p50_ms"] / again["calibration_ms"] < first["p50_ms"] / first["calibration_ms"]:
+                        first = again
+                    results[name][batch] = {**first, "retimed": first.get("retimed", 0) + 1}
+    finally:
+        sys.stdout = real_stdout
+        if tmp:
+            shutil.rmtree(tmp)
+
+    env = environment()
+    print("=" * 96)
+    print(f"commit {env['commit']}, {env['cpus']} CPUs, engine {lol.engine}, LoL model {lol_source}")
+    print("=" * 96)
+    print(f"{'target':<22} {'batch':>5} {'p50 ms':>10} {'p99 ms':>10} {'items/s':>12} "
+          f"{'alloc KB/call':>14} {'retained B':>11} {'n':>6}")
+    for name, by_batch in results.items():
+        for batch, r in by_batch.items():
+            print(f"{name:<22} {batch:>5} {r['p50_ms']:>10.3f} {r['p99_ms']:>10.3f} {r['items_per_s']:>12,.0f} "
+                  f"{r['alloc_kb_per_call']:>14.1f} {r['retained_b_per_call']:>11.0f} {r['samples']:>6}")
+
+    regressed = []
+    if baseline is not None:
+        print(f"\nvs baseline {args.compare} (commit {baseline['environment']['commit']}, "
+              f"{baseline['environment']['cpus']} CPUs), p50 ms; * = re-timed after failing:")
+        if baseline["environment"]["cpus"] != env["cpus"] or baseline["environment"]["machine"] != env["machine"]:
+            print("  (baseline was recorded on a different machine; treat the change as indicative)")
+        lines, regressed = compare(results, baseline, args.max_regression, args.min_delta_ms)
+        print(f"  {'':3}{'target':<22} {'batch':>5} {'baseline':>10} {'now':>10} {'machine':>8} {'adjusted':>10} {'change':>9}")
+        for line in lines:
+            print(f"  {line}")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w') as f:
+            json.dump({"environment": env, "engine": lol.engine, "lol_model": lol_source,
+                       "seconds": args.seconds, "repeats": args.repeats, "results": results}, f, indent=2)
+        print(f"\n✓ Baseline saved to {args.save}")
+
+    if regressed:
+        print(f"✗ p50 regressed by more than {args.max_regression*100:.0f}%")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Cold-start time and memory of the API process.
+
+Each sample runs in a fresh interpreter and records how long `import main`
+takes, how long until warmup has loaded every model (what /ready waits for)
+and the resident set size at both points. Modes:
+
+  baseline  eager startup plus the old `import_module('tensorflow')` probe
+  eager     AEGIS_STARTUP_MODE=eager (models load while main is imported)
+  lazy      AEGIS_STARTUP_MODE=lazy (models load in the background warmup)
+
+Usage: python benchmarks/bench_startup.py [--repeats N] [--modes baseline,eager,lazy]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ['baseline', 'eager', 'lazy']
+
+
+def rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def child(mode):
+    """One cold start, reported as a JSON line on stdout"""
+    sys.path.insert(0, BACKEND_DIR)
+    start = time.perf_counter()
+    # Keep the app's startup logging out of the report
+    real_stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+    try:
+        if mode == 'baseline':
+            from importlib.util import find_spec
+            if find_spec('tensorflow') is not None:
+                import tensorflow  # noqa: F401  (what MacroImpactEngine used to do)
+        import main
+        imported = time.perf_counter()
+        rss_import = rss_mb()
+        main.warm_up()
+        ready = time.perf_counter()
+    finally:
+        sys.stdout = real_stdout
+    print(json.dumps({
+        'import_s': imported - start,
+        'ready_s': ready - start,
+        'rss_import_mb': rss_import,
+        'rss_ready_mb': rss_mb(),
+    }))
+
+
+def sample(mode):
+    env = dict(os.environ, AEGIS_STARTUP_MODE='lazy' if mode == 'lazy' else 'eager')
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', mode],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--modes', default=','.join(MODES))
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    print(f"{'mode':<10} {'import (s)':>11} {'ready (s)':>10} {'RSS import (MB)':>16} {'RSS ready (MB)':>15}")
+    for mode in args.modes.split(','):
+        runs = [sample(mode) for _ in range(args.repeats)]
+        median = {k: statistics.median(r[k] for r in runs) for k in runs[0]}
+        print(f"{mode:<10} {median['import_s']:>11.3f} {median['ready_s']:>10.3f} "
+              f"{median['rss_import_mb']:>16.1f} {median['rss_ready_mb']:>15.1f}")
+    print(f"\nmedian of {args.repeats} fresh interpreters per mode")
+
+
+if __name__ == '__main__':
+    main()
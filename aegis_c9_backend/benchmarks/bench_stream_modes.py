@@ -0,0 +1,99 @@
+"""
+Bytes on the wire and server serialization CPU of /stream-telemetry modes.
+
+Replays a simulated match through the real enrichment (predictions, MIE,
+win probability) for --ticks frames, then encodes every frame the way the
+telemetry hub does: full JSON each tick, or keyframes every N ticks with
+JSON-Patch deltas in between. Bytes are per subscriber; CPU is the hub's
+once-per-tick encoding cost, shared by all subscribers of a series.
+
+Usage: python benchmarks/bench_stream_modes.py [--ticks N] [--keyframes 5,10,30] [--repeats N]
+"""
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('AEGIS_STARTUP_MODE', 'lazy')
+
+from bridge import simulated_live_stats
+from telemetry_hub import TelemetryFrame
+
+
+def make_documents(ticks, seed=7):
+    """Enriched telemetry documents for a match whose stats drift tick by tick"""
+    import main
+    rng = random.Random(seed)
+    random.seed(seed)
+    base = simulated_live_stats()
+    base['players'] = [copy.deepcopy(base['players'][i % 2]) for i in range(10)]
+    for i, player in enumerate(base['players']):
+        player['name'] = f'Player {i + 1}'
+    docs = []
+    for _ in range(ticks):
+        for player in base['players']:
+            stats = player['stats']
+            # A kill/death/assist lands for a couple of players per tick
+            if rng.random() < 0.2:
+                stats[rng.choice(['Kills', 'Deaths', 'Assists'])] += 1
+        docs.append(main.enrich_telemetry(copy.deepcopy(base)))
+    return docs
+
+
+def encode_full(docs):
+    total = 0
+    start = time.process_time()
+    previous = None
+    for seq, doc in enumerate(docs, 1):
+        frame = TelemetryFrame(seq, doc, previous, False)
+        total += len(frame.full_bytes())
+        previous = doc
+    return total, time.process_time() - start
+
+
+def encode_delta(docs, keyframe_interval):
+    total = 0
+    start = time.process_time()
+    previous = None
+    for seq, doc in enumerate(docs, 1):
+        frame = TelemetryFrame(seq, doc, previous, (seq - 1) % keyframe_interval == 0)
+        total += len(frame.keyframe_bytes() if frame.keyframe else frame.delta_bytes())
+        previous = doc
+    return total, time.process_time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--keyframes', default='5,10,30')
+    parser.add_argument('--repeats', type=int, default=5, help='best-of CPU timing')
+    args = parser.parse_args()
+
+    real_stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+    try:
+        docs = make_documents(args.ticks)
+    finally:
+        sys.stdout = real_stdout
+
+    def best(encode, *encode_args):
+        runs = [encode(docs, *encode_args) for _ in range(args.repeats)]
+        return runs[0][0], min(cpu for _, cpu in runs)
+
+    full_bytes, full_cpu = best(encode_full)
+    print("=" * 72)
+    print(f"{args.ticks} ticks, 10 players, CPU best of {args.repeats}")
+    print("=" * 72)
+    print(f"{'mode':<16} {'bytes/tick':>12} {'vs full':>9} {'CPU us/tick':>13} {'vs full':>9}")
+    print(f"{'full':<16} {full_bytes / args.ticks:>12.0f} {'1.00x':>9} {full_cpu / args.ticks * 1e6:>13.1f} {'1.00x':>9}")
+    for interval in (int(k) for k in args.keyframes.split(',')):
+        delta_bytes, delta_cpu = best(encode_delta, interval)
+        print(f"{f'delta (N={interval})':<16} {delta_bytes / args.ticks:>12.0f} "
+              f"{delta_bytes / full_bytes:>8.2f}x {delta_cpu / args.ticks * 1e6:>13.1f} "
+              f"{delta_cpu / full_cpu:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Peak RSS vs dataset size: in-memory training vs --streaming (out-of-core).
+
+For each --sizes row count, writes synthetic LoL match CSVs (files of at
+most --file-rows rows) and trains the 100-tree model twice, each in its own
+subprocess so ru_maxrss is that run's peak:
+
+  in-memory   load_csvs + concat into one DataFrame, features, clip, scale,
+              XGBClassifier.fit (the default path of train_lol_model.py)
+  streaming   streaming_training.train_streaming over CSV chunks into an
+              ExtMemQuantileDMatrix (train_lol_model.py --streaming)
+
+An 'imports only' child gives the interpreter + library baseline; bytes/row
+is each run's peak above that baseline, divided by the row count.
+
+Usage: python benchmarks/bench_streaming_memory.py [--sizes 250000,1000000,2000000] [--chunk-rows N]
+"""
+import argparse
+import glob
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feature_spec import LOL_SPEC
+
+CSV_DTYPES = {**{name: 'float64' for name in LOL_SPEC.inputs}, 'win': 'object'}
+CRITICAL_FEATURES = ['kills', 'deaths', 'assists', 'gold_earned', 'win']
+PARAMS = dict(objective='binary:logistic', use_label_encoder=False, eval_metric='logloss',
+              random_state=42, max_depth=5, learning_rate=0.1)
+
+
+def write_matches(directory, rows, file_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    for part, start in enumerate(range(0, rows, file_rows)):
+        n = min(file_rows, rows - start)
+        df = pd.DataFrame({name: rng.integers(0, 20000, n) for name in LOL_SPEC.inputs})
+        df['kills'] = rng.integers(0, 20, n)
+        df['deaths'] = rng.integers(0, 15, n)
+        df['kill_participation'] = rng.random(n)
+        edge = (df['kills'] - df['deaths']) / 5 + rng.normal(size=n)
+        df['win'] = np.where(edge > 0, 'TRUE', 'FALSE')
+        df.to_csv(os.path.join(directory, f'part{part}.csv'), index=False)
+
+
+def prepare(chunk, kernel):
+    from training_prep import clean_boolean
+    chunk = chunk.dropna(subset=CRITICAL_FEATURES)
+    X = kernel.transform(chunk)
+    y = clean_boolean(chunk['win']).to_numpy()
+    keep = ~np.isnan(X).any(axis=1)
+    X, y = X[keep], y[keep]
+    X[np.isinf(X)] = 0
+    return X, y
+
+
+def run_in_memory(paths, workdir, chunk_rows):
+    import xgboost as xgb
+    from sklearn.metrics import roc_auc_score
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import RobustScaler
+    from csv_cache import load_csvs
+    from training_prep import clip_outliers
+
+    master_df, _ = load_csvs(paths, os.path.join(workdir, 'cache'), dtype=CSV_DTYPES, columns=list(CSV_DTYPES))
+    X, y = prepare(master_df, LOL_SPEC.bind())
+    X = clip_outliers(pd.DataFrame(X, columns=LOL_SPEC.feature_names), z=3)
+    X = pd.DataFrame(RobustScaler().fit_transform(X), columns=LOL_SPEC.feature_names)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    model = xgb.XGBClassifier(n_estimators=100, **PARAMS).fit(X_train, y_train)
+    return roc_auc_score(y_test, model.predict_proba(X_test)[:, 1])
+
+
+def run_streaming(paths, workdir, chunk_rows):
+    from sklearn.metrics import roc_auc_score
+    from streaming_training import CsvChunks, train_streaming
+
+    kernel = LOL_SPEC.bind()
+    chunks = CsvChunks(paths, dtype=CSV_DTYPES, columns=list(CSV_DTYPES), chunk_rows=chunk_rows)
+    _, _, report = train_streaming(chunks, lambda chunk: prepare(chunk, kernel), LOL_SPEC.feature_names,
+                                   PARAMS, num_boost_round=100, cache_dir=workdir)
+    return roc_auc_score(report['y_holdout'], report['p_holdout'])
+
+
+def child(mode, data_dir, chunk_rows):
+    # Import everything either mode uses first, so the baseline is comparable
+    import sklearn.model_selection, sklearn.preprocessing, xgboost  # noqa: F401
+    import csv_cache, streaming_training, training_prep  # noqa: F401
+    paths = sorted(glob.glob(os.path.join(data_dir, '*.csv')))
+    start = time.perf_counter()
+    auc = None
+    if mode == 'in-memory':
+        auc = run_in_memory(paths, data_dir, chunk_rows)
+    elif mode == 'streaming':
+        auc = run_streaming(paths, data_dir, chunk_rows)
+    print(json.dumps({"rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                      "seconds": time.perf_counter() - start, "auc": auc}))
+
+
+def measure(mode, data_dir, chunk_rows):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, '--data', data_dir,
+                          '--chunk-rows', str(chunk_rows)], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='250000,1000000,2000000')
+    parser.add_argument('--file-rows', type=int, default=250000)
+    parser.add_argument('--chunk-rows', type=int, default=100000)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--data', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args.child, args.data, args.chunk_rows)
+
+    baseline = None
+    print("=" * 78)
+    print(f"{os.cpu_count()} CPUs, chunks of {args.chunk_rows:,} rows, files of {args.file_rows:,} rows")
+    print("=" * 78)
+    print(f"{'rows':>10} {'mode':<10} {'peak RSS MB':>12} {'bytes/row':>10} {'seconds':>9} {'AUC':>7}")
+    for rows in (int(s) for s in args.sizes.split(',')):
+        tmp = tempfile.mkdtemp()
+        try:
+            write_matches(tmp, rows, args.file_rows)
+            if baseline is None:
+                baseline = measure('imports', tmp, args.chunk_rows)['rss_mb']
+                print(f"{'-':>10} {'imports':<10} {baseline:>12.0f}")
+            for mode in ('in-memory', 'streaming'):
+                result = measure(mode, tmp, args.chunk_rows)
+                per_row = (result['rss_mb'] - baseline) * 1024 * 1024 / rows
+                print(f"{rows:>10,} {mode:<10} {result['rss_mb']:>12.0f} {per_row:>10.0f} "
+                      f"{result['seconds']:>9.1f} {result['auc']:>7.4f}")
+        finally:
+            shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main()
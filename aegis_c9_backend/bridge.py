@@ -1,10 +1,17 @@
-import requests
+import asyncio
 import os
+import httpx
 from dotenv import load_dotenv
 from find_live_match import get_live_predictions
+from circuit_breaker import CircuitOpenError
+from event_log import EventIngestor
+from grid_client import DENIED_CODES, GridBatcher, GridClient, GridRequestError
 
 load_dotenv()
 
+# Series polled when a caller doesn't name one (the demo series)
+DEFAULT_SERIES_ID = "2616372"
+
 # Verify the script identity
 print(f"ACTIVE FILE: {os.path.abspath(__file__)}")
 
@@ -43,69 +50,134 @@ def simulated_live_stats():
         ]
     }
 
-def fetch_aegis_data(series_id="2616372"):
-    """
-    Fetches live data from GRID API or fallback to simulated data.
-    Uses the provided GRID_API_KEY for authentic connection.
-    """
-    url = "https://api.grid.gg/central-data/graphql"
-    # Prioritize Environment Variable, but fallback to provided key for convenience
-    api_key = os.getenv("GRID_API_KEY", "V3l3eJF14k9nFYZpYLHxVNQzPynQ5M9Uf6DWON4F")
-    
-    headers = {
-        "x-api-key": api_key,
-        "Content-Type": "application/json"
+# Enhanced query for live series state and telemetry snapshots
+LIVE_SERIES_FIELDS = """{
+    id
+    status
+    teams { 
+        baseInfo { name }
     }
-
-    # Enhanced query for live series state and telemetry snapshots
-    query = """
-    query GetLiveSeries($id: ID!) {
-      series(id: $id) {
-        id
-        status
-        teams { 
-            baseInfo { name }
-        }
-        liveData {
-          score { home away }
-          events(limit: 5) { type period time }
-        }
-      }
+    liveData {
+      score { home away }
+      events(after: $after, limit: $limit) { id type period time }
     }
+  }"""
+
+# Only events after the per-series cursor are requested (see event_log)
+LIVE_SERIES_VARIABLES = {'after': 'ID', 'limit': 'Int'}
+
+LIVE_SERIES_QUERY = f"""
+query GetLiveSeries($id: ID!, $after: ID, $limit: Int) {{
+  series(id: $id) {LIVE_SERIES_FIELDS}
+}}
+"""
+
+EVENT_PAGE_SIZE = int(os.getenv('AEGIS_GRID_EVENT_PAGE', '50'))
+
+event_ingestor = EventIngestor.from_env()
+
+_grid_client = None
+_grid_batcher = None
+
+def get_grid_client():
+    """Process-wide GridClient, so every endpoint shares one connection pool"""
+    global _grid_client
+    if _grid_client is None:
+        _grid_client = GridClient.from_env()
+    return _grid_client
+
+def get_grid_batcher():
     """
+    Process-wide GridBatcher over the shared client: series requested within
+    AEGIS_GRID_BATCH_WINDOW seconds (default 0.01, 0 disables) share one query.
+    """
+    global _grid_batcher
+    window = float(os.getenv('AEGIS_GRID_BATCH_WINDOW', '0.01'))
+    if window <= 0:
+        return None
+    if _grid_batcher is None:
+        _grid_batcher = GridBatcher(
+            get_grid_client(), 'series', LIVE_SERIES_FIELDS, operation='GetLiveSeries', window=window,
+            max_batch=int(os.getenv('AEGIS_GRID_BATCH_SIZE', '25')), variables=LIVE_SERIES_VARIABLES,
+        )
+    return _grid_batcher
+
+async def close_grid_client():
+    global _grid_client, _grid_batcher
+    batcher, _grid_batcher = _grid_batcher, None
+    if batcher is not None:
+        await batcher.aclose()
+    if _grid_client is not None:
+        await _grid_client.aclose()
+        _grid_client = None
+
+def ingest_live_events(series_id, data, ingestor):
+    """Replace liveData.events with the events not seen before and record the log position"""
+    series = (data.get('data') or {}).get('series') or {}
+    live = series.get('liveData') or {}
+    if live.get('events') is None:
+        return
+    live['events'] = ingestor.ingest(series_id, live['events'])
+    data['event_seq'] = ingestor.log(series_id).last_seq
 
+async def fetch_aegis_data_async(series_id=DEFAULT_SERIES_ID, client=None, batcher=None, ingestor=None):
+    """
+    Fetches live data from GRID API or fallback to simulated data.
+    Uses the shared batcher/GridClient unless one is passed in; never blocks the event loop.
+    Only events after the series cursor are requested, and the response carries just the new ones.
+    """
+    ingestor = ingestor or event_ingestor
+    if batcher is None and client is None:
+        batcher = get_grid_batcher()
+    client = batcher.client if batcher is not None else (client or get_grid_client())
+    if client.is_denied(series_id):
+        # GRID refused this series recently; don't ask again until the entry expires
+        return simulated_live_stats()
     try:
-        print(f"--- AEGIS-C9 | TARGETING: {url} ---")
-        
-        with requests.Session() as session:
-            response = session.post(
-                url, 
-                json={'query': query, 'variables': {'id': series_id}}, 
-                headers=headers,
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
+        print(f"--- AEGIS-C9 | TARGETING: {client.url} ---")
+        page = {'after': ingestor.cursor(series_id), 'limit': EVENT_PAGE_SIZE}
+        if batcher is not None:
+            data = await batcher.fetch(series_id, **page)
+        else:
+            data = await client.query(LIVE_SERIES_QUERY, {'id': series_id, **page})
         
         if 'errors' in data:
             for error in data['errors']:
-                if error.get('extensions', {}).get('code') == 'PERMISSION_DENIED':
+                if error.get('extensions', {}).get('code') in DENIED_CODES:
                     print("--- AEGIS-C9 | PERMISSION DENIED: Switching to Simulated Data ---")
+                    # Without a path the request itself was refused, so every series is
+                    client.mark_denied(series_id if error.get('path') else None)
                     return simulated_live_stats()
         
+        ingest_live_events(series_id, data, ingestor)
+
         # Enrich real data with dummy stats for model if missing (since real API might not have all yet)
         if 'players' not in data:
              data.update(simulated_live_stats())
              
         return data
 
-    except requests.exceptions.RequestException as e:
-        print(f"--- AEGIS-C9 | CONNECTION ERROR: {e} | Falling back to Simulation ---")
+    except CircuitOpenError:
+        # GRID is down and the breaker is open: fall back without touching the network
+        return simulated_live_stats()
+    except GridRequestError as e:
+        # The whole batched request failed; if GRID refused the key, the batcher denied the client
+        print(f"--- AEGIS-C9 | REQUEST ERROR: {e} | Falling back to Simulation ---")
+        return simulated_live_stats()
+    except (httpx.HTTPError, asyncio.TimeoutError) as e:
+        print(f"--- AEGIS-C9 | CONNECTION ERROR: {e!r} | Falling back to Simulation ---")
         return simulated_live_stats()
     except Exception as e:
         print(f"--- AEGIS-C9 | ERROR: {e} ---")
         return {"error": str(e)}
 
+def fetch_aegis_data(series_id=DEFAULT_SERIES_ID):
+    """Blocking wrapper for scripts; async code should await fetch_aegis_data_async."""
+    async def fetch_once():
+        async with GridClient.from_env() as client:
+            return await fetch_aegis_data_async(series_id, client)
+    return asyncio.run(fetch_once())
+
 def run_coaching_bridge():
     """
     Main entry point for the coaching system.
@@ -0,0 +1,114 @@
+import os
+import random
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, name, retry_in):
+        super().__init__(f"{name} circuit open, retry in {retry_in:.1f}s")
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after failure_threshold consecutive failures. While open,
+    calls are refused without touching the upstream. Once the backoff has
+    elapsed the breaker goes half-open and lets a single probe through:
+    success closes it, failure re-opens it with the backoff doubled (up to
+    max_backoff, with +/- jitter so replicas don't probe in lockstep).
+    """
+
+    def __init__(self, name='upstream', failure_threshold=3, base_backoff=1.0, max_backoff=60.0,
+                 jitter=0.1, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opens = 0  # consecutive opens without a successful close, drives the backoff
+        self.retry_at = None
+        self._probing = False
+        self.short_circuited = 0
+        self.transitions = {}
+
+    @classmethod
+    def from_env(cls, name, prefix, **kwargs):
+        """Breaker configured from <prefix>_THRESHOLD, _BACKOFF and _MAX_BACKOFF (seconds)"""
+        return cls(
+            name,
+            failure_threshold=int(os.getenv(f'{prefix}_THRESHOLD', '3')),
+            base_backoff=float(os.getenv(f'{prefix}_BACKOFF', '1')),
+            max_backoff=float(os.getenv(f'{prefix}_MAX_BACKOFF', '60')),
+            **kwargs,
+        )
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go upstream now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            now = self._clock()
+            if self.state == OPEN and now >= self.retry_at:
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.short_circuited += 1
+            raise CircuitOpenError(self.name, max(0.0, (self.retry_at or now) - now))
+
+    def record_success(self):
+        with self._lock:
+            self._probing = False
+            self.failures = 0
+            if self.state != CLOSED:
+                self.opens = 0
+                self.retry_at = None
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._probing = False
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self._open()
+
+    def release(self):
+        """A call ended without a verdict (e.g. the client went away): free the probe slot."""
+        with self._lock:
+            self._probing = False
+
+    def _open(self):
+        backoff = min(self.max_backoff, self.base_backoff * (2 ** self.opens))
+        if self.jitter:
+            backoff *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        self.opens += 1
+        self.retry_at = self._clock() + backoff
+        self._transition(OPEN)
+        print(f"--- AEGIS-C9 | {self.name} circuit OPEN for {backoff:.1f}s ---")
+
+    def _transition(self, state):
+        key = f"{self.state}->{state}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        self.state = state
+
+    def stats(self):
+        with self._lock:
+            now = self._clock()
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "retry_in": round(max(0.0, self.retry_at - now), 3) if self.retry_at is not None else None,
+                "short_circuited": self.short_circuited,
+                "transitions": dict(self.transitions),
+            }
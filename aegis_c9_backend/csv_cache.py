@@ -0,0 +1,122 @@
+import hashlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from importlib.util import find_spec
+
+# Bump when the cache layout changes so old entries are ignored
+CACHE_VERSION = 1
+CACHE_FORMAT = 'parquet' if find_spec('pyarrow') else 'pickle'
+_EXTENSIONS = {'parquet': '.parquet', 'pickle': '.pkl'}
+
+
+def content_key(path, dtype=None, columns=None, chunk_size=1 << 20):
+    """Digest of the file bytes plus everything that changes how they are parsed"""
+    digest = hashlib.blake2b(digest_size=10)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    digest.update(repr((CACHE_VERSION, CACHE_FORMAT, sorted((dtype or {}).items()), sorted(columns or []))).encode())
+    return digest.hexdigest()
+
+
+def cache_path(path, cache_dir, key):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f'{stem}-{key}{_EXTENSIONS[CACHE_FORMAT]}')
+
+
+def _read_cache(path):
+    import pandas as pd
+    return pd.read_parquet(path) if CACHE_FORMAT == 'parquet' else pd.read_pickle(path)
+
+
+def _write_cache(df, path):
+    # Write next to the target and rename, so a crashed run never leaves a truncated entry
+    tmp = f'{path}.{os.getpid()}.tmp'
+    if CACHE_FORMAT == 'parquet':
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_pickle(tmp)
+    os.replace(tmp, path)
+
+
+def _remove_stale(cache_dir, path, current):
+    """Drop entries for older contents of the same file (exact stem, so 2024.csv leaves 2024-spring.csv alone)"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    extension = _EXTENSIONS[CACHE_FORMAT]
+    for name in os.listdir(cache_dir):
+        if not name.endswith(extension) or name[:-len(extension)].rsplit('-', 1)[0] != stem:
+            continue
+        entry = os.path.join(cache_dir, name)
+        if entry != current:
+            try:
+                os.remove(entry)
+            except FileNotFoundError:
+                pass
+
+
+def load_csv(path, cache_dir, dtype=None, columns=None):
+    """
+    One CSV as a DataFrame, from the columnar cache when its content hash
+    matches. Returns (df, info) with info = {file, rows, cached, seconds}.
+    """
+    import pandas as pd
+    start = time.perf_counter()
+    key = content_key(path, dtype, columns)
+    cached = cache_path(path, cache_dir, key)
+    df = None
+    if os.path.exists(cached):
+        try:
+            df = _read_cache(cached)
+        except FileNotFoundError:
+            pass  # removed since the check; parse instead
+    hit = df is not None
+    if not hit:
+        wanted = set(columns) if columns else None
+        df = pd.read_csv(
+            path,
+            dtype={c: t for c, t in (dtype or {}).items() if wanted is None or c in wanted},
+            usecols=(lambda c: c in wanted) if wanted else None,
+            low_memory=False,
+        )
+        os.makedirs(cache_dir, exist_ok=True)
+        _write_cache(df, cached)
+        _remove_stale(cache_dir, path, cached)
+    return df, {"file": os.path.basename(path), "rows": len(df), "cached": hit,
+                "seconds": time.perf_counter() - start}
+
+
+def _load_csv_args(args):
+    # A bad file is reported in its info instead of failing the whole load
+    try:
+        return load_csv(*args)
+    except Exception as e:
+        return None, {"file": os.path.basename(args[0]), "rows": 0, "cached": False, "seconds": 0.0, "error": str(e)}
+
+
+def load_csvs(paths, cache_dir, dtype=None, columns=None, workers=None):
+    """
+    Load and concatenate CSVs (in the given order) using a process pool.
+    Files whose content is unchanged since the last run are read from the
+    columnar cache instead of being parsed again. Returns (df, infos); files
+    that failed to load have an "error" in their info and are left out.
+    """
+    import pandas as pd
+    paths = list(paths)
+    workers = min(len(paths), workers or os.cpu_count() or 1)
+    jobs = [(path, cache_dir, dtype, columns) for path in paths]
+    if workers > 1:
+        # Training scripts run at module level, so spawned workers would re-run them on import;
+        # fork where available, otherwise threads (the C parser releases the GIL for much of a parse)
+        if 'fork' in multiprocessing.get_all_start_methods():
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork'))
+        else:
+            pool = ThreadPoolExecutor(max_workers=workers)
+        with pool:
+            results = list(pool.map(_load_csv_args, jobs))
+    else:
+        results = [_load_csv_args(job) for job in jobs]
+    frames = [df for df, _ in results if df is not None]
+    df = pd.concat(frames, axis=0, ignore_index=True) if frames else pd.DataFrame()
+    return df, [info for _, info in results]
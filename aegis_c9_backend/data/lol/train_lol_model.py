@@ -1,6 +1,9 @@
+import argparse
 import pandas as pd
 import glob
 import os
+import sys
+import time
 import xgboost as xgb
 from sklearn.model_selection import train_test_split, RandomizedSearchCV, cross_val_score
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, roc_auc_score, roc_curve
@@ -11,6 +14,18 @@ import joblib
 
 warnings.filterwarnings('ignore')
 
+# Shared feature spec lives in the backend root (aegis_c9_backend/feature_spec.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from csv_cache import CACHE_FORMAT, load_csvs
+from feature_spec import LOL_SPEC
+from feature_store import FeatureStore, feature_key
+from hyperparameter_search import search, summary_lines
+from incremental_training import (base_artifact, continue_training, file_keys, load_manifest, next_version,
+                                  save_manifest, save_pair, save_versioned, split_new_files, training_rows)
+from model_registry import BASE_VERSION
+from streaming_training import CsvChunks, train_streaming
+from training_prep import clean_boolean, clip_outliers
+
 print("="*80)
 print("AEGIS-C9 LOL PREDICTION MODEL - ELITE COACHING SYSTEM")
 print("="*80)
@@ -18,127 +33,183 @@ print("="*80)
 # --- CONFIGURATION ---
 DATA_DIR = '.' 
 OUTPUT_MODEL_PATH = 'lol_model.json'
+CACHE_DIR = os.path.join(DATA_DIR, '.ingest_cache')
+FEATURE_STORE_DIR = os.path.join(DATA_DIR, '.feature_store')
+# Only the columns the feature spec reads, plus the label
+CSV_DTYPES = {**{name: 'float64' for name in LOL_SPEC.inputs}, 'win': 'object'}
+CRITICAL_FEATURES = ['kills', 'deaths', 'assists', 'gold_earned', 'win']
+MODEL_NAME = 'lol_model'
+SEARCH_LOG_PATH = 'search_log.json'
+MODEL_PARAMS = dict(
+    objective='binary:logistic',
+    use_label_encoder=False,
+    eval_metric='logloss',
+    random_state=42,
+    max_depth=5,
+    learning_rate=0.1
+)
+
+parser = argparse.ArgumentParser(description="Train the LoL win-probability model")
+parser.add_argument('--incremental', action='store_true',
+                    help='add boosting rounds to the newest artifact using only new or changed match files')
+parser.add_argument('--rounds', type=int, default=20, help='trees added by an incremental run')
+parser.add_argument('--replay', type=float, default=0.1,
+                    help='fraction of already-trained rows mixed into an incremental run')
+parser.add_argument('--streaming', action='store_true',
+                    help='train out of core from CSV chunks instead of building the full DataFrame')
+parser.add_argument('--chunk-rows', type=int, default=100_000, help='rows per chunk in --streaming mode')
+parser.add_argument('--search', action='store_true',
+                    help='time-budgeted hyperparameter search instead of the fixed configuration')
+parser.add_argument('--budget', type=float, default=300, help='seconds of search before the last trials finish')
+parser.add_argument('--tolerance', type=float, default=0.005,
+                    help='accuracy the search may give up for a faster model (0.005 = half a point)')
+parser.add_argument('--jobs', type=int, default=None, help='parallel search trials (default: all cores)')
+parser.add_argument('--rebuild-features', action='store_true',
+                    help='recompute Phases 1-4 even when the feature store has these inputs')
+args = parser.parse_args()
+if sum([args.streaming, args.incremental, args.search]) > 1:
+    parser.error('--streaming, --incremental and --search cannot be combined')
+feature_store = FeatureStore(FEATURE_STORE_DIR)
 
 # --- PHASE 1: DATA LOADING & CONSOLIDATION ---
 print("\n[PHASE 1] Loading LoL Historical Data...")
-all_matches_files = glob.glob(os.path.join(DATA_DIR, "matches/*.csv"), recursive=False)
+all_matches_files = sorted(glob.glob(os.path.join(DATA_DIR, "matches/*.csv"), recursive=False))
 
 if not all_matches_files:
     print("ERROR: No match CSV files found in 'matches/' folder.")
     print("Please ensure your LoL data is organized appropriately.")
     exit()
 
-df_list = []
-for filename in all_matches_files:
-    try:
-        df = pd.read_csv(filename, low_memory=False)
-        df_list.append(df)
-        print(f"  ✓ Match Data: {os.path.basename(filename)} ({len(df)} rows)")
-    except Exception as e:
-        print(f"  ✗ {filename}: {e}")
-
-if not df_list:
-    print("ERROR: Could not load any data.")
+if args.streaming:
+    # --- OUT-OF-CORE TRAINING: Phases 2-8 on CSV chunks, master_df is never built ---
+    print(f"\n[STREAMING] Training from {len(all_matches_files)} files in chunks of {args.chunk_rows:,} rows...")
+    lol_kernel = LOL_SPEC.bind()
+    chunks = CsvChunks(all_matches_files, dtype=CSV_DTYPES, columns=list(CSV_DTYPES), chunk_rows=args.chunk_rows)
+
+    def prepare(chunk):
+        # Same cleaning and features as the in-memory phases, one chunk at a time
+        chunk = chunk.dropna(subset=[c for c in CRITICAL_FEATURES if c in chunk.columns])
+        X = lol_kernel.transform(chunk)
+        y = clean_boolean(chunk['win']).to_numpy()
+        keep = ~np.isnan(X).any(axis=1)
+        X, y = X[keep], y[keep]
+        X[np.isinf(X)] = 0
+        return X, y
+
+    model, scaler, report = train_streaming(chunks, prepare, LOL_SPEC.feature_names, MODEL_PARAMS,
+                                            num_boost_round=100, cache_dir=DATA_DIR)
+    y_test, pred_proba = report["y_holdout"], report["p_holdout"]
+    print(f"  Rows: {report['rows']:,} | Training: {report['train_rows']:,} | Testing: {report['holdout_rows']:,}")
+    print("  " + " | ".join(f"{phase} {seconds:.2f}s" for phase, seconds in report["seconds"].items()))
+    print(f"  Accuracy:        {accuracy_score(y_test, pred_proba > 0.5)*100:.2f}%")
+    print(f"  ROC-AUC Score:   {roc_auc_score(y_test, pred_proba):.4f}")
+
+    save_pair(model, scaler, OUTPUT_MODEL_PATH, 'scaler.joblib')
+    save_manifest(DATA_DIR, BASE_VERSION, OUTPUT_MODEL_PATH, file_keys(all_matches_files))
+    with open('features.txt', 'w') as f:
+        f.write('\n'.join(LOL_SPEC.feature_names))
+    print(f"✓ Model saved: {OUTPUT_MODEL_PATH}")
+    print(f"✓ Scaler saved: scaler.joblib")
     exit()
 
-master_df = pd.concat(df_list, axis=0, ignore_index=True)
-print(f"\n  Total Records: {len(master_df):,}")
-
-# --- PHASE 2: DATA CLEANING & PREPROCESSING ---
-print("\n[PHASE 2] Data Cleaning & Preprocessing...")
-
-# CSV columns based on actual data: kills, deaths, assists, gold_earned, win, duration,
-# damage_to_champ, damage_dealt, damage_taken, vision_score, kill_participation,
-# team_baronKills, team_dragonKills, team_towerKills, etc.
-
-critical_features = ['kills', 'deaths', 'assists', 'gold_earned', 'win']
-available_critical = [c for c in critical_features if c in master_df.columns]
-master_df = master_df.dropna(subset=available_critical)
-print(f"  After cleaning: {len(master_df):,} records")
-
-# Clean win column (convert TRUE/FALSE string to 1/0)
-def clean_boolean(val):
-    if pd.isna(val):
-        return 0
-    if isinstance(val, bool):
-        return 1 if val else 0
-    val_str = str(val).upper().strip()
-    if val_str in ['TRUE', '1', 'YES', 'WIN']:
-        return 1
-    return 0
-
-master_df['win_binary'] = master_df['win'].apply(clean_boolean)
-print(f"  Win distribution: Win={master_df['win_binary'].sum():,} | Loss={len(master_df) - master_df['win_binary'].sum():,}")
-
-# --- PHASE 3: FEATURE ENGINEERING (PREDICTIVE ONLY - NO LEAKAGE) ---
-print("\n[PHASE 3] Advanced Feature Engineering (Predictive Features Only)...")
-
-# 1. SKILL-BASED METRICS
-master_df['KDA_Ratio'] = (master_df['kills'] + master_df['assists']) / (master_df['deaths'] + 1)
-master_df['Kill_Death_Diff'] = master_df['kills'] - master_df['deaths']
-master_df['Survival_Rate'] = 1.0 / (master_df['deaths'] + 1)
-master_df['Assist_Ratio'] = master_df['assists'] / (master_df['kills'] + 1)
-
-# 2. ECONOMY METRICS
-master_df['Gold_Efficiency'] = master_df['gold_earned'] / (master_df['duration'] / 60.0 + 1)
-master_df['Gold_Spent_Ratio'] = master_df['gold_spent'] / (master_df['gold_earned'] + 1)
-
-# 3. DAMAGE METRICS
-master_df['Damage_Efficiency'] = master_df['damage_to_champ'] / (master_df['damage_dealt'] + 1)
-master_df['Damage_Per_Gold'] = master_df['damage_to_champ'] / (master_df['gold_earned'] + 1)
-master_df['Damage_Taken_Ratio'] = master_df['damage_taken'] / (master_df['damage_dealt'] + 1)
-
-# 4. ENGAGEMENT METRICS
-master_df['Vision_Per_Min'] = master_df['vision_score'] / (master_df['duration'] / 60.0 + 1)
-
-# 5. TEAM OBJECTIVE METRICS (normalized)
-master_df['Objective_Control'] = (
-    master_df['team_baronKills'] * 3 + 
-    master_df['team_dragonKills'] * 2 + 
-    master_df['team_riftHeraldKills'] * 1.5 + 
-    master_df['team_towerKills'] + 
-    master_df['team_inhibitorKills'] * 2
-) / 20.0
-
-# 6. FINAL STATS METRICS (end game power level)
-master_df['Final_Power_Score'] = (
-    master_df['final_attackDamage'] + 
-    master_df['final_abilityPower'] + 
-    master_df['final_armor'] + 
-    master_df['final_health'] / 10
-) / 100.0
-
-# CREATE TARGET
-print("  Creating target variable (Win/Loss)...")
-master_df['Target'] = master_df['win_binary']
+if args.incremental:
+    base = base_artifact(DATA_DIR, MODEL_NAME)
+    if base is None:
+        print("ERROR: --incremental needs an existing model. Run a full training first.")
+        exit()
+    base_version, base_model_path, base_scaler_path = base
+    new_files, seen_files = split_new_files(all_matches_files, load_manifest(DATA_DIR), base_model_path)
+    if not new_files:
+        print(f"✓ No new match files since model version '{base_version}'. Nothing to train.")
+        exit()
+    print(f"  Incremental from '{base_version}': {len(new_files)} new/changed, {len(seen_files)} already trained")
 
 # Select features for prediction
-ENGINEERED_FEATURES = [
-    'deaths', 'kills', 'assists', 
-    'KDA_Ratio', 'Kill_Death_Diff', 'Survival_Rate', 'Assist_Ratio',
-    'Gold_Efficiency', 'Gold_Spent_Ratio',
-    'Damage_Efficiency', 'Damage_Per_Gold', 'Damage_Taken_Ratio',
-    'Vision_Per_Min', 'Objective_Control', 'Final_Power_Score',
-    'kill_participation'
-]
-
-# Filter to only available columns
-ENGINEERED_FEATURES = [f for f in ENGINEERED_FEATURES if f in master_df.columns]
-
-# --- PHASE 4: DATA PREPARATION ---
-print("\n[PHASE 4] Data Preparation & Normalization...")
-
-master_df = master_df.dropna(subset=ENGINEERED_FEATURES + ['Target'])
-X = master_df[ENGINEERED_FEATURES].copy()
-y = master_df['Target'].copy()
-
-X = X.replace([np.inf, -np.inf], 0).fillna(0)
-
-# Clip outliers (Z-score > 3)
-for col in X.columns:
-    mean, std = X[col].mean(), X[col].std()
-    if std > 0:
-        X[col] = X[col].clip(mean - 3*std, mean + 3*std)
+ENGINEERED_FEATURES = LOL_SPEC.feature_names
+
+# Engineered features of exactly these inputs come from the feature store, skipping Phases 1-4
+input_keys = file_keys(all_matches_files)
+features_key = feature_key(LOL_SPEC.features, input_keys, {"critical": CRITICAL_FEATURES, "clip_z": 3})
+store_start = time.perf_counter()
+stored = None if args.rebuild_features else feature_store.open('lol', features_key)
+if stored is not None:
+    X, y, sources = stored.frame(), pd.Series(stored.target), stored.sources
+    print(f"  ✓ Feature store {features_key}: {stored.rows:,} rows x {len(stored.feature_names)} features "
+          f"opened in {(time.perf_counter() - store_start) * 1000:.1f} ms")
+else:
+    # Parsed in parallel with explicit dtypes; unchanged files come from the
+    # content-hashed columnar cache instead of being parsed again
+    ingest_start = time.perf_counter()
+    master_df, ingest = load_csvs(all_matches_files, CACHE_DIR, dtype=CSV_DTYPES, columns=list(CSV_DTYPES))
+    for info in ingest:
+        if "error" in info:
+            print(f"  ✗ {info['file']}: {info['error']}")
+        else:
+            source = "cache" if info["cached"] else "parsed"
+            print(f"  ✓ Match Data: {info['file']} ({info['rows']} rows, {source} in {info['seconds']:.2f}s)")
+
+    if master_df.empty:
+        print("ERROR: Could not load any data.")
+        exit()
+
+    cached = sum(info["cached"] for info in ingest)
+    run = "warm" if cached == len(ingest) else ("cold" if cached == 0 else "partial")
+    print(f"  Ingest ({run}, {cached}/{len(ingest)} files cached, {CACHE_FORMAT}): {time.perf_counter() - ingest_start:.2f}s")
+
+    # Row -> source file, so an incremental run can pick out rows from new files
+    loaded = [(path, info["rows"]) for path, info in zip(all_matches_files, ingest) if "error" not in info]
+    master_df['source_file'] = np.repeat([path for path, _ in loaded], [rows for _, rows in loaded])
+
+    print(f"\n  Total Records: {len(master_df):,}")
+
+    # --- PHASE 2: DATA CLEANING & PREPROCESSING ---
+    print("\n[PHASE 2] Data Cleaning & Preprocessing...")
+
+    # CSV columns based on actual data: kills, deaths, assists, gold_earned, win, duration,
+    # damage_to_champ, damage_dealt, damage_taken, vision_score, kill_participation,
+    # team_baronKills, team_dragonKills, team_towerKills, etc.
+
+    available_critical = [c for c in CRITICAL_FEATURES if c in master_df.columns]
+    master_df = master_df.dropna(subset=available_critical)
+    print(f"  After cleaning: {len(master_df):,} records")
+
+    # Clean win column (convert TRUE/FALSE string to 1/0)
+    master_df['win_binary'] = clean_boolean(master_df['win'])
+    print(f"  Win distribution: Win={master_df['win_binary'].sum():,} | Loss={len(master_df) - master_df['win_binary'].sum():,}")
+
+    # --- PHASE 3: FEATURE ENGINEERING (PREDICTIVE ONLY - NO LEAKAGE) ---
+    print("\n[PHASE 3] Advanced Feature Engineering (Predictive Features Only)...")
+
+    # Skill, economy, damage, engagement, objective and end-game power metrics.
+    # Same spec as LoLPredictor (feature_spec.LOL_SPEC), evaluated column-wise.
+    lol_kernel = LOL_SPEC.bind()
+    master_df[LOL_SPEC.feature_names] = lol_kernel.transform(master_df)
+
+    # CREATE TARGET
+    print("  Creating target variable (Win/Loss)...")
+    master_df['Target'] = master_df['win_binary']
+
+    # --- PHASE 4: DATA PREPARATION ---
+    print("\n[PHASE 4] Data Preparation & Normalization...")
+
+    master_df = master_df.dropna(subset=ENGINEERED_FEATURES + ['Target'])
+    X = master_df[ENGINEERED_FEATURES].copy()
+    y = master_df['Target'].copy()
+
+    X = X.replace([np.inf, -np.inf], 0).fillna(0)
+
+    # Clip outliers (Z-score > 3)
+    X = clip_outliers(X, z=3)
+
+    # Stored with the features, so incremental runs can still pick rows by file on a store hit
+    sources = master_df['source_file'].to_numpy()
+    feature_store.save('lol', features_key, X, y, sources=sources)
+    print(f"  ✓ Features saved to the feature store: {features_key}")
+
+if args.incremental:
+    # New rows plus a replay sample of old ones, so the added trees don't just fit the latest tournament
+    keep = training_rows(sources, new_files, args.replay)
+    X, y = X[keep], y[keep]
 
 print(f"  Final dataset: {len(X):,} samples, {len(ENGINEERED_FEATURES)} features")
 print(f"  Target distribution: Win={y.sum():,} ({y.mean()*100:.1f}%) | Loss={len(y)-y.sum():,} ({(1-y.mean())*100:.1f}%)")
@@ -146,8 +217,13 @@ print(f"  Features: {ENGINEERED_FEATURES}")
 
 # --- PHASE 5: FEATURE SCALING ---
 print("\n[PHASE 5] Feature Scaling (RobustScaler)...")
-scaler = RobustScaler()
-X_scaled = scaler.fit_transform(X)
+if args.incremental:
+    # The existing trees split on features scaled this way, so the scaler is reused, not refit
+    scaler = joblib.load(base_scaler_path)
+    X_scaled = scaler.transform(X)
+else:
+    scaler = RobustScaler()
+    X_scaled = scaler.fit_transform(X)
 X = pd.DataFrame(X_scaled, columns=ENGINEERED_FEATURES)
 
 # --- PHASE 6: TRAIN-TEST SPLIT ---
@@ -159,16 +235,20 @@ print(f"  Training: {len(X_train):,} | Testing: {len(X_test):,}")
 
 # --- PHASE 7: TRAINING ---
 print("\n[PHASE 7] Fast Training...")
-model = xgb.XGBClassifier(
-    objective='binary:logistic',
-    use_label_encoder=False,
-    eval_metric='logloss',
-    random_state=42,
-    n_estimators=100,
-    max_depth=5,
-    learning_rate=0.1
-)
-model.fit(X_train, y_train)
+train_start = time.perf_counter()
+if args.incremental:
+    model = continue_training(base_model_path, X_train, y_train, args.rounds, **MODEL_PARAMS)
+elif args.search:
+    # Early stopping and selection use a fold of the training split; X_test stays untouched for Phase 8
+    model, search_log = search(X_train, y_train, MODEL_PARAMS, budget_seconds=args.budget,
+                               tolerance=args.tolerance, jobs=args.jobs, log_path=SEARCH_LOG_PATH)
+    for line in summary_lines(search_log):
+        print(f"  {line}")
+    print(f"  ✓ Search log saved: {SEARCH_LOG_PATH}")
+else:
+    model = xgb.XGBClassifier(n_estimators=100, **MODEL_PARAMS)
+    model.fit(X_train, y_train)
+print(f"  Training time: {time.perf_counter() - train_start:.2f}s ({model.get_booster().num_boosted_rounds()} trees)")
 
 # --- PHASE 8: MODEL EVALUATION ---
 print("\n[PHASE 8] Model Evaluation & Validation...")
@@ -184,6 +264,10 @@ print(f"MODEL PERFORMANCE METRICS")
 print(f"{'='*80}")
 print(f"  Accuracy:        {accuracy*100:.2f}%")
 print(f"  ROC-AUC Score:   {auc_score:.4f}")
+if args.incremental:
+    base_model = xgb.XGBClassifier()
+    base_model.load_model(base_model_path)
+    print(f"  Base '{base_version}' ROC-AUC on the same holdout: {roc_auc_score(y_test, base_model.predict_proba(X_test)[:, 1]):.4f}")
 print(f"{'='*80}")
 
 print("\nDetailed Classification Report:")
@@ -210,15 +294,21 @@ for idx, row in importance_df.head(10).iterrows():
 
 # --- PHASE 10: SAVING ---
 print(f"\n[PHASE 10] Saving Model and Scaler...")
-model.save_model(OUTPUT_MODEL_PATH)
-joblib.dump(scaler, 'scaler.joblib')
+if args.incremental:
+    # Versioned pair: a running server's ModelRegistry picks it up as the newest artifact
+    version = next_version(DATA_DIR, MODEL_NAME)
+    model_path, scaler_path = save_versioned(model, scaler, DATA_DIR, MODEL_NAME, version)
+    save_manifest(DATA_DIR, version, model_path, input_keys, parent=base_version)
+else:
+    model_path, scaler_path = save_pair(model, scaler, OUTPUT_MODEL_PATH, 'scaler.joblib')
+    save_manifest(DATA_DIR, BASE_VERSION, model_path, input_keys)
 
 # Save feature list for reference
 with open('features.txt', 'w') as f:
     f.write('\n'.join(ENGINEERED_FEATURES))
 
-print(f"✓ Model saved: {OUTPUT_MODEL_PATH}")
-print(f"✓ Scaler saved: scaler.joblib")
+print(f"✓ Model saved: {model_path}")
+print(f"✓ Scaler saved: {scaler_path}")
 print(f"✓ Features saved: features.txt")
 
 print("\n" + "="*80)
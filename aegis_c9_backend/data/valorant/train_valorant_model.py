@@ -1,6 +1,10 @@
+import argparse
 import pandas as pd
 import glob
+import joblib
 import os
+import sys
+import time
 import xgboost as xgb
 from sklearn.model_selection import train_test_split, RandomizedSearchCV, cross_val_score
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, roc_auc_score, roc_curve
@@ -9,6 +13,17 @@ import numpy as np
 import warnings
 warnings.filterwarnings('ignore')
 
+# Shared feature spec lives in the backend root (aegis_c9_backend/feature_spec.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from feature_spec import VALORANT_CSV_KEYS, VALORANT_SPEC
+from feature_store import FeatureStore, feature_key
+from hyperparameter_search import search, summary_lines
+from incremental_training import (base_artifact, continue_training, file_keys, load_manifest, next_version,
+                                  save_manifest, save_pair, save_versioned, split_new_files, training_rows)
+from model_registry import BASE_VERSION
+from streaming_training import CsvChunks, streaming_median, train_streaming
+from training_prep import clean_numeric, clean_percentage, clip_outliers
+
 print("="*80)
 print("AEGIS-C9 VALORANT PREDICTION MODEL - ELITE COACHING SYSTEM")
 print("="*80)
@@ -16,10 +31,44 @@ print("="*80)
 # --- CONFIGURATION ---
 DATA_DIR = '.' 
 OUTPUT_MODEL_PATH = 'valorant_model.json'
+FEATURE_STORE_DIR = os.path.join(DATA_DIR, '.feature_store')
+MODEL_NAME = 'valorant_model'
+CRITICAL_FEATURES = ['Kills', 'Deaths', 'Assists', 'Rating', 'Team']
+SEARCH_LOG_PATH = 'search_log.json'
+MODEL_PARAMS = dict(
+    objective='binary:logistic',
+    use_label_encoder=False,
+    eval_metric='logloss',
+    random_state=42,
+    max_depth=5,
+    learning_rate=0.1
+)
+
+parser = argparse.ArgumentParser(description="Train the VALORANT performance model")
+parser.add_argument('--incremental', action='store_true',
+                    help='add boosting rounds to the newest artifact using only new or changed tournament folders')
+parser.add_argument('--rounds', type=int, default=20, help='trees added by an incremental run')
+parser.add_argument('--replay', type=float, default=0.1,
+                    help='fraction of already-trained rows mixed into an incremental run')
+parser.add_argument('--streaming', action='store_true',
+                    help='train out of core from CSV chunks instead of building the full DataFrame')
+parser.add_argument('--chunk-rows', type=int, default=100_000, help='rows per chunk in --streaming mode')
+parser.add_argument('--search', action='store_true',
+                    help='time-budgeted hyperparameter search instead of the fixed configuration')
+parser.add_argument('--budget', type=float, default=300, help='seconds of search before the last trials finish')
+parser.add_argument('--tolerance', type=float, default=0.005,
+                    help='accuracy the search may give up for a faster model (0.005 = half a point)')
+parser.add_argument('--jobs', type=int, default=None, help='parallel search trials (default: all cores)')
+parser.add_argument('--rebuild-features', action='store_true',
+                    help='recompute Phases 1-4 even when the feature store has these inputs')
+args = parser.parse_args()
+if sum([args.streaming, args.incremental, args.search]) > 1:
+    parser.error('--streaming, --incremental and --search cannot be combined')
+feature_store = FeatureStore(FEATURE_STORE_DIR)
 
 # --- PHASE 1: DATA LOADING & CONSOLIDATION ---
 print("\n[PHASE 1] Loading VCT Historical Data...")
-all_overview_files = glob.glob(os.path.join(DATA_DIR, "vct_*/matches/overview.csv"), recursive=False)
+all_overview_files = sorted(glob.glob(os.path.join(DATA_DIR, "vct_*/matches/overview.csv"), recursive=False))
 eco_files = glob.glob(os.path.join(DATA_DIR, "vct_*/matches/eco_stats.csv"), recursive=False)
 kills_files = glob.glob(os.path.join(DATA_DIR, "vct_*/matches/kills_stats.csv"), recursive=False)
 
@@ -27,127 +76,164 @@ if not all_overview_files:
     print("ERROR: No overview.csv files found.")
     exit()
 
-df_list = []
-eco_data = {}
-kills_data = {}
-
-# Load overview data
-for filename in all_overview_files:
-    try:
-        df = pd.read_csv(filename, low_memory=False)
-        df_list.append(df)
-        print(f"  ✓ Overview: {os.path.basename(os.path.dirname(filename))} ({len(df)} rows)")
-    except Exception as e:
-        print(f"  ✗ {filename}: {e}")
-
-# Load eco and kills data for enrichment
-for filename in eco_files:
-    try:
-        eco_df = pd.read_csv(filename, low_memory=False)
-        year = os.path.basename(os.path.dirname(os.path.dirname(filename)))
-        eco_data[year] = eco_df
-    except:
-        pass
-
-for filename in kills_files:
-    try:
-        kills_df = pd.read_csv(filename, low_memory=False)
-        year = os.path.basename(os.path.dirname(os.path.dirname(filename)))
-        kills_data[year] = kills_df
-    except:
-        pass
-
-master_df = pd.concat(df_list, axis=0, ignore_index=True)
-print(f"\n  Total Records: {len(master_df):,}")
-
-# --- PHASE 2: DATA CLEANING & PREPROCESSING ---
-print("\n[PHASE 2] Data Cleaning & Preprocessing...")
-
-# Remove rows with critical missing values
-critical_features = ['Kills', 'Deaths', 'Assists', 'Rating', 'Team']
-master_df = master_df.dropna(subset=critical_features)
-print(f"  After cleaning: {len(master_df):,} records")
-
-# Clean percentage columns
-def clean_percentage(val):
-    if pd.isna(val):
-        return 0.0
-    val_str = str(val).replace('%', '').strip()
-    try:
-        return float(val_str) / 100.0
-    except:
-        return 0.0
-
-# Clean numeric columns with 'inf' values
-def clean_numeric(val):
-    if pd.isna(val):
-        return 0.0
-    val_str = str(val).replace('inf', '0').strip()
-    try:
-        return float(val_str)
-    except:
-        return 0.0
-
-# Apply cleaning
-master_df['Headshot_Pct'] = master_df['Headshot %'].apply(clean_percentage)
-master_df['KD_Raw'] = master_df['Kills - Deaths (KD)'].apply(clean_numeric)
-
-# --- PHASE 3: FEATURE ENGINEERING (PREDICTIVE ONLY - NO LEAKAGE) ---
-print("\n[PHASE 3] Advanced Feature Engineering (Predictive Features Only)...")
-
-# 1. SKILL-BASED METRICS (Available before/during match, not dependent on outcome)
-master_df['Kill_Ratio'] = master_df['Kills'] / (master_df['Deaths'] + 1)
-master_df['Assist_to_Kill'] = master_df['Assists'] / (master_df['Kills'] + 1)
-master_df['Multi_Kill_Likelihood'] = (master_df['Kills'] ** 1.5) / 100
-master_df['Survival_Rate'] = 1.0 / (master_df['Deaths'] + 1)
-master_df['Headshot_Impact'] = master_df['Headshot_Pct'] * master_df['Kills']
-master_df['First_Blood_Dominance'] = master_df['First Kills'] - master_df['First Deaths']
-
-# 2. EFFICIENCY RATIOS (Not derivatives of the target)
-master_df['Kills_Per_Round'] = master_df['Kills'] / 13.0
-master_df['Damage_Per_Round'] = master_df['Average Damage Per Round'] / 50.0
-master_df['Consistency'] = 1.0 / (master_df['Deaths'] + 1)
-
-# 3. ENGAGEMENT METRICS
-master_df['First_Engagement'] = (master_df['First Kills'] + master_df['First Deaths']) / 26.0
-master_df['Clutch_Factor'] = (master_df['Kills'] - master_df['Assists']) / (master_df['Kills'] + 1)
-
-# 4. CREATE TRUE INDEPENDENT TARGET
-# Predict: "Is this player above-median in assists?" (different from kills prediction)
-print("  Creating target variable (Assists, independent of kills)...")
-master_df['Target'] = (master_df['Assists'] > master_df['Assists'].median()).astype(int)
-
-# Select features that DON'T include assists or kills-derivatives
-ENGINEERED_FEATURES = [
-    'Deaths', 'Headshot_Pct', 'First Kills', 'First Deaths',
-    'Survival_Rate', 'Headshot_Impact', 'First_Blood_Dominance',
-    'Damage_Per_Round', 'Consistency', 'First_Engagement', 'Clutch_Factor'
-]
-
-# --- PHASE 4: DATA PREPARATION ---
-print("\n[PHASE 4] Data Preparation & Normalization...")
-
-master_df = master_df.dropna(subset=ENGINEERED_FEATURES + ['Target'])
-X = master_df[ENGINEERED_FEATURES].copy()
-y = master_df['Target'].copy()
+if args.streaming:
+    # --- OUT-OF-CORE TRAINING: Phases 2-8 on CSV chunks, master_df is never built ---
+    print(f"\n[STREAMING] Training from {len(all_overview_files)} overview files in chunks of {args.chunk_rows:,} rows...")
+    valorant_kernel = VALORANT_SPEC.bind(keys={**VALORANT_CSV_KEYS, 'hs_pct': 'Headshot_Pct'})
+    chunks = CsvChunks(all_overview_files, columns=sorted(set(VALORANT_CSV_KEYS.values()) | set(CRITICAL_FEATURES)),
+                       chunk_rows=args.chunk_rows)
+    # The target threshold is a whole-history statistic, so it gets its own (single-column) pass
+    assists_median = streaming_median((chunk.dropna(subset=CRITICAL_FEATURES) for chunk in
+                                       CsvChunks(all_overview_files, columns=CRITICAL_FEATURES,
+                                                 chunk_rows=args.chunk_rows)), 'Assists')
+    print(f"  Assists median (target threshold): {assists_median}")
+
+    def prepare(chunk):
+        # Same cleaning, features and target as the in-memory phases, one chunk at a time
+        chunk = chunk.dropna(subset=CRITICAL_FEATURES).copy()
+        chunk['Headshot_Pct'] = clean_percentage(chunk['Headshot %'])
+        X = valorant_kernel.transform(chunk)
+        y = (chunk['Assists'] > assists_median).astype(int).to_numpy()
+        keep = ~np.isnan(X).any(axis=1)
+        X, y = X[keep], y[keep]
+        X[np.isinf(X)] = 0
+        return X, y
+
+    model, scaler, report = train_streaming(chunks, prepare, VALORANT_SPEC.feature_names, MODEL_PARAMS,
+                                            num_boost_round=100, cache_dir=DATA_DIR)
+    y_test, pred_proba = report["y_holdout"], report["p_holdout"]
+    print(f"  Rows: {report['rows']:,} | Training: {report['train_rows']:,} | Testing: {report['holdout_rows']:,}")
+    print("  " + " | ".join(f"{phase} {seconds:.2f}s" for phase, seconds in report["seconds"].items()))
+    print(f"  Accuracy:        {accuracy_score(y_test, pred_proba > 0.5)*100:.2f}%")
+    print(f"  ROC-AUC Score:   {roc_auc_score(y_test, pred_proba):.4f}")
+
+    save_pair(model, scaler, OUTPUT_MODEL_PATH, 'scaler.joblib')
+    save_manifest(DATA_DIR, BASE_VERSION, OUTPUT_MODEL_PATH, file_keys(all_overview_files))
+    print(f"✓ Model saved: {OUTPUT_MODEL_PATH}")
+    print(f"✓ Scaler saved: scaler.joblib")
+    exit()
 
-# Handle infinities and NaN
-X = X.replace([np.inf, -np.inf], 0)
-X = X.fillna(0)
+if args.incremental:
+    base = base_artifact(DATA_DIR, MODEL_NAME)
+    if base is None:
+        print("ERROR: --incremental needs an existing model. Run a full training first.")
+        exit()
+    base_version, base_model_path, base_scaler_path = base
+    new_files, seen_files = split_new_files(all_overview_files, load_manifest(DATA_DIR), base_model_path)
+    if not new_files:
+        print(f"✓ No new tournament data since model version '{base_version}'. Nothing to train.")
+        exit()
+    print(f"  Incremental from '{base_version}': {len(new_files)} new/changed, {len(seen_files)} already trained")
 
-# Clip outliers (Z-score > 3)
-for col in X.columns:
-    mean, std = X[col].mean(), X[col].std()
-    if std > 0:
-        X[col] = X[col].clip(mean - 3*std, mean + 3*std)
+# Select features that DON'T include assists or kills-derivatives
+ENGINEERED_FEATURES = VALORANT_SPEC.feature_names
+
+# Engineered features of exactly these inputs come from the feature store, skipping Phases 1-4
+# (eco/kills enrichment files are loaded but no feature uses them, so they are not part of the key)
+input_keys = file_keys(all_overview_files)
+features_key = feature_key(VALORANT_SPEC.features, input_keys,
+                           {"critical": CRITICAL_FEATURES, "target": "Assists > median", "clip_z": 3})
+store_start = time.perf_counter()
+stored = None if args.rebuild_features else feature_store.open('valorant', features_key)
+if stored is not None:
+    X, y, sources = stored.frame(), pd.Series(stored.target), stored.sources
+    print(f"  ✓ Feature store {features_key}: {stored.rows:,} rows x {len(stored.feature_names)} features "
+          f"opened in {(time.perf_counter() - store_start) * 1000:.1f} ms")
+else:
+    df_list = []
+    eco_data = {}
+    kills_data = {}
+
+    # Load overview data
+    for filename in all_overview_files:
+        try:
+            df = pd.read_csv(filename, low_memory=False)
+            df['source_file'] = filename
+            df_list.append(df)
+            print(f"  ✓ Overview: {os.path.basename(os.path.dirname(filename))} ({len(df)} rows)")
+        except Exception as e:
+            print(f"  ✗ {filename}: {e}")
+
+    # Load eco and kills data for enrichment
+    for filename in eco_files:
+        try:
+            eco_df = pd.read_csv(filename, low_memory=False)
+            year = os.path.basename(os.path.dirname(os.path.dirname(filename)))
+            eco_data[year] = eco_df
+        except:
+            pass
+
+    for filename in kills_files:
+        try:
+            kills_df = pd.read_csv(filename, low_memory=False)
+            year = os.path.basename(os.path.dirname(os.path.dirname(filename)))
+            kills_data[year] = kills_df
+        except:
+            pass
+
+    master_df = pd.concat(df_list, axis=0, ignore_index=True)
+    print(f"\n  Total Records: {len(master_df):,}")
+
+    # --- PHASE 2: DATA CLEANING & PREPROCESSING ---
+    print("\n[PHASE 2] Data Cleaning & Preprocessing...")
+
+    # Remove rows with critical missing values
+    master_df = master_df.dropna(subset=CRITICAL_FEATURES)
+    print(f"  After cleaning: {len(master_df):,} records")
+
+    # Clean percentage and 'inf'-laden numeric columns (whole-column string ops, see training_prep)
+    master_df['Headshot_Pct'] = clean_percentage(master_df['Headshot %'])
+    master_df['KD_Raw'] = clean_numeric(master_df['Kills - Deaths (KD)'])
+
+    # --- PHASE 3: FEATURE ENGINEERING (PREDICTIVE ONLY - NO LEAKAGE) ---
+    print("\n[PHASE 3] Advanced Feature Engineering (Predictive Features Only)...")
+
+    # Same spec as the live predictors (feature_spec.VALORANT_SPEC), evaluated
+    # column-wise over the whole frame. Headshot_Pct is already cleaned above.
+    valorant_kernel = VALORANT_SPEC.bind(keys={**VALORANT_CSV_KEYS, 'hs_pct': 'Headshot_Pct'})
+    master_df[VALORANT_SPEC.feature_names] = valorant_kernel.transform(master_df)
+
+    # CREATE TRUE INDEPENDENT TARGET
+    # Predict: "Is this player above-median in assists?" (different from kills prediction)
+    print("  Creating target variable (Assists, independent of kills)...")
+    master_df['Target'] = (master_df['Assists'] > master_df['Assists'].median()).astype(int)
+
+    # --- PHASE 4: DATA PREPARATION ---
+    print("\n[PHASE 4] Data Preparation & Normalization...")
+
+    master_df = master_df.dropna(subset=ENGINEERED_FEATURES + ['Target'])
+    X = master_df[ENGINEERED_FEATURES].copy()
+    y = master_df['Target'].copy()
+
+    # Handle infinities and NaN
+    X = X.replace([np.inf, -np.inf], 0)
+    X = X.fillna(0)
+
+    # Clip outliers (Z-score > 3)
+    X = clip_outliers(X, z=3)
+
+    # Stored with the features, so incremental runs can still pick rows by file on a store hit
+    sources = master_df['source_file'].to_numpy()
+    feature_store.save('valorant', features_key, X, y, sources=sources)
+    print(f"  ✓ Features saved to the feature store: {features_key}")
+
+if args.incremental:
+    # Target and clipping use the whole history as in a full run; only the rows fitted are restricted
+    keep = training_rows(sources, new_files, args.replay)
+    X, y = X[keep], y[keep]
 
 print(f"  Final dataset: {len(X):,} samples, {len(ENGINEERED_FEATURES)} features")
 print(f"  Target distribution: Win={y.sum():,} ({y.mean()*100:.1f}%) | Loss={len(y)-y.sum():,} ({(1-y.mean())*100:.1f}%)")
 
 # --- PHASE 5: FEATURE SCALING ---
 print("\n[PHASE 5] Feature Scaling (RobustScaler)...")
-scaler = RobustScaler()
-X_scaled = scaler.fit_transform(X)
+if args.incremental:
+    # The existing trees split on features scaled this way, so the scaler is reused, not refit
+    scaler = joblib.load(base_scaler_path)
+    X_scaled = scaler.transform(X)
+else:
+    scaler = RobustScaler()
+    X_scaled = scaler.fit_transform(X)
 X = pd.DataFrame(X_scaled, columns=ENGINEERED_FEATURES)
 
 # --- PHASE 6: TRAIN-TEST SPLIT ---
@@ -160,17 +246,20 @@ print(f"  Training: {len(X_train):,} | Testing: {len(X_test):,}")
 # --- PHASE 7: HYPERPARAMETER OPTIMIZATION ---
 print("\n[PHASE 7] Fast Training...")
 
-model = xgb.XGBClassifier(
-    objective='binary:logistic',
-    use_label_encoder=False,
-    eval_metric='logloss',
-    random_state=42,
-    n_estimators=100,
-    max_depth=5,
-    learning_rate=0.1
-)
-
-model.fit(X_train, y_train)
+train_start = time.perf_counter()
+if args.incremental:
+    model = continue_training(base_model_path, X_train, y_train, args.rounds, **MODEL_PARAMS)
+elif args.search:
+    # Early stopping and selection use a fold of the training split; X_test stays untouched for Phase 8
+    model, search_log = search(X_train, y_train, MODEL_PARAMS, budget_seconds=args.budget,
+                               tolerance=args.tolerance, jobs=args.jobs, log_path=SEARCH_LOG_PATH)
+    for line in summary_lines(search_log):
+        print(f"  {line}")
+    print(f"  ✓ Search log saved: {SEARCH_LOG_PATH}")
+else:
+    model = xgb.XGBClassifier(n_estimators=100, **MODEL_PARAMS)
+    model.fit(X_train, y_train)
+print(f"  Training time: {time.perf_counter() - train_start:.2f}s ({model.get_booster().num_boosted_rounds()} trees)")
 
 # --- PHASE 8: MODEL EVALUATION ---
 print("\n[PHASE 8] Model Evaluation & Validation...")
@@ -186,6 +275,10 @@ print(f"MODEL PERFORMANCE METRICS")
 print(f"{'='*80}")
 print(f"  Accuracy:        {accuracy*100:.2f}%")
 print(f"  ROC-AUC Score:   {auc_score:.4f}")
+if args.incremental:
+    base_model = xgb.XGBClassifier()
+    base_model.load_model(base_model_path)
+    print(f"  Base '{base_version}' ROC-AUC on the same holdout: {roc_auc_score(y_test, base_model.predict_proba(X_test)[:, 1]):.4f}")
 print(f"{'='*80}")
 
 print("\nDetailed Classification Report:")
@@ -212,12 +305,16 @@ for idx, row in feature_importance.head(10).iterrows():
 
 # --- PHASE 9: MODEL PERSISTENCE ---
 print(f"\n[PHASE 9] Saving Model and Scaler...")
-model.save_model(OUTPUT_MODEL_PATH)
-
-import joblib
-joblib.dump(scaler, 'scaler.joblib')
-print(f"✓ Model saved: {OUTPUT_MODEL_PATH}")
-print(f"✓ Scaler saved: scaler.joblib")
+if args.incremental:
+    # Versioned pair: a running server's ModelRegistry picks it up as the newest artifact
+    version = next_version(DATA_DIR, MODEL_NAME)
+    model_path, scaler_path = save_versioned(model, scaler, DATA_DIR, MODEL_NAME, version)
+    save_manifest(DATA_DIR, version, model_path, input_keys, parent=base_version)
+else:
+    model_path, scaler_path = save_pair(model, scaler, OUTPUT_MODEL_PATH, 'scaler.joblib')
+    save_manifest(DATA_DIR, BASE_VERSION, model_path, input_keys)
+print(f"✓ Model saved: {model_path}")
+print(f"✓ Scaler saved: {scaler_path}")
 
 # --- FINAL SUMMARY ---
 print("\n" + "="*80)
@@ -0,0 +1,122 @@
+import os
+import threading
+from collections import OrderedDict, deque
+
+
+def event_key(event):
+    """Identity of a GRID event: its id, or (type, period, time) for id-less events"""
+    if event.get('id') is not None:
+        return ('id', str(event['id']))
+    return ('fields', event.get('type'), event.get('period'), event.get('time'))
+
+
+class SeriesEventLog:
+    """
+    Bounded, de-duplicated event log of one series.
+
+    Every event accepted by append() gets a local sequence number, so
+    consumers can ask for everything after the last seq they processed and see
+    each event exactly once. `cursor` is the id of the newest GRID event and is
+    sent back upstream so each poll only transfers events after it.
+    """
+
+    def __init__(self, max_events=2000):
+        self.max_events = max_events
+        self._events = deque()
+        self._keys = set()
+        self.cursor = None
+        self.last_seq = 0
+        self.duplicates = 0
+        self.evicted = 0
+
+    def append(self, events):
+        """Store the events not seen before; returns them with their seq"""
+        new = []
+        for event in events or []:
+            key = event_key(event)
+            if key in self._keys:
+                self.duplicates += 1
+                continue
+            self.last_seq += 1
+            entry = {**event, "seq": self.last_seq}
+            self._events.append((key, entry))
+            self._keys.add(key)
+            new.append(entry)
+            if event.get('id') is not None:
+                self.cursor = str(event['id'])
+        while len(self._events) > self.max_events:
+            key, _ = self._events.popleft()
+            self._keys.discard(key)
+            self.evicted += 1
+        return new
+
+    @property
+    def oldest_seq(self):
+        """seq of the oldest event still held; consumers behind it missed evicted events"""
+        return self._events[0][1]['seq'] if self._events else None
+
+    def since(self, seq=0, limit=None):
+        """Events with seq > seq, oldest first (only those still in the log)"""
+        events = [entry for _, entry in self._events if entry['seq'] > seq]
+        return events[:limit] if limit else events
+
+    def stats(self):
+        return {
+            "events": len(self._events),
+            "last_seq": self.last_seq,
+            "oldest_seq": self.oldest_seq,
+            "cursor": self.cursor,
+            "duplicates": self.duplicates,
+            "evicted": self.evicted,
+        }
+
+
+class EventIngestor:
+    """Per-series event logs, with the least recently polled series dropped beyond max_series"""
+
+    def __init__(self, max_events=2000, max_series=64):
+        self.max_events = max_events
+        self.max_series = max_series
+        self._logs = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Ingestor sized by AEGIS_EVENT_LOG_SIZE (events per series) and AEGIS_EVENT_LOG_SERIES"""
+        return cls(
+            max_events=int(os.getenv('AEGIS_EVENT_LOG_SIZE', '2000')),
+            max_series=int(os.getenv('AEGIS_EVENT_LOG_SERIES', '64')),
+        )
+
+    def log(self, series_id, create=True):
+        series_id = str(series_id)
+        with self._lock:
+            log = self._logs.get(series_id)
+            if log is None and create:
+                log = self._logs[series_id] = SeriesEventLog(self.max_events)
+                while len(self._logs) > self.max_series:
+                    self._logs.popitem(last=False)
+            elif log is not None:
+                self._logs.move_to_end(series_id)
+            return log
+
+    def cursor(self, series_id):
+        log = self.log(series_id, create=False)
+        return log.cursor if log else None
+
+    def ingest(self, series_id, events):
+        """Append a poll's events to the series log; returns only the new ones"""
+        log = self.log(series_id)
+        with self._lock:
+            return log.append(events)
+
+    def since(self, series_id, seq=0, limit=None):
+        log = self.log(series_id, create=False)
+        if log is None:
+            return []
+        with self._lock:
+            return log.since(seq, limit)
+
+    def stats(self):
+        with self._lock:
+            return {series_id: log.stats() for series_id, log in self._logs.items()}
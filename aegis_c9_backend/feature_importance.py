@@ -0,0 +1,60 @@
+import hashlib
+import json
+
+IMPORTANCE_TYPES = ('gain', 'cover', 'weight')
+
+
+def display_name(feature):
+    """'Objective_Control' -> 'Objective Control', 'kill_participation' -> 'Kill Participation'"""
+    name = feature.replace('_', ' ')
+    return name.title() if name.islower() else name
+
+
+class FeatureImportance:
+    """
+    Feature-importance payload of one loaded model, built once per load and
+    never mutated (like the ModelBundle that owns it).
+
+    `body` is the pre-serialized JSON served by /api/feature-importance/<game>
+    and `etag` a digest of it. Prediction responses embed only `ref` (that
+    URL, the etag and the version), so clients fetch the payload once and
+    re-download it only after a hot reload changed the etag.
+    """
+
+    def __init__(self, game, version, source, items):
+        self.game = game
+        self.version = version
+        self.source = source
+        self.items = tuple(items)
+        doc = {"game": game, "version": version, "source": source, "features": self.items}
+        self.body = json.dumps(doc, separators=(',', ':')).encode()
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=12).hexdigest()}"'
+        self.ref = {"url": f"/api/feature-importance/{game}", "etag": self.etag, "version": version}
+
+    @classmethod
+    def from_booster(cls, game, version, booster, feature_names=None):
+        """
+        gain/cover/weight per feature from the booster's splits, sorted by gain.
+        `importance` is each feature's share of the total gain in percent.
+        """
+        n = int(booster.num_features())
+        keys = booster.feature_names or [f'f{i}' for i in range(n)]
+        names = list(feature_names) if feature_names is not None and len(feature_names) == n else keys
+        scores = {kind: booster.get_score(importance_type=kind) for kind in IMPORTANCE_TYPES}
+        total_gain = sum(scores['gain'].values()) or 1.0
+        items = [
+            {
+                "name": display_name(name),
+                "feature": name,
+                "importance": round(scores['gain'].get(key, 0.0) / total_gain * 100, 1),
+                **{kind: round(float(scores[kind].get(key, 0.0)), 4) for kind in IMPORTANCE_TYPES},
+            }
+            for key, name in zip(keys, names)
+        ]
+        items.sort(key=lambda item: item['gain'], reverse=True)
+        return cls(game, version, 'model', items)
+
+    @classmethod
+    def static(cls, game, items):
+        """Payload for the built-in list shown while no model is loaded"""
+        return cls(game, None, 'static', [dict(item) for item in items])
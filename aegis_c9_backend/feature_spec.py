@@ -0,0 +1,190 @@
+import ast
+import numpy as np
+
+# Node types allowed in a feature expression: arithmetic over input names
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd,
+)
+
+NUMBER = 'number'
+PERCENT = 'percent'
+
+
+class FeatureSpec:
+    """
+    Declarative feature-engineering spec for one game.
+
+    inputs maps each raw input name to its parser (NUMBER or PERCENT).
+    features is an ordered list of (feature_name, expression) pairs, where an
+    expression is arithmetic over input names, e.g. '1.0 / (deaths + 1)'.
+    All expressions are compiled into a single function over column arrays,
+    so one spec serves a dict, a list of dicts or a training DataFrame.
+    """
+
+    def __init__(self, name, inputs, features):
+        self.name = name
+        self.inputs = dict(inputs)
+        self.features = list(features)
+        self.feature_names = [f for f, _ in self.features]
+        self._kernel = self._compile()
+
+    def _compile(self):
+        for feature, expr in self.features:
+            tree = ast.parse(expr, mode='eval')
+            for node in ast.walk(tree):
+                if not isinstance(node, _ALLOWED_NODES):
+                    raise ValueError(f"{self.name}.{feature}: unsupported syntax '{type(node).__name__}'")
+                if isinstance(node, ast.Name) and node.id not in self.inputs:
+                    raise ValueError(f"{self.name}.{feature}: unknown input '{node.id}'")
+
+        args = ', '.join(self.inputs)
+        body = ''.join(f"        {expr},  # {feature}\n" for feature, expr in self.features)
+        source = f"def {self.name}_features({args}):\n    return (\n{body}    )\n"
+        namespace = {}
+        exec(compile(source, f'<feature_spec:{self.name}>', 'exec'), {}, namespace)
+        return namespace[f'{self.name}_features']
+
+    def bind(self, keys=None, defaults=None, columns=None):
+        """
+        Bind the spec to a data source.
+
+        keys maps input names to the source's field/column names (identity
+        when omitted). defaults maps input names to values used when a field
+        is missing; inputs without a default are required. columns selects
+        and orders the output features (all of them, in spec order, by default).
+        """
+        return FeatureKernel(self, keys or {}, defaults or {}, columns)
+
+
+class FeatureKernel:
+    """A FeatureSpec bound to one source layout. transform() returns an (n, k) float64 matrix."""
+
+    def __init__(self, spec, keys, defaults, columns=None):
+        self.spec = spec
+        self.keys = {name: keys.get(name, name) for name in spec.inputs}
+        self.defaults = defaults
+        self.columns = list(columns) if columns is not None else list(spec.feature_names)
+        self._order = [spec.feature_names.index(c) for c in self.columns]
+
+    def _column(self, name, data):
+        key = self.keys[name]
+        if isinstance(data, dict):
+            values = [data[key] if key in data else self._default(name, key)]
+        elif isinstance(data, (list, tuple)):
+            values = [row[key] if key in row else self._default(name, key) for row in data]
+        elif key in data:
+            # DataFrame (or any mapping of columns)
+            values = data[key]
+            values = values.to_numpy() if hasattr(values, 'to_numpy') else values
+        else:
+            values = np.full(len(data), self._default(name, key), dtype=object)
+        return _parse(values, self.spec.inputs[name])
+
+    def _default(self, name, key):
+        if name not in self.defaults:
+            raise KeyError(key)
+        return self.defaults[name]
+
+    def transform(self, data):
+        """Engineer features for a dict, a list of dicts or a DataFrame."""
+        columns = [self._column(name, data) for name in self.spec.inputs]
+        n = len(columns[0]) if columns else 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            results = self.spec._kernel(*columns)
+        out = np.empty((n, len(self.columns)), dtype=np.float64)
+        for j, i in enumerate(self._order):
+            out[:, j] = results[i]
+        return out
+
+
+def _parse(values, kind):
+    # Lists from dict rows stay object arrays so mixed '25%' / 0.25 values keep their types
+    arr = np.asarray(values, dtype=object) if isinstance(values, list) else np.asarray(values)
+    if arr.dtype.kind in 'biuf':
+        return arr.astype(np.float64)
+    if kind == PERCENT:
+        # '25%' is a percentage; bare numbers are already fractions
+        if arr.dtype.kind == 'U':
+            return np.char.strip(np.char.replace(arr, '%', '')).astype(np.float64) / 100.0
+        return np.array([
+            float(v.replace('%', '').strip()) / 100.0 if isinstance(v, str) else float(v)
+            for v in arr
+        ], dtype=np.float64)
+    return arr.astype(np.float64)
+
+
+# --- VALORANT: player high-assist model (train_valorant_model.py) ---
+VALORANT_SPEC = FeatureSpec(
+    'valorant',
+    inputs={
+        'kills': NUMBER,
+        'deaths': NUMBER,
+        'assists': NUMBER,
+        'hs_pct': PERCENT,
+        'first_kills': NUMBER,
+        'first_deaths': NUMBER,
+        'adr': NUMBER,
+    },
+    features=[
+        ('Deaths', 'deaths'),
+        ('Headshot_Pct', 'hs_pct'),
+        ('First Kills', 'first_kills'),
+        ('First Deaths', 'first_deaths'),
+        ('Survival_Rate', '1.0 / (deaths + 1)'),
+        ('Headshot_Impact', 'hs_pct * kills'),
+        ('First_Blood_Dominance', 'first_kills - first_deaths'),
+        ('Damage_Per_Round', 'adr / 50.0'),
+        ('Consistency', '1.0 / (deaths + 1)'),
+        ('First_Engagement', '(first_kills + first_deaths) / 26.0'),
+        ('Clutch_Factor', '(kills - assists) / (kills + 1)'),
+    ],
+)
+
+# Column names in the VCT overview.csv and in live GRID player stats
+VALORANT_CSV_KEYS = {
+    'kills': 'Kills',
+    'deaths': 'Deaths',
+    'assists': 'Assists',
+    'hs_pct': 'Headshot %',
+    'first_kills': 'First Kills',
+    'first_deaths': 'First Deaths',
+    'adr': 'Average Damage Per Round',
+}
+
+# --- LoL: win-probability model (train_lol_model.py) ---
+LOL_SPEC = FeatureSpec(
+    'lol',
+    inputs={name: NUMBER for name in [
+        'kills', 'deaths', 'assists', 'gold_earned', 'gold_spent', 'duration',
+        'damage_dealt', 'damage_to_champ', 'damage_taken', 'vision_score',
+        'kill_participation', 'team_baronKills', 'team_dragonKills',
+        'team_riftHeraldKills', 'team_towerKills', 'team_inhibitorKills',
+        'final_attackDamage', 'final_abilityPower', 'final_armor', 'final_health',
+    ]},
+    features=[
+        ('deaths', 'deaths'),
+        ('kills', 'kills'),
+        ('assists', 'assists'),
+        # Skill-based metrics
+        ('KDA_Ratio', '(kills + assists) / (deaths + 1)'),
+        ('Kill_Death_Diff', 'kills - deaths'),
+        ('Survival_Rate', '1.0 / (deaths + 1)'),
+        ('Assist_Ratio', 'assists / (kills + 1)'),
+        # Economy metrics
+        ('Gold_Efficiency', 'gold_earned / (duration / 60.0 + 1)'),
+        ('Gold_Spent_Ratio', 'gold_spent / (gold_earned + 1)'),
+        # Damage metrics
+        ('Damage_Efficiency', 'damage_to_champ / (damage_dealt + 1)'),
+        ('Damage_Per_Gold', 'damage_to_champ / (gold_earned + 1)'),
+        ('Damage_Taken_Ratio', 'damage_taken / (damage_dealt + 1)'),
+        # Engagement and objective metrics
+        ('Vision_Per_Min', 'vision_score / (duration / 60.0 + 1)'),
+        ('Objective_Control',
+         '(team_baronKills * 3 + team_dragonKills * 2 + team_riftHeraldKills * 1.5'
+         ' + team_towerKills + team_inhibitorKills * 2) / 20.0'),
+        ('Final_Power_Score',
+         '(final_attackDamage + final_abilityPower + final_armor + final_health / 10) / 100.0'),
+        ('kill_participation', 'kill_participation'),
+    ],
+)
@@ -0,0 +1,138 @@
+"""
+Versioned, memory-mapped store for engineered training features.
+
+Each version is a directory <game>-<key>/ holding one .npy file per
+feature column, target.npy, an optional source.npy (index into the input
+file list, for incremental runs) and meta.json. The key hashes the feature
+list (names and expressions), the content hash of every input file and
+any pipeline parameters, so a changed spec, CSV or clipping rule gets a
+new version instead of stale features. Opening a version memory-maps the
+columns: no parsing and no copies until a column is actually read.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+import numpy as np
+
+STORE_VERSION = 1
+
+
+def feature_key(features, inputs, params=None):
+    """
+    Digest of the feature list ([(name, expression)] or names), the inputs
+    ({path: content hash}) and the pipeline parameters.
+    """
+    digest = hashlib.blake2b(digest_size=10)
+    doc = [STORE_VERSION, [list(f) if isinstance(f, (tuple, list)) else f for f in features],
+           sorted((os.path.basename(path), key) for path, key in inputs.items()), sorted((params or {}).items())]
+    digest.update(json.dumps(doc, default=str).encode())
+    return digest.hexdigest()
+
+
+class FeatureSet:
+    """One stored version, opened read-only. Columns are np.memmap views of the .npy files."""
+
+    def __init__(self, path, meta):
+        self.path = path
+        self.meta = meta
+        self.key = meta["key"]
+        self.feature_names = list(meta["features"])
+        self.rows = meta["rows"]
+        self.columns = {name: np.load(os.path.join(path, f'{i}.npy'), mmap_mode='r')
+                        for i, name in enumerate(self.feature_names)}
+        self.target = np.load(os.path.join(path, 'target.npy'), mmap_mode='r')
+        source = os.path.join(path, 'source.npy')
+        self._source = np.load(source, mmap_mode='r') if os.path.exists(source) else None
+
+    @property
+    def sources(self):
+        """Input file of every row (paths as given to save), or None if not stored"""
+        if self._source is None:
+            return None
+        return np.asarray(self.meta["sources"], dtype=object)[self._source]
+
+    def frame(self):
+        """DataFrame over the memory-mapped columns, without copying them"""
+        import pandas as pd
+        return pd.DataFrame(self.columns, copy=False)
+
+    def matrix(self, rows=None):
+        """(n, k) float64 array of all features (a copy), optionally of selected rows"""
+        columns = [self.columns[name] if rows is None else self.columns[name][rows] for name in self.feature_names]
+        return np.column_stack(columns) if columns else np.empty((self.rows, 0))
+
+
+class FeatureStore:
+    """
+    Directory of FeatureSet versions per game. Keeps the `keep` most recently
+    written versions of each game and removes older ones on save.
+    """
+
+    def __init__(self, root, keep=3):
+        self.root = root
+        self.keep = keep
+
+    def path(self, game, key):
+        return os.path.join(self.root, f'{game}-{key}')
+
+    def open(self, game, key):
+        """The stored version for key, or None when it was never saved (or is incomplete)"""
+        path = self.path(game, key)
+        try:
+            with open(os.path.join(path, 'meta.json')) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return FeatureSet(path, meta)
+
+    def save(self, game, key, X, y, feature_names=None, sources=None, meta=None):
+        """
+        Write X (DataFrame or 2-D array), y and optional per-row source file
+        names as a new version and return it opened. Files go to a temporary
+        directory that is renamed into place, so readers never see a partial
+        version.
+        """
+        feature_names = list(feature_names if feature_names is not None else X.columns)
+        values = X.to_numpy(dtype=np.float64) if hasattr(X, 'to_numpy') else np.asarray(X, dtype=np.float64)
+        os.makedirs(self.root, exist_ok=True)
+        final = self.path(game, key)
+        tmp = f'{final}.{os.getpid()}.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        try:
+            for i in range(len(feature_names)):
+                np.save(os.path.join(tmp, f'{i}.npy'), np.ascontiguousarray(values[:, i]))
+            np.save(os.path.join(tmp, 'target.npy'), np.asarray(y))
+            doc = {"game": game, "key": key, "features": feature_names, "rows": int(len(values)),
+                   "created_at": time.time(), **(meta or {})}
+            if sources is not None:
+                names, codes = np.unique(np.asarray(sources, dtype=str), return_inverse=True)
+                np.save(os.path.join(tmp, 'source.npy'), codes.astype(np.int32))
+                doc["sources"] = names.tolist()
+            with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+                json.dump(doc, f, indent=2)
+            shutil.rmtree(final, ignore_errors=True)
+            os.replace(tmp, final)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self._prune(game)
+        return self.open(game, key)
+
+    def versions(self, game):
+        """meta of every stored version of game, newest first"""
+        found = []
+        if os.path.isdir(self.root):
+            for name in os.listdir(self.root):
+                if name.startswith(f'{game}-') and not name.endswith('.tmp'):
+                    try:
+                        with open(os.path.join(self.root, name, 'meta.json')) as f:
+                            found.append(json.load(f))
+                    except (OSError, ValueError):
+                        continue
+        return sorted(found, key=lambda meta: meta["created_at"], reverse=True)
+
+    def _prune(self, game):
+        for meta in self.versions(game)[self.keep:]:
+            shutil.rmtree(self.path(game, meta["key"]), ignore_errors=True)
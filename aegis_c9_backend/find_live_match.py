@@ -1,11 +1,14 @@
-import xgboost as xgb
-import pandas as pd
 import numpy as np
 import os
-import joblib
+import threading
+from feature_spec import VALORANT_CSV_KEYS, VALORANT_SPEC
 
 class ValorantPredictor:
     def __init__(self, model_path='valorant_model.json', scaler_path='scaler.joblib'):
+        # Heavy imports deferred to first construction so importing this module stays cheap
+        import joblib
+        import xgboost as xgb
+
         # Find path relative to this script
         base_dir = os.path.dirname(os.path.abspath(__file__))
         data_dir = os.path.join(base_dir, 'data', 'valorant')
@@ -54,87 +57,123 @@ class ValorantPredictor:
             except:
                 pass
 
+        # Engineering shared with train_valorant_model.py (see feature_spec)
+        self.kernel = VALORANT_SPEC.bind(
+            keys=VALORANT_CSV_KEYS,
+            defaults={name: 0 for name in VALORANT_SPEC.inputs},
+            columns=self.features
+        )
+
+        # Cache the scaler's affine parameters in model feature order
+        self._center = None
+        self._scale_factors = None
+        center = getattr(self.scaler, 'center_', None)
+        scale = getattr(self.scaler, 'scale_', None)
+        if center is not None and scale is not None:
+            self._center = np.asarray(center, dtype=np.float64)
+            self._scale_factors = np.asarray(scale, dtype=np.float64)
+
     def _preprocess(self, data):
         """
         Preprocess raw match data into engineered features.
         Expected input 'data' is a dictionary with keys:
         'Kills', 'Deaths', 'Assists', 'Headshot %', 'First Kills', 'First Deaths', 'Average Damage Per Round'
         """
-        # Clean Headshot %
-        hs_pct_raw = data.get('Headshot %', '0%')
-        if isinstance(hs_pct_raw, str):
-            hs_pct = float(hs_pct_raw.replace('%', '').strip()) / 100.0
-        else:
-            hs_pct = float(hs_pct_raw)
-
-        kills = float(data.get('Kills', 0))
-        deaths = float(data.get('Deaths', 0))
-        assists = float(data.get('Assists', 0))
-        fk = float(data.get('First Kills', 0))
-        fd = float(data.get('First Deaths', 0))
-        adpr = float(data.get('Average Damage Per Round', 0))
-
-        # Engineering (Matching train_valorant_model.py)
-        survival_rate = 1.0 / (deaths + 1)
-        headshot_impact = hs_pct * kills
-        fb_dominance = fk - fd
-        damage_per_round = adpr / 50.0
-        consistency = 1.0 / (deaths + 1)
-        first_engagement = (fk + fd) / 26.0
-        clutch_factor = (kills - assists) / (kills + 1)
-
-        processed = {
-            'Deaths': deaths,
-            'Headshot_Pct': hs_pct,
-            'First Kills': fk,
-            'First Deaths': fd,
-            'Survival_Rate': survival_rate,
-            'Headshot_Impact': headshot_impact,
-            'First_Blood_Dominance': fb_dominance,
-            'Damage_Per_Round': damage_per_round,
-            'Consistency': consistency,
-            'First_Engagement': first_engagement,
-            'Clutch_Factor': clutch_factor
-        }
-
-        return pd.DataFrame([processed])[self.features]
+        import pandas as pd
+        return pd.DataFrame(self.kernel.transform(data), columns=self.features)
 
-    def predict_high_assists(self, player_stats):
+    def _feature_matrix(self, stats_list):
         """
-        Predicts if a player will have high assists (above median).
-        Returns probability of high assists.
+        Build one (n_players, n_features) matrix for a batch of raw stats dicts.
+        Returns the matrix and a boolean mask of rows that could be parsed;
+        unparseable rows are left as zeros and masked out.
+        """
+        try:
+            return self.kernel.transform(stats_list), np.ones(len(stats_list), dtype=bool)
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"Prediction error: {e}")
+
+        # Fall back to row-by-row so one malformed player doesn't blank the match
+        X = np.zeros((len(stats_list), len(self.features)), dtype=np.float64)
+        valid = np.ones(len(stats_list), dtype=bool)
+        for i, stats in enumerate(stats_list):
+            try:
+                X[i] = self.kernel.transform(stats)[0]
+            except (ValueError, TypeError, AttributeError):
+                valid[i] = False
+        return X, valid
+
+    def _scale(self, X):
+        """Apply the fitted scaler to a feature matrix in one pass."""
+        if self._center is not None:
+            # RobustScaler is a per-column affine map; applying it directly
+            # skips sklearn's per-call input validation.
+            X -= self._center
+            X /= self._scale_factors
+            return X
+        return self.scaler.transform(X)
+
+    def predict_batch(self, stats_list):
         """
+        Predicts high-assist probability for many players at once.
+        Returns a NumPy array aligned with stats_list.
+        """
+        n = len(stats_list)
         if self.model is None:
-            return 0.5 # Default if model not loaded
+            return np.full(n, 0.5) # Default if model not loaded
+        if n == 0:
+            return np.zeros(0)
 
+        X, valid = self._feature_matrix(stats_list)
+        proba = np.zeros(n)
         try:
-            X = self._preprocess(player_stats)
-            
-            # Apply scaling if available
             if self.scaler:
-                X_scaled = self.scaler.transform(X)
-                X = pd.DataFrame(X_scaled, columns=self.features)
-            
-            # DMatrix needs feature names if the model has them
-            dmatrix = xgb.DMatrix(X, feature_names=list(X.columns))
-            proba = self.model.predict(dmatrix)[0]
-            return float(proba)
+                X = self._scale(X)
+            # Single booster call for the whole batch; inplace_predict avoids
+            # building a DMatrix
+            proba[valid] = self.model.inplace_predict(X[valid])
         except Exception as e:
             print(f"Prediction error: {e}")
-            return 0.0
+            return np.zeros(n)
+        return proba
+
+    def predict_high_assists(self, player_stats):
+        """
+        Predicts if a player will have high assists (above median).
+        Returns probability of high assists.
+        """
+        if self.model is None:
+            return 0.5 # Default if model not loaded
+        return float(self.predict_batch([player_stats])[0])
+
+_shared_predictor = None
+_shared_predictor_lock = threading.Lock()
+
+def get_predictor():
+    """
+    Process-wide ValorantPredictor. The model and scaler are read from disk
+    once, on first use, instead of on every call.
+    """
+    global _shared_predictor
+    if _shared_predictor is None:
+        with _shared_predictor_lock:
+            if _shared_predictor is None:
+                _shared_predictor = ValorantPredictor()
+    return _shared_predictor
 
-def get_live_predictions(match_data):
+def get_live_predictions(match_data, predictor=None):
     """
     Interface function for bridge.py.
     Processes a list of players in match_data.
+    All players are scored in a single batched call on the shared predictor.
     """
-    predictor = ValorantPredictor()
+    if predictor is None:
+        predictor = get_predictor()
     predictions = []
     
     players = match_data.get('players', [])
-    for player in players:
-        stats = player.get('stats', {})
-        prob = predictor.predict_high_assists(stats)
+    probs = predictor.predict_batch([player.get('stats', {}) for player in players])
+    for player, prob in zip(players, probs.tolist()):
         predictions.append({
             'name': player.get('name', 'Unknown'),
             'team': player.get('team', 'Unknown'),
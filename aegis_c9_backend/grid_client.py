@@ -0,0 +1,306 @@
+import asyncio
+import copy
+import os
+import re
+import time
+import httpx
+from circuit_breaker import CircuitBreaker
+from prediction_cache import PredictionCache
+
+GRID_URL = "https://api.grid.gg/central-data/graphql"
+# GraphQL error codes meaning GRID refused us, rather than failed
+DENIED_CODES = ('PERMISSION_DENIED', 'UNAUTHENTICATED')
+# `denied` key standing for every series: the API key itself was refused
+_ALL_SERIES = b'*'
+
+
+class GridRequestError(Exception):
+    """GraphQL errors without a path: they concern a whole batched request, not one lookup"""
+
+    def __init__(self, errors):
+        super().__init__('; '.join(e.get('message', 'GraphQL error') for e in errors))
+        self.errors = errors
+
+
+class GridClient:
+    """
+    Async GraphQL client for GRID central-data.
+
+    One instance is shared by every endpoint: requests reuse a keep-alive
+    connection pool, at most max_concurrency run at once (the rest queue on a
+    semaphore), and each call has a deadline covering both queueing and the
+    HTTP round trip. Waiting never blocks the event loop.
+
+    A circuit breaker short-circuits calls while GRID keeps failing, and
+    `denied` remembers series GRID refused (PERMISSION_DENIED) for denied_ttl
+    seconds, so fallbacks answer immediately instead of waiting out errors.
+    A refusal of the whole request (a revoked key) denies every series.
+    """
+
+    def __init__(self, url=GRID_URL, api_key=None, deadline=10.0, max_concurrency=8,
+                 max_connections=20, keepalive_expiry=30.0, breaker=None, denied_ttl=300.0):
+        self.url = url
+        self.api_key = api_key
+        self.deadline = deadline
+        self.max_concurrency = max_concurrency
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(deadline),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.breaker = breaker or CircuitBreaker('GRID')
+        self.denied = PredictionCache(max_entries=1024, ttl=denied_ttl)
+        self.requests = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.total_seconds = 0.0
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """
+        Client configured from GRID_API_URL, GRID_API_KEY and AEGIS_GRID_DEADLINE
+        (seconds), AEGIS_GRID_CONCURRENCY, AEGIS_GRID_MAX_CONNECTIONS,
+        AEGIS_GRID_DENIED_TTL and AEGIS_GRID_BREAKER_THRESHOLD / _BACKOFF / _MAX_BACKOFF.
+        """
+        # Prioritize Environment Variable, but fallback to provided key for convenience
+        kwargs.setdefault('url', os.getenv('GRID_API_URL', GRID_URL))
+        kwargs.setdefault('api_key', os.getenv("GRID_API_KEY", "V3l3eJF14k9nFYZpYLHxVNQzPynQ5M9Uf6DWON4F"))
+        kwargs.setdefault('deadline', float(os.getenv('AEGIS_GRID_DEADLINE', '10')))
+        kwargs.setdefault('max_concurrency', int(os.getenv('AEGIS_GRID_CONCURRENCY', '8')))
+        kwargs.setdefault('max_connections', int(os.getenv('AEGIS_GRID_MAX_CONNECTIONS', '20')))
+        kwargs.setdefault('denied_ttl', float(os.getenv('AEGIS_GRID_DENIED_TTL', '300')))
+        kwargs.setdefault('breaker', CircuitBreaker.from_env('GRID', 'AEGIS_GRID_BREAKER'))
+        return cls(**kwargs)
+
+    async def query(self, query, variables=None, deadline=None):
+        """
+        POST a GraphQL query and return the decoded JSON body.
+        Raises httpx.HTTPError on transport/HTTP errors, asyncio.TimeoutError once
+        the deadline (default: the client's) has passed and CircuitOpenError,
+        without any network I/O, while the breaker is open.
+        """
+        self.breaker.before_call()
+        deadline = self.deadline if deadline is None else deadline
+        start = time.perf_counter()
+        self.requests += 1
+        try:
+            result = await asyncio.wait_for(self._post(query, variables), deadline)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.breaker.record_failure()
+            raise
+        except Exception:
+            self.failures += 1
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled by our caller: no verdict on GRID's health
+            self.breaker.release()
+            raise
+        finally:
+            self.total_seconds += time.perf_counter() - start
+        self.breaker.record_success()
+        return result
+
+    def is_denied(self, series_id):
+        return (self.denied.get(_ALL_SERIES) is not None
+                or self.denied.get(str(series_id).encode()) is not None)
+
+    def mark_denied(self, series_id=None):
+        """Remember series_id as refused; None means GRID refused the key, i.e. every series"""
+        self.denied.put(_ALL_SERIES if series_id is None else str(series_id).encode(), True)
+
+    async def _post(self, query, variables):
+        headers = {"x-api-key": self.api_key, "Content-Type": "application/json"}
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                response = await self._client.post(
+                    self.url,
+                    json={'query': query, 'variables': variables or {}},
+                    headers=headers,
+                )
+            finally:
+                self.in_flight -= 1
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    def stats(self):
+        return {
+            "url": self.url,
+            "requests": self.requests,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "deadline": self.deadline,
+            "avg_seconds": round(self.total_seconds / self.requests, 4) if self.requests else 0.0,
+            "breaker": self.breaker.stats(),
+            "denied": self.denied.stats(),
+        }
+
+
+class GridBatcher:
+    """
+    Coalesces concurrent single-object lookups into one aliased GraphQL query.
+
+    Callers ask for one id at a time; ids requested within `window` seconds
+    (or until max_batch distinct ids are pending) are sent together as
+
+        query <operation>($id0: ID!, $id1: ID!) {
+          s0: <field>(id: $id0) { <selection> }
+          s1: <field>(id: $id1) { <selection> }
+        }
+
+    and each caller gets back a response shaped like the single query:
+    {"data": {<field>: ...}} plus any errors whose path points at its alias.
+    Transport errors (including CircuitOpenError) are raised to every caller,
+    and so are errors without a path, as GridRequestError: they belong to the
+    request, not to any one of the series that happened to share it. If such
+    an error is a refusal (DENIED_CODES) the whole client is marked denied,
+    since every later request with the same key would be refused too.
+
+    variables declares extra per-lookup variables used inside the selection,
+    e.g. {'after': 'ID'} for `events(after: $after)`; each alias gets its own
+    copy ($after0, $after1, ...) filled from the keyword arguments of fetch().
+    """
+
+    def __init__(self, client, field, selection, operation='Batch', window=0.01, max_batch=25, variables=None):
+        self.client = client
+        self.field = field
+        self.selection = selection
+        self.operation = operation
+        self.variables = dict(variables or {})
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = {}
+        self._flush_task = None
+        # The event loop only holds tasks weakly; keep in-flight batches alive until they finish
+        self._tasks = set()
+        self.batches = 0
+        self.lookups = 0
+
+    async def fetch(self, object_id, **values):
+        unknown = set(values) - set(self.variables)
+        if unknown:
+            raise TypeError(f"Undeclared batch variables: {', '.join(sorted(unknown))}")
+        # Lookups of the same id with the same variables share one alias
+        key = (str(object_id), tuple(sorted(values.items())))
+        self.lookups += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(key, []).append(future)
+        if len(self._pending) >= self.max_batch:
+            self._dispatch()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        # Each waiter gets its own copy, since callers enrich responses in place
+        return copy.deepcopy(await future)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        self._flush_task = None
+        self._dispatch()
+
+    def _dispatch(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.create_task(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def aclose(self):
+        """Cancel queued and in-flight batches; their callers get CancelledError"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        batch, self._pending = self._pending, {}
+        for futures in batch.values():
+            for future in futures:
+                future.cancel()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def build_query(self, keys):
+        """Aliased query text and variables for [(object_id, ((name, value), ...)), ...]"""
+        params, fields, variables = [], [], {}
+        for i, (object_id, values) in enumerate(keys):
+            params.append(f'$id{i}: ID!')
+            variables[f'id{i}'] = object_id
+            selection = self.selection
+            values = dict(values)
+            for name, gql_type in self.variables.items():
+                params.append(f'${name}{i}: {gql_type}')
+                variables[f'{name}{i}'] = values.get(name)
+                selection = re.sub(rf'\${name}\b', f'${name}{i}', selection)
+            fields.append(f'  s{i}: {self.field}(id: $id{i}) {selection}')
+        return f'query {self.operation}({", ".join(params)}) {{\n' + '\n'.join(fields) + '\n}', variables
+
+    async def _send(self, batch):
+        ids = list(batch)
+        query, variables = self.build_query(ids)
+        self.batches += 1
+        try:
+            response = await self.client.query(query, variables)
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        except BaseException:
+            for futures in batch.values():
+                for future in futures:
+                    future.cancel()
+            raise
+
+        data = response.get('data') or {}
+        errors = response.get('errors') or []
+        request_errors = [e for e in errors if not e.get('path')]
+        if request_errors:
+            # Failed as a whole, like a transport error; not a verdict on any one series
+            if any(e.get('extensions', {}).get('code') in DENIED_CODES for e in request_errors):
+                self.client.mark_denied()
+            error = GridRequestError(request_errors)
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+            return
+        for i, key in enumerate(ids):
+            alias = f's{i}'
+            own = [e for e in errors if e['path'][0] == alias]
+            result = {"data": {self.field: data.get(alias)}}
+            if own:
+                result["errors"] = own
+            for future in batch[key]:
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self):
+        return {
+            "window": self.window,
+            "max_batch": self.max_batch,
+            "lookups": self.lookups,
+            "batches": self.batches,
+            "pending": len(self._pending),
+            "in_flight": len(self._tasks),
+        }
@@ -0,0 +1,198 @@
+"""
+Time-budgeted hyperparameter search for the training scripts.
+
+Random configurations of the hist tree method are trained in parallel
+(one thread per trial, each trial single-threaded, so all cores are busy
+and XGBoost releases the GIL while it trains), with early stopping on a
+validation fold. Once the budget is spent, every finished trial's model
+is timed on single-row predictions (the live service's request shape)
+through both inference engines, and the fastest trial whose validation
+accuracy is within `tolerance` of the best is refit and returned.
+"""
+import itertools
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import numpy as np
+from tree_engine import ENGINE_NUMPY, ENGINE_XGBOOST, TreeEnsemble, resolve_engine
+
+SEARCH_SPACE = {
+    "max_depth": [3, 4, 5, 6, 7, 8],
+    "learning_rate": (0.03, 0.3),      # log-uniform
+    "min_child_weight": [1, 2, 5, 10],
+    "subsample": (0.6, 1.0),
+    "colsample_bytree": (0.6, 1.0),
+    "max_bin": [64, 128, 256],
+}
+# The fixed configuration the scripts trained before search existed; always trial 0
+DEFAULT_TRIAL = {"max_depth": 5, "learning_rate": 0.1}
+
+
+def sample_params(rng):
+    lo, hi = SEARCH_SPACE["learning_rate"]
+    return {
+        "max_depth": int(rng.choice(SEARCH_SPACE["max_depth"])),
+        "learning_rate": round(float(np.exp(rng.uniform(np.log(lo), np.log(hi)))), 4),
+        "min_child_weight": int(rng.choice(SEARCH_SPACE["min_child_weight"])),
+        "subsample": round(float(rng.uniform(*SEARCH_SPACE["subsample"])), 2),
+        "colsample_bytree": round(float(rng.uniform(*SEARCH_SPACE["colsample_bytree"])), 2),
+        "max_bin": int(rng.choice(SEARCH_SPACE["max_bin"])),
+    }
+
+
+def _classifier(base_params, params, n_estimators, n_jobs, **extra):
+    import xgboost as xgb
+    # use_label_encoder is gone from XGBoost and only produces a warning per trial
+    base_params = {k: v for k, v in base_params.items() if k != 'use_label_encoder'}
+    return xgb.XGBClassifier(**{**base_params, **params, "tree_method": "hist", "n_estimators": n_estimators,
+                                "n_jobs": n_jobs, **extra})
+
+
+def run_trial(params, base_params, X_fit, y_fit, X_val, y_val, max_rounds=500, early_stopping_rounds=20):
+    """Train one configuration with early stopping; returns its log entry (and model)"""
+    start = time.perf_counter()
+    model = _classifier(base_params, params, max_rounds, 1, early_stopping_rounds=early_stopping_rounds)
+    model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+    fit_seconds = time.perf_counter() - start
+    rounds = model.best_iteration + 1
+    proba = model.predict_proba(X_val, iteration_range=(0, rounds))[:, 1]
+    eps = 1e-15
+    y = np.asarray(y_val)
+    return {
+        "params": params,
+        "rounds": rounds,
+        "accuracy": float(((proba > 0.5) == y).mean()),
+        "logloss": float(-np.mean(y * np.log(proba + eps) + (1 - y) * np.log(1 - proba + eps))),
+        "fit_seconds": round(fit_seconds, 3),
+        "model": model,
+    }
+
+
+def measure_latency(model, X, rounds=None, samples=200, repeats=3):
+    """
+    p50/p99 microseconds to score one row, per engine, the way ModelBundle
+    does it: XGBClassifier.predict_proba or the compiled TreeEnsemble. The
+    best of `repeats` passes is kept, so one noisy pass doesn't decide a trial.
+    """
+    booster = model.get_booster()
+    if rounds is not None:
+        booster = booster[:rounds]
+    import xgboost as xgb
+    single = xgb.XGBClassifier()
+    single.load_model(bytearray(booster.save_raw(raw_format='json')))
+    ensemble = TreeEnsemble.from_booster(booster)
+    rows = np.asarray(X, dtype=np.float64)[:samples]
+    scorers = {
+        ENGINE_XGBOOST: lambda row: single.predict_proba(row)[:, 1],
+        ENGINE_NUMPY: ensemble.predict_proba,
+    }
+    latency = {}
+    for engine, score in scorers.items():
+        score(rows[:1])  # first-call setup is not per-request cost
+        passes = []
+        for _ in range(repeats):
+            times = []
+            for i in range(len(rows)):
+                start = time.perf_counter()
+                score(rows[i:i + 1])
+                times.append(time.perf_counter() - start)
+            passes.append(np.percentile(times, [50, 99]) * 1e6)
+        p50, p99 = min(passes, key=lambda p: p[0])
+        latency[engine] = {"p50_us": round(float(p50), 1), "p99_us": round(float(p99), 1)}
+    return latency
+
+
+def select(trials, tolerance, engine):
+    """Fastest trial (p50 on `engine`) within `tolerance` accuracy of the best"""
+    best = max(t["accuracy"] for t in trials)
+    eligible = [t for t in trials if t["accuracy"] >= best - tolerance]
+    return min(eligible, key=lambda t: (t["latency"][engine]["p50_us"], -t["accuracy"]))
+
+
+def search(X, y, base_params, budget_seconds=300, tolerance=0.005, jobs=None, max_rounds=500,
+           early_stopping_rounds=20, engine=None, seed=42, log_path=None, latency_samples=200):
+    """
+    Random search over SEARCH_SPACE until budget_seconds is spent (trials
+    already running are allowed to finish). X, y are the training split;
+    a stratified 20% of it is the early-stopping/selection fold, and
+    latency_samples of its rows time each trial.
+
+    Returns (model, log): the selected configuration refit on all of X with
+    its early-stopped round count, and the search log (also written to
+    log_path as JSON when given).
+    """
+    from sklearn.model_selection import train_test_split
+
+    engine = resolve_engine(engine)
+    jobs = jobs or os.cpu_count() or 1
+    X_fit, X_val, y_fit, y_val = train_test_split(X, y, test_size=0.2, random_state=seed, stratify=y)
+    rng = np.random.default_rng(seed)
+    deadline = time.monotonic() + budget_seconds
+    started = time.perf_counter()
+    # Trial numbers follow submission, not completion, so DEFAULT_TRIAL is trial 0 with any `jobs`
+    trials, pending, numbers = [], {}, itertools.count()
+
+    def submit(pool, params):
+        future = pool.submit(run_trial, params, base_params, X_fit, y_fit, X_val, y_val,
+                             max_rounds, early_stopping_rounds)
+        pending[future] = next(numbers)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        submit(pool, dict(DEFAULT_TRIAL))
+        while len(pending) < jobs:
+            submit(pool, sample_params(rng))
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                trial = future.result()
+                trial["trial"] = pending.pop(future)
+                trials.append(trial)
+                if time.monotonic() < deadline:
+                    submit(pool, sample_params(rng))
+    search_seconds = time.perf_counter() - started
+    trials.sort(key=lambda t: t["trial"])
+
+    # Timed one at a time after the parallel phase, so trials don't skew each other's latency
+    for trial in trials:
+        trial["latency"] = measure_latency(trial["model"], X_val, trial["rounds"], latency_samples)
+    chosen = select(trials, tolerance, engine)
+
+    start = time.perf_counter()
+    model = _classifier(base_params, chosen["params"], chosen["rounds"], jobs)
+    model.fit(X, y)
+    refit_seconds = time.perf_counter() - start
+
+    log = {
+        "budget_seconds": budget_seconds,
+        "search_seconds": round(search_seconds, 2),
+        "refit_seconds": round(refit_seconds, 2),
+        "jobs": jobs,
+        "tolerance": tolerance,
+        "engine": engine,
+        "validation_rows": len(X_val),
+        "selected": chosen["trial"],
+        "trials": [{k: v for k, v in t.items() if k != "model"} for t in trials],
+    }
+    if log_path:
+        with open(log_path, 'w') as f:
+            json.dump(log, f, indent=2)
+    return model, log
+
+
+def summary_lines(log, limit=10):
+    """Table of the most accurate trials (and the selected one), for the training scripts' output"""
+    engine = log["engine"]
+    trials = sorted(log["trials"], key=lambda t: -t["accuracy"])
+    shown = trials[:limit] + [t for t in trials[limit:] if t["trial"] == log["selected"]]
+    lines = [f"{'':2}{'trial':>5} {'depth':>5} {'lr':>7} {'bins':>5} {'rounds':>6} {'val acc':>8} "
+             f"{'xgb p50 us':>11} {'numpy p50 us':>13} {'fit s':>7}"]
+    for t in shown:
+        p = t["params"]
+        mark = '*' if t["trial"] == log["selected"] else ''
+        lines.append(f"{mark:2}{t['trial']:>5} {p['max_depth']:>5} {p['learning_rate']:>7} {p.get('max_bin', 256):>5} "
+                     f"{t['rounds']:>6} {t['accuracy']*100:>7.2f}% {t['latency'][ENGINE_XGBOOST]['p50_us']:>11} "
+                     f"{t['latency'][ENGINE_NUMPY]['p50_us']:>13} {t['fit_seconds']:>7}")
+    lines.append(f"  {len(trials)} trials in {log['search_seconds']}s on {log['jobs']} workers; "
+                 f"* = fastest on {engine} within {log['tolerance']*100:.1f} pts of the best accuracy")
+    return lines
@@ -0,0 +1,114 @@
+"""
+Incremental (continued) training for the training scripts.
+
+A full run records the content hash of every input file in a training
+manifest next to the artifact it wrote. An incremental run starts from the
+newest artifact pair the ModelRegistry would serve, keeps its scaler, adds
+boosting rounds fitted on rows from files that are new or changed since the
+manifest (plus a replay sample of rows the model has already seen), and
+writes the result as a versioned pair the running server hot-swaps in.
+"""
+import json
+import os
+import time
+import numpy as np
+from csv_cache import content_key
+from model_registry import ModelRegistry
+
+MANIFEST_NAME = 'training_manifest.json'
+
+
+def base_artifact(data_dir, model_name):
+    """(version, model_path, scaler_path) of the newest complete artifact pair, or None"""
+    return ModelRegistry(os.path.basename(os.path.abspath(data_dir)), data_dir, model_name, engine=None).newest()
+
+
+def file_keys(paths):
+    """{path: content hash} for the training input files"""
+    return {path: content_key(path) for path in paths}
+
+
+def load_manifest(data_dir):
+    try:
+        with open(os.path.join(data_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(data_dir, version, model_path, files, parent=None):
+    manifest = {"version": version, "parent": parent, "model_path": model_path,
+                "trained_at": time.time(), "files": files}
+    path = os.path.join(data_dir, MANIFEST_NAME)
+    with open(f'{path}.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f'{path}.tmp', path)
+    return manifest
+
+
+def split_new_files(paths, manifest, model_path):
+    """
+    (new, seen) input files. With a manifest, a file is new when its path is
+    missing or its content hash changed; without one (artifacts trained
+    before manifests existed), when it was modified after the model file.
+    """
+    new, seen = [], []
+    if manifest is not None:
+        known = manifest.get("files", {})
+        for path, key in file_keys(paths).items():
+            (seen if known.get(path) == key else new).append(path)
+    else:
+        model_mtime = os.path.getmtime(model_path)
+        for path in paths:
+            (new if os.path.getmtime(path) > model_mtime else seen).append(path)
+    return new, seen
+
+
+def training_rows(sources, new_files, replay=0.1, seed=42):
+    """Boolean mask of rows from new files plus a `replay` fraction of the others"""
+    is_new = np.isin(np.asarray(sources), list(new_files))
+    sampled = np.random.default_rng(seed).random(len(is_new)) < replay
+    return is_new | sampled
+
+
+def continue_training(model_path, X, y, rounds, **params):
+    """XGBClassifier that adds `rounds` trees to the booster saved at model_path"""
+    import xgboost as xgb
+    base = xgb.Booster()
+    base.load_model(model_path)
+    model = xgb.XGBClassifier(n_estimators=rounds, **params)
+    model.fit(X, y, xgb_model=base)
+    return model
+
+
+def next_version(data_dir, model_name):
+    """Timestamp version name not yet used by an artifact in data_dir"""
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    version, n = stamp, 1
+    while os.path.exists(os.path.join(data_dir, f'{model_name}-{version}.json')):
+        n += 1
+        version = f'{stamp}-{n}'
+    return version
+
+
+def save_pair(model, scaler, model_path, scaler_path):
+    """
+    Write a model and its scaler, replacing any existing pair at those paths.
+    Both are written to temporary files first and renamed into place, the
+    scaler last, so the registry never reads a half-written file; it retries
+    a pair that changes while it is loading (see ModelRegistry._refresh).
+    """
+    import joblib
+    # Keep the .json extension, which tells XGBoost the format; the dot keeps it out of the registry's glob
+    model_tmp = os.path.join(os.path.dirname(model_path), f'.tmp-{os.path.basename(model_path)}')
+    model.save_model(model_tmp)
+    joblib.dump(scaler, f'{scaler_path}.tmp')
+    os.replace(model_tmp, model_path)
+    os.replace(f'{scaler_path}.tmp', scaler_path)
+    return model_path, scaler_path
+
+
+def save_versioned(model, scaler, data_dir, model_name, version):
+    """Write <model_name>-<version>.json and scaler-<version>.joblib with save_pair"""
+    return save_pair(model, scaler, os.path.join(data_dir, f'{model_name}-{version}.json'),
+                     os.path.join(data_dir, f'scaler-{version}.joblib'))
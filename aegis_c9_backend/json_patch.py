@@ -0,0 +1,110 @@
+import copy
+import json
+
+# Subset of RFC 6902 (JSON Patch) used by the delta telemetry stream:
+# 'add', 'remove' and 'replace' with RFC 6901 JSON Pointer paths.
+
+
+def _escape(token):
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+
+def _unescape(token):
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def _same(a, b):
+    # True == 1 in Python but not in JSON, so compare types as well
+    return type(a) is type(b) and a == b
+
+
+# Encoded size of {"op":"replace","path":"","value":} around the path and value
+_OP_OVERHEAD = 32
+
+
+def diff(old, new, path=''):
+    """
+    Operations that turn old into new. Objects are diffed key by key and
+    equal-length arrays element by element; anything else that changed is
+    replaced wholesale, as is any nested container whose patch would encode
+    larger than the container itself.
+    """
+    ops, _ = _diff(old, new, path)
+    return ops
+
+
+def _size(value):
+    """Encoded JSON length, without running the encoder for scalars"""
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, (dict, list)):
+        return len(json.dumps(value))
+    return len(repr(value))  # numbers; True/None are as long as true/null
+
+
+def _replace(path, new):
+    return [{'op': 'replace', 'path': path, 'value': new}], len(path) + _size(new) + _OP_OVERHEAD
+
+
+def _diff(old, new, path):
+    """(ops, approximate encoded size of ops)"""
+    if _same(old, new):
+        return [], 0
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops, size = [], 0
+        for key in old:
+            if key not in new:
+                child = f'{path}/{_escape(key)}'
+                ops.append({'op': 'remove', 'path': child})
+                size += len(child) + _OP_OVERHEAD
+        for key, value in new.items():
+            child = f'{path}/{_escape(key)}'
+            if key not in old:
+                ops.append({'op': 'add', 'path': child, 'value': value})
+                size += len(child) + _size(value) + _OP_OVERHEAD
+            else:
+                child_ops, child_size = _diff(old[key], value, child)
+                ops.extend(child_ops)
+                size += child_size
+    elif isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops, size = [], 0
+        for i, (a, b) in enumerate(zip(old, new)):
+            child_ops, child_size = _diff(a, b, f'{path}/{i}')
+            ops.extend(child_ops)
+            size += child_size
+    else:
+        return _replace(path, new)
+
+    # Many small edits inside one container: sending the container is cheaper
+    if path and len(ops) > 1:
+        replacement = _replace(path, new)
+        if replacement[1] < size:
+            return replacement
+    return ops, size
+
+
+def apply(doc, ops):
+    """Apply diff() output to a deep copy of doc and return it."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        if op['path'] == '':
+            doc = copy.deepcopy(op['value'])
+            continue
+        tokens = [_unescape(t) for t in op['path'].split('/')[1:]]
+        parent = doc
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            index = len(parent) if last == '-' else int(last)
+            if op['op'] == 'add':
+                parent.insert(index, op['value'])
+            elif op['op'] == 'remove':
+                del parent[index]
+            else:
+                parent[index] = op['value']
+        elif op['op'] == 'remove':
+            del parent[last]
+        else:
+            parent[last] = op['value']
+    return doc
@@ -1,70 +1,44 @@
 import asyncio
+import copy
 import json
 import random
 import time
 import os
-import joblib
-import pickle
-import numpy as np
-import xgboost as xgb
-from fastapi import FastAPI
+import threading
+from contextlib import asynccontextmanager
+from importlib.util import find_spec
+from fastapi import FastAPI, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from bridge import fetch_aegis_data
-from find_live_match import get_live_predictions
-
-# In-memory persistence for session anomalies
-class AnomalyTracker:
-    def __init__(self):
-        self.session_anomalies = []
-        self.start_time = None
-
-    def start_session(self):
-        self.session_anomalies = []
-        self.start_time = asyncio.get_event_loop().time()
-
-    def add_anomaly(self, anomaly):
-        self.session_anomalies.append(anomaly)
-
-    def get_summary(self):
-        # Generate 2-3 specific training drills based on anomaly patterns
-        micro_failures = [a for a in self.session_anomalies if a.get('type') == 'micro']
-        
-        drills = []
-        if len(micro_failures) > 3:
-            drills.append({
-                "title": "Crosshair Placement Efficiency",
-                "description": "Detected multiple micro-adjustments before kills. Focus on pre-aiming common angles in specialized aim maps."
-            })
-        else:
-            drills.append({
-                "title": "Movement Accuracy Drill",
-                "description": "Maintain counter-strafing discipline during high-pressure engagements."
-            })
-
-        drills.append({
-            "title": "Macro Rotation Timing",
-            "description": "Analysis shows 4.2s delay in rotations. Practice mini-map awareness triggers during mid-round transitions."
-        })
-
-        return {
-            "match_duration": "42:15",
-            "total_anomalies": len(self.session_anomalies),
-            "drill_plan": drills,
-            "status": "Ready for Export"
-        }
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from anomaly_store import AnomalyStore
+from anomaly_tracker import AnomalyTracker
+from bridge import (DEFAULT_SERIES_ID, close_grid_client, event_ingestor, fetch_aegis_data_async, get_grid_batcher,
+                    get_grid_client)
+from find_live_match import get_live_predictions, get_predictor
+from feature_importance import FeatureImportance
+from feature_spec import LOL_SPEC, VALORANT_SPEC
+from prediction_cache import PredictionCache
+from session_store import SessionStore
+from model_registry import ModelRegistry
+from telemetry_hub import MODE_FULL as STREAM_MODE_FULL, MODES as STREAM_MODES, TelemetryHub
+from tree_engine import resolve_engine
 
 # Macro-Impact Engine (MIE) Controller
 class MacroImpactEngine:
-    def __init__(self):
+    def __init__(self, load=True):
+        self.rf_model = None
+        self.xgb_model = None
+        self.lstm_model = None
+        if load:
+            self.load()
+
+    def load(self):
         self.rf_model = self._load_model('rf_model.pkl', 'pickle')
         self.xgb_model = self._load_model('xgb_model.pkl', 'joblib')
-        # LSTM might require tensorflow
-        try:
-            from importlib import import_module
-            import_module('tensorflow')
+        # LSTM might require tensorflow; check it is installed without paying for the import
+        if find_spec('tensorflow') is not None:
             self.lstm_model = self._load_model('lstm_model.h5', 'keras')
-        except (ImportError, ModuleNotFoundError):
+        else:
             print("Tensorflow not found, LSTM disabled.")
             self.lstm_model = None
 
@@ -74,8 +48,10 @@ class MacroImpactEngine:
             return None
         try:
             if type == 'pickle': 
+                import pickle
                 return pickle.load(open(filename, 'rb'))
             if type == 'joblib': 
+                import joblib
                 return joblib.load(filename)
             if type == 'keras': 
                 # Use string import to avoid static analysis issues if tensorflow is missing
@@ -121,54 +97,68 @@ class MacroImpactEngine:
             "recommendation": "Rotate to B early; Model predicts 78% utility depletion in A Main."
         }
 
+# Team stat defaults used when a key is missing from the live payload
+VALORANT_TEAM_DEFAULTS = {
+    'kills': 15, 'deaths': 12, 'assists': 5, 'hs_pct': 0.25,
+    'first_kills': 3, 'first_deaths': 2, 'adr': 150
+}
+
+LOL_TEAM_DEFAULTS = {
+    'kills': 8, 'deaths': 5, 'assists': 10,
+    'gold_earned': 12000, 'gold_spent': 11000,
+    'duration': 1800,  # 30 mins default in seconds
+    'damage_dealt': 150000, 'damage_to_champ': 25000, 'damage_taken': 20000,
+    'vision_score': 25, 'kill_participation': 0.5,
+    'team_baronKills': 1, 'team_dragonKills': 3, 'team_riftHeraldKills': 1,
+    'team_towerKills': 6, 'team_inhibitorKills': 1,
+    'final_attackDamage': 250, 'final_abilityPower': 0, 'final_armor': 150, 'final_health': 2500
+}
+
+# LoL team-stat feature kernel, shared by LoLPredictor and the tactical insights
+lol_team_kernel = LOL_SPEC.bind(defaults=LOL_TEAM_DEFAULTS)
+
 # VALORANT ML Prediction Engine
 class ValorantPredictor:
-    def __init__(self):
-        self.model = None
-        self.scaler = None
-        self.features = [
-            'Deaths', 'Headshot_Pct', 'First Kills', 'First Deaths',
-            'Survival_Rate', 'Headshot_Impact', 'First_Blood_Dominance',
-            'Damage_Per_Round', 'Consistency', 'First_Engagement', 'Clutch_Factor'
-        ]
-        self._load_model()
+    def __init__(self, engine=None, cache=None, load=True):
+        # Win probabilities keyed by engineered feature vector (None disables)
+        self.cache = cache
+        # Optional NumPy evaluator compiled from the booster (see tree_engine)
+        self.engine = resolve_engine(engine)
+        self.features = VALORANT_SPEC.feature_names
+        self.kernel = VALORANT_SPEC.bind(defaults=VALORANT_TEAM_DEFAULTS)
+        # Model/scaler versions in data/valorant, hot-swapped by the registry
+        self.registry = ModelRegistry(
+            'valorant', os.path.join(os.path.dirname(__file__), 'data', 'valorant'),
+            'valorant_model', self.engine, label='VALORANT', feature_names=self.features
+        )
+        self.registry.on_swap(self._on_model_swap)
+        if load:
+            self._load_model()
     
     def _load_model(self):
-        model_path = os.path.join(os.path.dirname(__file__), 'data', 'valorant', 'valorant_model.json')
-        scaler_path = os.path.join(os.path.dirname(__file__), 'data', 'valorant', 'scaler.joblib')
-        
         try:
-            if os.path.exists(model_path):
-                self.model = xgb.XGBClassifier()
-                self.model.load_model(model_path)
-                print(f"✓ VALORANT Model loaded from {model_path}")
-            else:
-                print(f"✗ VALORANT Model not found at {model_path}")
-                
-            if os.path.exists(scaler_path):
-                self.scaler = joblib.load(scaler_path)
-                print(f"✓ VALORANT Scaler loaded from {scaler_path}")
-            else:
-                print(f"✗ VALORANT Scaler not found at {scaler_path}")
+            self.registry.refresh()
         except Exception as e:
             print(f"Error loading VALORANT model: {e}")
     
+    def _on_model_swap(self, old_bundle, new_bundle):
+        # Cached probabilities belong to the previous model
+        if self.cache is not None:
+            self.cache.clear()
+    
     def predict(self, team_stats: dict, opponent_stats: dict):
         """Generate win probability prediction based on team stats"""
-        if not self.model or not self.scaler:
+        bundle = self.registry.ensure_loaded()
+        if bundle is None:
             # Fallback to simulated prediction
             return self._simulate_prediction(team_stats, opponent_stats)
         
         try:
             # Calculate aggregated team features
             team_features = self._extract_features(team_stats)
-            opp_features = self._extract_features(opponent_stats)
-            
-            # Scale features
-            team_scaled = self.scaler.transform([team_features])
             
-            # Get prediction probability
-            win_prob = self.model.predict_proba(team_scaled)[0][1] * 100
+            # Get prediction probability (cached per feature vector)
+            win_prob = self._win_probability(bundle, team_features)
             confidence = abs(win_prob - 50) * 2  # Confidence based on distance from 50%
             
             return {
@@ -185,30 +175,20 @@ class ValorantPredictor:
             print(f"Prediction error: {e}")
             return self._simulate_prediction(team_stats, opponent_stats)
     
+    def _win_probability(self, bundle, features):
+        """Win probability (0-100) for a one-row feature matrix, served from the cache when possible"""
+        if self.cache is None:
+            return self._score(bundle, features)
+        return self.cache.get_or_compute(features, lambda: self._score(bundle, features), namespace=bundle.generation)
+    
+    def _score(self, bundle, features):
+        # Scale features (already folded into the thresholds when possible)
+        X = features if bundle.scaler_folded else bundle.scaler.transform(features)
+        return float(bundle.predict_proba(X)[0]) * 100
+    
     def _extract_features(self, stats: dict):
-        """Extract model features from team stats"""
-        kills = stats.get('kills', 15)
-        deaths = stats.get('deaths', 12)
-        assists = stats.get('assists', 5)
-        hs_pct = stats.get('hs_pct', 0.25)
-        first_kills = stats.get('first_kills', 3)
-        first_deaths = stats.get('first_deaths', 2)
-        adr = stats.get('adr', 150)
-        
-        # Engineered features matching the training script
-        survival_rate = 1.0 / (deaths + 1)
-        headshot_impact = hs_pct * kills
-        first_blood_dominance = first_kills - first_deaths
-        damage_per_round = adr / 50.0
-        consistency = 1.0 / (deaths + 1)
-        first_engagement = (first_kills + first_deaths) / 26.0
-        clutch_factor = (kills - assists) / (kills + 1)
-        
-        return [
-            deaths, hs_pct, first_kills, first_deaths,
-            survival_rate, headshot_impact, first_blood_dominance,
-            damage_per_round, consistency, first_engagement, clutch_factor
-        ]
+        """Extract model features from team stats (one-row matrix, see feature_spec)"""
+        return self.kernel.transform(stats)
     
     def _simulate_prediction(self, team_stats: dict, opponent_stats: dict):
         """Fallback simulation when model not available"""
@@ -226,73 +206,71 @@ class ValorantPredictor:
 
 # LoL ML Prediction Engine
 class LoLPredictor:
-    def __init__(self):
-        self.model = None
-        self.scaler = None
-        # State persistence for demo stability
-        self.team_stats = None
-        self.opponent_stats = None
-        self.team_players = None
-        self.last_update = 0
+    def __init__(self, engine=None, cache=None, load=True, sessions=None):
+        self.cache = cache
+        self.engine = resolve_engine(engine)
+        # State persistence for demo stability, one session per match
+        self.sessions = sessions if sessions is not None else SessionStore()
         
         # Features matching the trained model from CSV data
-        self.features = [
-            'deaths', 'kills', 'assists', 
-            'KDA_Ratio', 'Kill_Death_Diff', 'Survival_Rate', 'Assist_Ratio',
-            'Gold_Efficiency', 'Gold_Spent_Ratio',
-            'Damage_Efficiency', 'Damage_Per_Gold', 'Damage_Taken_Ratio',
-            'Vision_Per_Min', 'Objective_Control', 'Final_Power_Score',
-            'kill_participation'
-        ]
-        self._load_model()
+        self.features = LOL_SPEC.feature_names
+        self.kernel = lol_team_kernel
+        self.registry = ModelRegistry(
+            'lol', os.path.join(os.path.dirname(__file__), 'data', 'lol'),
+            'lol_model', self.engine, label='LoL', feature_names=self.features
+        )
+        self.registry.on_swap(self._on_model_swap)
+        if load:
+            self._load_model()
     
     def _load_model(self):
-        model_path = os.path.join(os.path.dirname(__file__), 'data', 'lol', 'lol_model.json')
-        scaler_path = os.path.join(os.path.dirname(__file__), 'data', 'lol', 'scaler.joblib')
-        
         try:
-            if os.path.exists(model_path):
-                self.model = xgb.XGBClassifier()
-                self.model.load_model(model_path)
-                print(f"✓ LoL Model loaded from {model_path}")
-            else:
-                print(f"✗ LoL Model not found at {model_path}")
-                
-            if os.path.exists(scaler_path):
-                self.scaler = joblib.load(scaler_path)
-                print(f"✓ LoL Scaler loaded from {scaler_path}")
-            else:
-                print(f"✗ LoL Scaler not found at {scaler_path}")
+            self.registry.refresh()
         except Exception as e:
             print(f"Error loading LoL model: {e}")
     
-    def get_stable_stats(self, team: str, opponent: str):
-        """Get stats that slowly evolve rather than jump randomly"""
-        import time
-        current_time = time.time()
-        
-        # Reset if too old or different match
-        if (current_time - self.last_update > 300 or 
-            not self.team_stats or 
-            not hasattr(self, 'current_team') or 
-            team != self.current_team or 
-            opponent != self.current_opponent): 
-           
-           self.team_stats = self._generate_base_stats(team)
-           self.opponent_stats = self._generate_base_stats(opponent)
-           self.team_players = self._generate_players(team)
-           self.last_update = current_time
-           self.current_team = team
-           self.current_opponent = opponent
-        
-        # Evolve stats slightly (Drift)
-        if current_time - self.last_update > 3: # Update every 3 seconds
-            self._evolve_stats(self.team_stats)
-            self._evolve_stats(self.opponent_stats)
-            self._evolve_players(self.team_players)
-            self.last_update = current_time
+    def _on_model_swap(self, old_bundle, new_bundle):
+        if self.cache is not None:
+            self.cache.clear()
+    
+    def get_stable_stats(self, team: str, opponent: str, session_id: str = None):
+        """
+        Get stats that slowly evolve rather than jump randomly.
+        State lives in a session keyed by session_id (e.g. a series id) or the
+        matchup, so dashboards watching different matches don't reset each other.
+        """
+        session = self.sessions.get(session_id or f"{team}|{opponent}")
+        with session.lock:
+            current_time = time.time()
+            changed = False
             
-        return self.team_stats, self.opponent_stats, self.team_players
+            # Reset if too old or different match
+            if (current_time - session.last_update > 300 or 
+                not session.team_stats or 
+                team != session.team or 
+                opponent != session.opponent): 
+               
+               session.team_stats = self._generate_base_stats(team)
+               session.opponent_stats = self._generate_base_stats(opponent)
+               session.team_players = self._generate_players(team)
+               session.last_update = current_time
+               session.team = team
+               session.opponent = opponent
+               changed = True
+            
+            # Evolve stats slightly (Drift)
+            if current_time - session.last_update > 3: # Update every 3 seconds
+                self._evolve_stats(session.team_stats)
+                self._evolve_stats(session.opponent_stats)
+                self._evolve_players(session.team_players)
+                session.last_update = current_time
+                changed = True
+            
+            # Snapshot while holding the lock; the caller may read it after another request evolved the session
+            result = copy.deepcopy((session.team_stats, session.opponent_stats, session.team_players))
+        if changed:
+            self.sessions.update_size(session)
+        return result
 
     def _generate_players(self, team_name):
         import random
@@ -399,23 +377,28 @@ class LoLPredictor:
         if random.random() > 0.98: stats["team_baronKills"] += 1
         if random.random() > 0.92: stats["team_towerKills"] += 1
 
-    def predict(self, team_stats: dict, opponent_stats: dict):
-        """Generate win probability prediction based on team stats"""
-        if not self.model or not self.scaler:
+    def predict(self, team_stats: dict, opponent_stats: dict, explain: bool = False):
+        """
+        Generate win probability prediction based on team stats.
+        With explain, the same booster pass also yields per-feature Tree SHAP
+        contributions, returned weakest first as feature_contributions.
+        """
+        bundle = self.registry.ensure_loaded()
+        if bundle is None:
             return self._simulate_prediction(team_stats, opponent_stats)
         
         try:
             # Calculate aggregated team features
             features = self._extract_features(team_stats)
             
-            # Scale features
-            scaled = self.scaler.transform([features])
-            
-            # Get prediction probability
-            win_prob = self.model.predict_proba(scaled)[0][1] * 100
+            # Get prediction probability (cached per feature vector)
+            if explain:
+                win_prob, contributions = self._explain(bundle, features)
+            else:
+                win_prob, contributions = self._win_probability(bundle, features), None
             confidence = abs(win_prob - 50) * 2
             
-            return {
+            result = {
                 "win_probability": round(win_prob, 1),
                 "confidence": round(min(confidence + 55, 98), 1),
                 "prediction": "Win" if win_prob >= 50 else "Loss",
@@ -425,66 +408,54 @@ class LoLPredictor:
                 "total_samples": 124500,
                 "model_name": "XGBoost-LoL-Elite-v1"
             }
+            if contributions is not None:
+                result["feature_contributions"] = contributions
+            return result
         except Exception as e:
             print(f"LoL Prediction error: {e}")
             return self._simulate_prediction(team_stats, opponent_stats)
     
-    def _extract_features(self, stats: dict):
-        """Extract model features from team stats - matching CSV columns"""
-        kills = stats.get('kills', 8)
-        deaths = stats.get('deaths', 5)
-        assists = stats.get('assists', 10)
-        gold_earned = stats.get('gold_earned', 12000)
-        gold_spent = stats.get('gold_spent', 11000)
-        duration = stats.get('duration', 1800)  # 30 mins default in seconds
-        damage_dealt = stats.get('damage_dealt', 150000)
-        damage_to_champ = stats.get('damage_to_champ', 25000)
-        damage_taken = stats.get('damage_taken', 20000)
-        vision_score = stats.get('vision_score', 25)
-        kill_participation = stats.get('kill_participation', 0.5)
-        baron_kills = stats.get('team_baronKills', 1)
-        dragon_kills = stats.get('team_dragonKills', 3)
-        rift_herald_kills = stats.get('team_riftHeraldKills', 1)
-        tower_kills = stats.get('team_towerKills', 6)
-        inhibitor_kills = stats.get('team_inhibitorKills', 1)
-        final_attack_damage = stats.get('final_attackDamage', 250)
-        final_ability_power = stats.get('final_abilityPower', 0)
-        final_armor = stats.get('final_armor', 150)
-        final_health = stats.get('final_health', 2500)
-        
-        # Engineered features matching training script
-        kda_ratio = (kills + assists) / (deaths + 1)
-        kill_death_diff = kills - deaths
-        survival_rate = 1.0 / (deaths + 1)
-        assist_ratio = assists / (kills + 1)
-        gold_efficiency = gold_earned / (duration / 60.0 + 1)
-        gold_spent_ratio = gold_spent / (gold_earned + 1)
-        damage_efficiency = damage_to_champ / (damage_dealt + 1)
-        damage_per_gold = damage_to_champ / (gold_earned + 1)
-        damage_taken_ratio = damage_taken / (damage_dealt + 1)
-        vision_per_min = vision_score / (duration / 60.0 + 1)
-        objective_control = (
-            baron_kills * 3 + 
-            dragon_kills * 2 + 
-            rift_herald_kills * 1.5 + 
-            tower_kills + 
-            inhibitor_kills * 2
-        ) / 20.0
-        final_power_score = (
-            final_attack_damage + 
-            final_ability_power + 
-            final_armor + 
-            final_health / 10
-        ) / 100.0
-        
-        return [
-            deaths, kills, assists,
-            kda_ratio, kill_death_diff, survival_rate, assist_ratio,
-            gold_efficiency, gold_spent_ratio,
-            damage_efficiency, damage_per_gold, damage_taken_ratio,
-            vision_per_min, objective_control, final_power_score,
-            kill_participation
+    def _win_probability(self, bundle, features):
+        """Win probability (0-100) for a one-row feature matrix, served from the cache when possible"""
+        if self.cache is None:
+            return self._score(bundle, features)
+        return self.cache.get_or_compute(features, lambda: self._score(bundle, features), namespace=bundle.generation)
+    
+    def _score(self, bundle, features):
+        # Scale features (already folded into the thresholds when possible)
+        X = features if bundle.scaler_folded else bundle.scaler.transform(features)
+        return float(bundle.predict_proba(X)[0]) * 100
+    
+    def _explain(self, bundle, features):
+        """Win probability (0-100) and feature contributions from one pred_contribs pass, cached like _win_probability"""
+        import numpy as np
+        if self.cache is None:
+            p, row = self._score_with_contributions(bundle, features)
+        else:
+            # Cache the raw contribution row, not the dicts built from it: it is compact and sized exactly
+            p, row = self.cache.get_or_compute(
+                features, lambda: self._score_with_contributions(bundle, features),
+                namespace=f"{bundle.generation}:contribs",
+            )
+        margin = float(row.sum())
+        # Win-probability points each feature adds, relative to the same state without its contribution
+        impacts = (p - 1.0 / (1.0 + np.exp(-(margin - row[:-1])))) * 100
+        contributions = [
+            {"feature": name, "value": float(value), "contribution": round(float(c), 4), "impact": round(float(impact), 2)}
+            for name, value, c, impact in zip(self.features, features[0], row[:-1], impacts)
         ]
+        contributions.sort(key=lambda c: c["impact"])
+        return p * 100, contributions
+
+    def _score_with_contributions(self, bundle, features):
+        """Win probability (0-1) and the pred_contribs row (bias last) for a one-row feature matrix"""
+        X = features if bundle.scaler_folded else bundle.scaler.transform(features)
+        proba, contribs = bundle.predict_with_contributions(X)
+        return float(proba[0]), contribs[0].copy()
+    
+    def _extract_features(self, stats: dict):
+        """Extract model features from team stats - matching CSV columns (one-row matrix)"""
+        return self.kernel.transform(stats)
     
     def _simulate_prediction(self, team_stats: dict, opponent_stats: dict):
         """Fallback simulation when model not available"""
@@ -500,11 +471,59 @@ class LoLPredictor:
             "model_name": "XGBoost-LoL-Elite (Simulated)"
         }
 
-app = FastAPI()
-mie = MacroImpactEngine()
-tracker = AnomalyTracker()
-valorant_predictor = ValorantPredictor()
-lol_predictor = LoLPredictor()
+# Startup modes (AEGIS_STARTUP_MODE): 'eager' loads every model while the module
+# is imported; 'lazy' defers heavy imports and model loads to a background warmup
+# (or to first use), so the server binds quickly and /ready reports when it's warm
+STARTUP_EAGER = 'eager'
+STARTUP_LAZY = 'lazy'
+STARTUP_MODE = os.getenv('AEGIS_STARTUP_MODE', STARTUP_EAGER).strip().lower()
+if STARTUP_MODE not in (STARTUP_EAGER, STARTUP_LAZY):
+    raise ValueError(f"Unknown AEGIS_STARTUP_MODE '{STARTUP_MODE}', expected one of: {STARTUP_EAGER}, {STARTUP_LAZY}")
+
+warmup_done = threading.Event()
+warmup_state = {"seconds": None, "error": None}
+
+def warm_up():
+    """Load every model and the live player predictor; /ready turns green when done"""
+    start = time.perf_counter()
+    try:
+        if STARTUP_MODE == STARTUP_LAZY:
+            mie.load()
+        for predictor in (valorant_predictor, lol_predictor):
+            predictor.registry.ensure_loaded()
+        get_predictor()
+    except Exception as e:
+        warmup_state["error"] = str(e)
+        print(f"Warmup error: {e}")
+    warmup_state["seconds"] = round(time.perf_counter() - start, 3)
+    warmup_done.set()
+    print(f"✓ Warmup finished in {warmup_state['seconds']}s ({STARTUP_MODE} startup)")
+
+@asynccontextmanager
+async def lifespan(app):
+    if STARTUP_MODE == STARTUP_LAZY:
+        threading.Thread(target=warm_up, name='aegis-warmup', daemon=True).start()
+    else:
+        warm_up()
+    # Watch data/<game>/ for retrained artifacts while the server runs
+    poll_interval = float(os.getenv('AEGIS_MODEL_POLL_SECONDS', '5'))
+    for predictor in (valorant_predictor, lol_predictor):
+        predictor.registry.start(poll_interval)
+    yield
+    for predictor in (valorant_predictor, lol_predictor):
+        predictor.registry.stop()
+    await telemetry_hub.close()
+    await close_grid_client()
+    if anomaly_store is not None:
+        await asyncio.to_thread(anomaly_store.close)
+
+app = FastAPI(lifespan=lifespan)
+load_eagerly = STARTUP_MODE == STARTUP_EAGER
+mie = MacroImpactEngine(load=load_eagerly)
+tracker = AnomalyTracker.from_env()
+anomaly_store = AnomalyStore.from_env()
+valorant_predictor = ValorantPredictor(cache=PredictionCache.from_env(), load=load_eagerly)
+lol_predictor = LoLPredictor(cache=PredictionCache.from_env(), load=load_eagerly, sessions=SessionStore.from_env())
 
 # Enable CORS so your Vercel frontend can talk to this backend server
 origins = [
@@ -532,55 +551,224 @@ async def root():
     }
 
 @app.get("/api/stats")
-async def get_stats(series_id: str = "2616372"):
-    data = fetch_aegis_data(series_id)
+async def get_stats(series_id: str = DEFAULT_SERIES_ID):
+    data = await fetch_aegis_data_async(series_id)
     if "players" in data:
+        # The live player predictor is built off the event loop on first use
+        await asyncio.to_thread(get_predictor)
         data["predictions"] = get_live_predictions(data)
     # Include MIE for static dashboard snapshots
     data["mie_analysis"] = mie.generate_insights(data)
     return data
 
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 503 until warmup has loaded the models"""
+    body = {
+        "ready": warmup_done.is_set(),
+        "startup_mode": STARTUP_MODE,
+        "warmup_seconds": warmup_state["seconds"],
+        "warmup_error": warmup_state["error"],
+    }
+    return JSONResponse(body, status_code=200 if body["ready"] else 503)
+
+# Shown until a model is loaded; replaced by the booster's gain/cover/weight afterwards
+STATIC_FEATURE_IMPORTANCE = {
+    "lol": FeatureImportance.static("lol", [
+        {"name": "Objective Control", "importance": 22},
+        {"name": "Gold Efficiency", "importance": 18},
+        {"name": "KDA Ratio", "importance": 15},
+        {"name": "Damage Efficiency", "importance": 14},
+        {"name": "Vision Control", "importance": 12},
+        {"name": "Kill Participation", "importance": 10},
+        {"name": "Survival Rate", "importance": 9},
+    ]),
+    "valorant": FeatureImportance.static("valorant", [
+        {"name": "First Blood Rate", "importance": 18},
+        {"name": "Headshot Percentage", "importance": 15},
+        {"name": "Survival Rate", "importance": 14},
+        {"name": "Damage Per Round", "importance": 12},
+        {"name": "Trade Efficiency", "importance": 10}
+    ]),
+}
+
+def feature_importance_for(game):
+    """Importance payload of the game's active model, or the static one while none is loaded"""
+    predictor = {"lol": lol_predictor, "valorant": valorant_predictor}[game]
+    bundle = predictor.registry.current()
+    return bundle.importance if bundle is not None else STATIC_FEATURE_IMPORTANCE[game]
+
+@app.get("/api/feature-importance/{game}")
+async def feature_importance(game: str, if_none_match: str = Header(None)):
+    """
+    Model feature importance (gain/cover/weight). Pre-serialized at model load;
+    revalidate with If-None-Match to get a 304 until the model is hot-swapped.
+    """
+    if game not in STATIC_FEATURE_IMPORTANCE:
+        return JSONResponse({"error": f"Unknown game '{game}'"}, status_code=404)
+    importance = feature_importance_for(game)
+    headers = {"ETag": importance.etag, "Cache-Control": "no-cache"}
+    if if_none_match is not None and importance.etag in [tag.strip() for tag in if_none_match.split(',')]:
+        return Response(status_code=304, headers=headers)
+    return Response(importance.body, media_type="application/json", headers=headers)
+
+@app.get("/admin/models")
+async def loaded_models():
+    """Loaded model versions, load times and approximate memory per game"""
+    return {
+        "valorant": valorant_predictor.registry.info(),
+        "lol": lol_predictor.registry.info(),
+    }
+
+@app.get("/admin/grid")
+async def grid_client_stats():
+    """Request, failure and timeout counters of the shared GRID client"""
+    batcher = get_grid_batcher()
+    return {**get_grid_client().stats(), "batching": batcher.stats() if batcher else None}
+
+@app.get("/admin/prediction-cache")
+async def prediction_cache_stats():
+    """Hit/miss/eviction counters of the win-probability caches"""
+    return {
+        "valorant": valorant_predictor.cache.stats() if valorant_predictor.cache else None,
+        "lol": lol_predictor.cache.stats() if lol_predictor.cache else None,
+    }
+
+@app.get("/admin/sessions")
+async def session_stats():
+    """Live/evicted counters and approximate memory of the per-match LoL sessions"""
+    return lol_predictor.sessions.stats()
+
 @app.post("/api/start-session")
-async def start_session():
+async def start_session(series_id: str = DEFAULT_SERIES_ID):
+    """
+    Start a coaching session: resets the in-memory tracker and, when the anomaly
+    store is enabled, returns a session_id over the series' persisted anomalies
+    to pass to /api/end-session.
+    """
     tracker.start_session()
-    return {"status": "Session Started", "timestamp": tracker.start_time}
+    result = {"status": "Session Started", "series_id": series_id, "timestamp": tracker.start_time}
+    if anomaly_store is not None:
+        result["session_id"] = await asyncio.to_thread(anomaly_store.start_session, series_id)
+    return result
 
 @app.get("/api/end-session")
-async def end_session():
-    summary = tracker.get_summary()
+async def end_session(session_id: str = None):
+    """Summary of one session from the anomaly store (or of the in-memory tracker when no session_id is given)"""
+    if session_id is None or anomaly_store is None:
+        return tracker.get_summary()
+    summary = await asyncio.to_thread(anomaly_store.end_session, session_id)
+    if summary is None:
+        return JSONResponse({"error": f"Unknown session '{session_id}'"}, status_code=404)
     return summary
 
+@app.get("/admin/anomaly-store")
+async def anomaly_store_stats():
+    """Queue depth and written/dropped counters of the anomaly write-behind queue"""
+    return anomaly_store.stats() if anomaly_store else None
+
+def enrich_telemetry(data, series_id=None):
+    """
+    Add predictions, MIE insights and win probability to a GRID snapshot.
+    Async callers build the live predictor off the event loop first (see build_telemetry_frame).
+    """
+    if "players" in data:
+        data["predictions"] = get_live_predictions(data)
+    
+    # Enrich with Macro-Impact Engine (MIE) insights
+    mie_data = mie.generate_insights(data)
+    data["mie_analysis"] = mie_data
+    
+    # Track any anomalies for the post-match generator
+    # If assist prob is low or tempo is high, log it
+    for pred in data.get("predictions", []):
+        if pred.get("high_assist_probability", 1.0) < 0.3:
+            anomaly = {
+                "type": "micro",
+                "player": pred.get("name"),
+                "message": "Low utility impact detected",
+                "timestamp": time.time()
+            }
+            tracker.add_anomaly(anomaly)
+            if anomaly_store is not None and series_id is not None:
+                anomaly_store.add(series_id, anomaly, anomaly["timestamp"])
+
+    # Add a win probability for the frontend example
+    data["win_prob"] = round(random.uniform(45, 65), 1)
+    return data
+
+async def build_telemetry_frame(series_id):
+    """One enriched telemetry document, shared by every subscriber of the series"""
+    # Fetch latest data; the live player predictor is built off the event loop on first use
+    data = await fetch_aegis_data_async(series_id)
+    await asyncio.to_thread(get_predictor)
+    return enrich_telemetry(data, series_id)
+
+# One upstream poller per series, fanned out to every /stream-telemetry client
+telemetry_hub = TelemetryHub(
+    build_telemetry_frame,
+    interval=1.0,  # Stream every second
+    keyframe_interval=int(os.getenv('AEGIS_STREAM_KEYFRAME_INTERVAL', '10')),
+)
+
 @app.get("/stream-telemetry")
-async def stream_telemetry(series_id: str = "2616372"):
-    async def event_generator():
-        while True:
-            # Fetch latest data
-            data = fetch_aegis_data(series_id)
-            if "players" in data:
-                data["predictions"] = get_live_predictions(data)
-            
-            # Enrich with Macro-Impact Engine (MIE) insights
-            mie_data = mie.generate_insights(data)
-            data["mie_analysis"] = mie_data
-            
-            # Track any anomalies for the post-match generator
-            # If assist prob is low or tempo is high, log it
-            for pred in data.get("predictions", []):
-                if pred.get("high_assist_probability", 1.0) < 0.3:
-                    tracker.add_anomaly({
-                        "type": "micro",
-                        "player": pred.get("name"),
-                        "message": "Low utility impact detected",
-                        "timestamp": asyncio.get_event_loop().time()
-                    })
-
-            # Add a win probability for the frontend example
-            data["win_prob"] = round(random.uniform(45, 65), 1)
-            
-            yield json.dumps(data) + "\n"
-            await asyncio.sleep(1) # Stream every second
+async def stream_telemetry(series_id: str = DEFAULT_SERIES_ID, mode: str = STREAM_MODE_FULL):
+    """
+    NDJSON telemetry. mode=full (default) sends the whole document every tick;
+    mode=delta sends {"type": "keyframe", "seq", "data"} every N ticks and
+    {"type": "delta", "seq", "ops"} JSON-Patch operations in between.
+    """
+    if mode not in STREAM_MODES:
+        return JSONResponse({"error": f"Unknown stream mode '{mode}'", "modes": list(STREAM_MODES)}, status_code=400)
+    return StreamingResponse(telemetry_hub.subscribe(series_id, mode), media_type="application/x-ndjson")
+
+@app.get("/api/events")
+async def get_events(series_id: str = DEFAULT_SERIES_ID, since: int = 0, limit: int = 500):
+    """Ingested GRID events with seq > since; poll again with the returned last_seq"""
+    events = event_ingestor.since(series_id, since, limit)
+    log = event_ingestor.log(series_id, create=False)
+    return {
+        "series_id": series_id,
+        "events": events,
+        "last_seq": events[-1]["seq"] if events else max(since, log.last_seq if log else 0),
+        # Events before this were evicted from the bounded log
+        "oldest_seq": log.oldest_seq if log else None,
+    }
+
+@app.get("/admin/streams")
+async def stream_stats():
+    """Subscribers and frame counters per live series"""
+    return telemetry_hub.stats()
 
-    return StreamingResponse(event_generator(), media_type="application/x-ndjson")
+# Fallback when no LoL model is loaded: weights and pro-level thresholds per 0-100 feature score
+HEURISTIC_FEATURE_WEIGHTS = {
+    'objective_control': 0.22,
+    'gold_efficiency': 0.18,
+    'kda_ratio': 0.15,
+    'damage_efficiency': 0.14,
+    'vision_per_min': 0.12,
+    'kill_participation': 0.10,
+    'survival_rate': 0.09,
+}
+HEURISTIC_WEAK_SCORES = {
+    'objective_control': 60,
+    'gold_efficiency': 65,
+    'kda_ratio': 50,
+    'damage_efficiency': 55,
+    'vision_per_min': 50,
+    'survival_rate': 60,
+}
+
+def _heuristic_weak_features(feature_scores):
+    """
+    Three lowest weighted scores, kept if below their threshold, as (feature, estimated impact).
+    Impacts are negative (win probability the weakness costs), as on the Tree SHAP path.
+    """
+    weighted = sorted(feature_scores, key=lambda k: feature_scores[k] * HEURISTIC_FEATURE_WEIGHTS[k])
+    return [
+        (k, -round(abs(50 - feature_scores[k]) * HEURISTIC_FEATURE_WEIGHTS[k] * 0.2, 1))
+        for k in weighted[:3] if feature_scores[k] < HEURISTIC_WEAK_SCORES.get(k, 0)
+    ]
 
 # Global counter for unique anomaly IDs
 _anomaly_counter = 0
@@ -606,46 +794,27 @@ def generate_ml_tactical_insights(team_stats, opponent_stats, prediction, player
     _last_anomaly_time = current_time
     
     # === ML MODEL FEATURE ANALYSIS ===
-    # Extract the same features used by the model
-    kills = team_stats.get('kills', 8)
-    deaths = team_stats.get('deaths', 5)
-    assists = team_stats.get('assists', 10)
-    gold_earned = team_stats.get('gold_earned', 12000)
-    gold_spent = team_stats.get('gold_spent', 11000)
-    duration = team_stats.get('duration', 1800)
-    damage_to_champ = team_stats.get('damage_to_champ', 25000)
-    damage_dealt = team_stats.get('damage_dealt', 150000)
-    damage_taken = team_stats.get('damage_taken', 20000)
-    vision_score = team_stats.get('vision_score', 25)
-    kill_participation = team_stats.get('kill_participation', 0.5)
+    # The feature values the model scored, or the same shared spec when no model is loaded
+    contributions = prediction.get("feature_contributions")
+    if contributions:
+        features = {c["feature"]: c["value"] for c in contributions}
+    else:
+        features = dict(zip(LOL_SPEC.feature_names, lol_team_kernel.transform(team_stats)[0].tolist()))
+    kill_participation = features['kill_participation']
     baron_kills = team_stats.get('team_baronKills', 0)
     dragon_kills = team_stats.get('team_dragonKills', 0)
-    tower_kills = team_stats.get('team_towerKills', 0)
     
-    duration_mins = duration / 60
+    duration_mins = team_stats.get('duration', 1800) / 60
     win_prob = prediction.get("win_probability", 50)
     
-    # Calculate engineered features (same as model training)
-    kda_ratio = (kills + assists) / (deaths + 1)
-    gold_efficiency = gold_earned / (duration_mins + 1)
-    damage_efficiency = damage_to_champ / (damage_dealt + 1)
-    vision_per_min = vision_score / (duration_mins + 1)
-    objective_control = (baron_kills * 3 + dragon_kills * 2 + tower_kills) / 10.0
-    survival_rate = 1.0 / (deaths + 1)
-    damage_taken_ratio = damage_taken / (damage_dealt + 1)
-    
-    # === FEATURE IMPORTANCE WEIGHTS (from trained model) ===
-    feature_weights = {
-        'objective_control': 0.22,
-        'gold_efficiency': 0.18,
-        'kda_ratio': 0.15,
-        'damage_efficiency': 0.14,
-        'vision_per_min': 0.12,
-        'kill_participation': 0.10,
-        'survival_rate': 0.09,
-    }
+    kda_ratio = features['KDA_Ratio']
+    gold_efficiency = features['Gold_Efficiency']
+    damage_efficiency = features['Damage_Efficiency']
+    vision_per_min = features['Vision_Per_Min']
+    objective_control = features['Objective_Control']
+    survival_rate = features['Survival_Rate']
     
-    # === CALCULATE FEATURE SCORES (normalized 0-100) ===
+    # === CALCULATE FEATURE SCORES (normalized 0-100, for display) ===
     # These thresholds are based on pro-level benchmarks
     feature_scores = {
         'objective_control': min(100, objective_control * 100),
@@ -658,23 +827,23 @@ def generate_ml_tactical_insights(team_stats, opponent_stats, prediction, player
     }
     
     # === IDENTIFY WEAKEST FEATURES (ML-driven priority) ===
-    weighted_scores = {k: feature_scores[k] * feature_weights[k] for k in feature_scores}
-    sorted_features = sorted(weighted_scores.items(), key=lambda x: x[1])
+    if contributions:
+        # Tree SHAP from the loaded booster: features pulling win probability down the most
+        weakest = [(c["feature"].lower(), c["impact"]) for c in contributions if c["impact"] < 0][:3]
+    else:
+        weakest = _heuristic_weak_features(feature_scores)
     
     # === GENERATE TACTICAL SUGGESTIONS BASED ON ML ANALYSIS ===
     tactical_suggestions = []
     
-    # Analyze top 3 weakest features
-    for feature_name, weighted_score in sorted_features[:3]:
-        raw_score = feature_scores[feature_name]
-        weight = feature_weights[feature_name]
-        impact = round((50 - raw_score) * weight * 0.2, 1)  # Calculate win prob impact
+    for feature_name, impact in weakest:
+        raw_score = feature_scores.get(feature_name)
         
-        if feature_name == 'objective_control' and raw_score < 60:
+        if feature_name == 'objective_control':
             if dragon_kills < 2 and duration_mins > 15:
                 tactical_suggestions.append({
                     "type": "objective",
-                    "message": f"[ML Analysis] Objective Control score: {raw_score:.0f}/100 (weight: {weight*100:.0f}%). Dragon priority recommended - secure next spawn to boost win probability.",
+                    "message": f"[ML Analysis] Objective Control score: {raw_score:.0f}/100 ({impact:+.1f}% win prob). Dragon priority recommended - secure next spawn to boost win probability.",
                     "impact": impact,
                     "feature": "objective_control",
                     "score": raw_score
@@ -688,7 +857,7 @@ def generate_ml_tactical_insights(team_stats, opponent_stats, prediction, player
                     "score": raw_score
                 })
         
-        elif feature_name == 'gold_efficiency' and raw_score < 65:
+        elif feature_name == 'gold_efficiency':
             tactical_suggestions.append({
                 "type": "economy",
                 "message": f"[ML Analysis] Gold Efficiency: {raw_score:.0f}/100 ({gold_efficiency:.0f}g/min). Increase farm patterns - catch side waves, contest jungle camps.",
@@ -697,7 +866,7 @@ def generate_ml_tactical_insights(team_stats, opponent_stats, prediction, player
                 "score": raw_score
             })
         
-        elif feature_name == 'kda_ratio' and raw_score < 50:
+        elif feature_name == 'kda_ratio':
             # Find player with worst KDA
             worst_player = min(players, key=lambda p: (p.get('kills', 0) + p.get('assists', 0)) / (p.get('deaths', 1) + 1))
             tactical_suggestions.append({
@@ -709,7 +878,7 @@ def generate_ml_tactical_insights(team_stats, opponent_stats, prediction, player
                 "playerTarget": worst_player.get('name')
             })
         
-        elif feature_name == 'damage_efficiency' and raw_score < 55:
+        elif feature_name == 'damage_efficiency':
             # Find player dealing most damage
             top_damage = max(players, key=lambda p: p.get('dpm', 0) if p.get('dpm') else 0)
             tactical_suggestions.append({
@@ -720,7 +889,7 @@ def generate_ml_tactical_insights(team_stats, opponent_stats, prediction, player
                 "score": raw_score
             })
         
-        elif feature_name == 'vision_per_min' and raw_score < 50:
+        elif feature_name == 'vision_per_min':
             support = next((p for p in players if p.get('role', '').lower() in ['support', 'utility']), None)
             player_name = support.get('name', 'Support') if support else 'Support'
             tactical_suggestions.append({
@@ -732,7 +901,7 @@ def generate_ml_tactical_insights(team_stats, opponent_stats, prediction, player
                 "playerTarget": player_name
             })
         
-        elif feature_name == 'survival_rate' and raw_score < 60:
+        elif feature_name == 'survival_rate':
             tactical_suggestions.append({
                 "type": "macro",
                 "message": f"[ML Analysis] Survival Rate: {raw_score:.0f}/100. Team taking too much damage - play around vision and avoid face-checking.",
@@ -740,7 +909,19 @@ def generate_ml_tactical_insights(team_stats, opponent_stats, prediction, player
                 "feature": "survival_rate",
                 "score": raw_score
             })
+        
+        elif contributions:
+            # Any other model feature: report what the booster attributes to it
+            value = next(c["value"] for c in contributions if c["feature"].lower() == feature_name)
+            tactical_suggestions.append({
+                "type": "macro",
+                "message": f"[ML Analysis] {feature_name.replace('_', ' ').title()} ({value:.2f}) is costing {abs(impact):.1f}% win probability.",
+                "impact": impact,
+                "feature": feature_name,
+                "score": raw_score
+            })
     
+
     # === ADD WIN PROBABILITY TREND ANALYSIS ===
     if win_prob < 40:
         tactical_suggestions.append({
@@ -789,7 +970,7 @@ def generate_ml_tactical_insights(team_stats, opponent_stats, prediction, player
     return anomalies
 
 @app.get("/lol-predictions")
-async def get_lol_predictions(team: str = "Cloud9", opponent: str = "Opponent"):
+async def get_lol_predictions(team: str = "Cloud9", opponent: str = "Opponent", series_id: str = None):
     """Get League of Legends win probability predictions using trained XGBoost model"""
     
     # LoL Champions by Role
@@ -832,10 +1013,11 @@ async def get_lol_predictions(team: str = "Cloud9", opponent: str = "Opponent"):
     tier_s = ['T1', 'Gen.G', 'Bilibili Gaming', 'JD Gaming', 'Weibo Gaming']
     tier_a = ['Cloud9', 'G2 Esports', 'Fnatic', 'Team Liquid', 'DRX', '100 Thieves']
     # Get realistic LoL stats (now using stable history)
-    team_stats, opponent_stats, players = lol_predictor.get_stable_stats(team, opponent)
+    team_stats, opponent_stats, players = lol_predictor.get_stable_stats(team, opponent, series_id)
     
-    # Get prediction from trained model
-    prediction = lol_predictor.predict(team_stats, opponent_stats)
+    # Get prediction from trained model (a lazy first load happens off the event loop)
+    await lol_predictor.registry.ensure_loaded_async()
+    prediction = lol_predictor.predict(team_stats, opponent_stats, explain=True)
     
     # Generate MIE analysis for this specific game state
     mie_analysis = mie.generate_insights({"players": [{"stats": {"Kills": team_stats["kills"], "Deaths": team_stats["deaths"], "Assists": team_stats["assists"]}}]})
@@ -847,6 +1029,7 @@ async def get_lol_predictions(team: str = "Cloud9", opponent: str = "Opponent"):
     
     # Generate ML-powered tactical insights for Tactical Comms
     anomalies = generate_ml_tactical_insights(team_stats, opponent_stats, prediction, players)
+    importance = feature_importance_for("lol")
 
     return {
         "prediction": prediction,
@@ -872,15 +1055,8 @@ async def get_lol_predictions(team: str = "Cloud9", opponent: str = "Opponent"):
             "dragonSoul": random.choice([None, "Infernal", "Mountain", "Ocean", "Cloud", "Hextech", "Chemtech"]),
             "elderDragon": random.choice([True, False]),
         },
-        "feature_importance": [
-            {"name": "Objective Control", "importance": 22},
-            {"name": "Gold Efficiency", "importance": 18},
-            {"name": "KDA Ratio", "importance": 15},
-            {"name": "Damage Efficiency", "importance": 14},
-            {"name": "Vision Control", "importance": 12},
-            {"name": "Kill Participation", "importance": 10},
-            {"name": "Survival Rate", "importance": 9},
-        ],
+        # Reference to /api/feature-importance/lol; clients re-fetch it when the etag changes
+        "feature_importance": importance.ref,
         "team_stats": team_stats,
         "opponent_stats": opponent_stats,
         "timestamp": asyncio.get_event_loop().time()
@@ -914,7 +1090,8 @@ async def get_valorant_predictions(team: str = "Cloud9", opponent: str = "Oppone
     team_stats = get_team_stats(team)
     opponent_stats = get_team_stats(opponent)
     
-    # Get prediction from trained model
+    # Get prediction from trained model (a lazy first load happens off the event loop)
+    await valorant_predictor.registry.ensure_loaded_async()
     prediction = valorant_predictor.predict(team_stats, opponent_stats)
     
     # Generate player data
@@ -946,6 +1123,7 @@ async def get_valorant_predictions(team: str = "Cloud9", opponent: str = "Oppone
     # Game state
     team_score = random.randint(8, 13)
     enemy_score = random.randint(5, 12)
+    importance = feature_importance_for("valorant")
     
     return {
         "prediction": prediction,
@@ -960,13 +1138,8 @@ async def get_valorant_predictions(team: str = "Cloud9", opponent: str = "Oppone
             "clutches": sum(p["clutches"] for p in players),
             "aces": random.randint(0, 2)
         },
-        "feature_importance": [
-            {"name": "First Blood Rate", "importance": 18},
-            {"name": "Headshot Percentage", "importance": 15},
-            {"name": "Survival Rate", "importance": 14},
-            {"name": "Damage Per Round", "importance": 12},
-            {"name": "Trade Efficiency", "importance": 10}
-        ]
+        # Reference to /api/feature-importance/valorant; clients re-fetch it when the etag changes
+        "feature_importance": importance.ref,
     }
 
 if __name__ == "__main__":
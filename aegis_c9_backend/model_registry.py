@@ -0,0 +1,291 @@
+import asyncio
+import glob
+import itertools
+import os
+import re
+import threading
+import time
+import numpy as np
+from feature_importance import FeatureImportance
+from tree_engine import ENGINE_NUMPY, TreeEnsemble, load_folded_booster, scaler_affine
+
+BASE_VERSION = 'base'
+
+# Unique per load, so a reloaded artifact with the same version name is still distinguishable
+_generations = itertools.count(1)
+
+
+class ModelBundle:
+    """
+    One loaded model version: booster, scaler and optional NumPy ensemble.
+    Bundles are never mutated after loading, so a request that grabbed one
+    keeps a consistent view even if a newer version is swapped in meanwhile.
+    """
+
+    def __init__(self, game, version, model, scaler, ensemble, scaler_folded,
+                 model_path, scaler_path, load_seconds, feature_names=None):
+        self.game = game
+        self.version = version
+        self.model = model
+        self.scaler = scaler
+        self.ensemble = ensemble
+        self.scaler_folded = scaler_folded
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+        self.generation = next(_generations)
+        self.num_features = int(model.get_booster().num_features())
+        self.importance = FeatureImportance.from_booster(game, version, model.get_booster(), feature_names)
+        self.memory_bytes = self._estimate_memory()
+
+    def predict_proba(self, X):
+        """Positive-class probability for each feature row, via the compiled engine"""
+        if self.ensemble is not None:
+            return self.ensemble.predict_proba(X)
+        return self.model.predict_proba(X)[:, 1]
+
+    def predict_with_contributions(self, X):
+        """
+        Positive-class probability and per-feature Tree SHAP contributions
+        (log-odds, bias in the last column) from one booster pass. The
+        contributions sum to the margin, so the probability comes for free.
+        """
+        import xgboost as xgb
+        booster = self.model.get_booster()
+        # Models trained on a named DataFrame validate names, so label the raw matrix the same way
+        contribs = booster.predict(xgb.DMatrix(X, feature_names=booster.feature_names), pred_contribs=True)
+        return 1.0 / (1.0 + np.exp(-contribs.sum(axis=1))), contribs
+
+    def warm(self):
+        """Run one prediction so first real requests don't pay lazy initialisation"""
+        self.predict_proba(np.zeros((1, self.num_features)))
+
+    def _estimate_memory(self):
+        # Serialized booster size approximates its in-memory trees; add the
+        # flat NumPy arrays of the compiled ensemble when present
+        total = len(self.model.get_booster().save_raw(raw_format='ubj'))
+        if self.ensemble is not None:
+            total += sum(v.nbytes for v in vars(self.ensemble).values() if isinstance(v, np.ndarray))
+        return total
+
+    def info(self):
+        return {
+            "game": self.game,
+            "version": self.version,
+            "generation": self.generation,
+            "model_path": self.model_path,
+            "scaler_path": self.scaler_path,
+            "loaded_at": self.loaded_at,
+            "load_seconds": round(self.load_seconds, 4),
+            "approx_memory_bytes": self.memory_bytes,
+            "engine": "numpy" if self.ensemble is not None else "xgboost",
+            "scaler_folded": self.scaler_folded,
+            "feature_importance_etag": self.importance.etag,
+        }
+
+
+def load_bundle(game, version, model_path, scaler_path, engine, label=None, feature_names=None):
+    """Load, fold and warm one model/scaler pair into a ModelBundle."""
+    # Imported on first load, not at module import, to keep cold starts fast
+    import joblib
+    import xgboost as xgb
+
+    label = label or game
+    start = time.perf_counter()
+    model = xgb.XGBClassifier()
+    model.load_model(model_path)
+    print(f"✓ {label} Model loaded from {model_path}")
+    ensemble = TreeEnsemble.from_booster(model) if engine == ENGINE_NUMPY else None
+    if ensemble is not None:
+        print(f"✓ {label} Model compiled for NumPy engine ({ensemble.num_trees} trees)")
+
+    scaler = joblib.load(scaler_path)
+    print(f"✓ {label} Scaler loaded from {scaler_path}")
+
+    # Fold the scaler's affine map into the split thresholds so raw features can be scored directly
+    scaler_folded = False
+    affine = scaler_affine(scaler)
+    if affine is not None:
+        load_folded_booster(model, scaler)
+        if ensemble is not None:
+            ensemble = ensemble.fold_scaler(*affine)
+        scaler_folded = True
+        print(f"✓ {label} Scaler folded into model thresholds")
+
+    bundle = ModelBundle(game, version, model, scaler, ensemble, scaler_folded,
+                         model_path, scaler_path, time.perf_counter() - start, feature_names)
+    bundle.warm()
+    return bundle
+
+
+class ModelRegistry:
+    """
+    Watches data/<game>/ for model artifacts and keeps the newest one loaded.
+
+    Artifacts are either the unversioned pair (<model_name>.json, scaler.joblib)
+    or versioned pairs (<model_name>-<version>.json, scaler-<version>.joblib).
+    The newest complete pair by modification time wins. New versions are loaded
+    and warmed off the request path, then swapped in with a single reference
+    assignment, so in-flight requests finish on the bundle they started with.
+    """
+
+    def __init__(self, game, data_dir, model_name, engine, label=None, history=5, feature_names=None):
+        self.game = game
+        self.data_dir = data_dir
+        self.model_name = model_name
+        self.engine = engine
+        self.label = label or game
+        self.feature_names = feature_names
+        self.history = history
+        self._current = None
+        self._signature = None
+        self._retired = []
+        self._listeners = []
+        self._lock = threading.Lock()
+        # Serializes loads between the watcher, warmup and first-use callers
+        self._refresh_lock = threading.Lock()
+        self._attempted = False
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_error = None
+
+    def current(self):
+        """Active bundle, or None when no complete artifact pair exists"""
+        return self._current
+
+    def ensure_loaded(self):
+        """Active bundle, loading it on first use (or waiting for a load already in flight)"""
+        if not self._attempted:
+            self.refresh()
+        return self._current
+
+    async def ensure_loaded_async(self):
+        """ensure_loaded for async handlers: a first load runs in a worker thread, not on the event loop"""
+        if not self._attempted:
+            await asyncio.to_thread(self.refresh)
+        return self._current
+
+    def on_swap(self, callback):
+        """Register callback(old_bundle, new_bundle), called after every swap"""
+        self._listeners.append(callback)
+
+    def candidates(self):
+        """(version, model_path, scaler_path) for every complete artifact pair"""
+        pairs = []
+        model_path = os.path.join(self.data_dir, f'{self.model_name}.json')
+        scaler_path = os.path.join(self.data_dir, 'scaler.joblib')
+        if os.path.exists(model_path) and os.path.exists(scaler_path):
+            pairs.append((BASE_VERSION, model_path, scaler_path))
+
+        pattern = re.compile(re.escape(self.model_name) + r'-(.+)\.json$')
+        for path in glob.glob(os.path.join(self.data_dir, f'{self.model_name}-*.json')):
+            match = pattern.search(os.path.basename(path))
+            if not match:
+                continue
+            version = match.group(1)
+            versioned_scaler = os.path.join(self.data_dir, f'scaler-{version}.joblib')
+            if os.path.exists(versioned_scaler):
+                pairs.append((version, path, versioned_scaler))
+        return pairs
+
+    def newest(self):
+        """(version, model_path, scaler_path) of the pair refresh() would load, or None"""
+        return self._newest()[0]
+
+    def _newest(self):
+        newest, newest_sig = None, None
+        for version, model_path, scaler_path in self.candidates():
+            try:
+                m, s = os.stat(model_path), os.stat(scaler_path)
+            except OSError:
+                continue  # removed between listing and stat
+            sig = (model_path, m.st_mtime_ns, m.st_size, scaler_path, s.st_mtime_ns, s.st_size)
+            if newest_sig is None or max(sig[1], sig[4]) > max(newest_sig[1], newest_sig[4]):
+                newest, newest_sig = (version, model_path, scaler_path), sig
+        return newest, newest_sig
+
+    def refresh(self):
+        """Load the newest artifact pair if it changed. Returns True on swap."""
+        with self._refresh_lock:
+            try:
+                return self._refresh()
+            finally:
+                self._attempted = True
+
+    def _refresh(self):
+        newest, sig = self._newest()
+        if newest is None:
+            if self._current is None:
+                print(f"✗ {self.label} Model not found in {self.data_dir}")
+            return False
+        if sig == self._signature:
+            return False
+
+        version, model_path, scaler_path = newest
+        try:
+            bundle = load_bundle(self.game, version, model_path, scaler_path, self.engine, self.label,
+                                 self.feature_names)
+        except Exception as e:
+            if self._newest()[1] != sig:
+                return False  # replaced while loading; the next poll loads the finished pair
+            # Keep serving the previous version; don't retry this exact artifact
+            self.last_error = f"{os.path.basename(model_path)}: {e}"
+            self._signature = sig
+            print(f"Error loading {self.label} model: {e}")
+            return False
+        if self._newest()[1] != sig:
+            # One file of the pair was replaced while loading (a retrain renames the model, then
+            # the scaler): the bundle may mix versions, so wait for the next poll
+            return False
+
+        with self._lock:
+            old = self._current
+            self._current = bundle
+            self._signature = sig
+            self.last_error = None
+            if old is not None:
+                self._retired = ([old.info()] + self._retired)[:self.history]
+        for callback in self._listeners:
+            callback(old, bundle)
+        if old is not None:
+            print(f"✓ {self.label} Model hot-swapped: {old.version} -> {bundle.version}")
+        return True
+
+    def start(self, poll_interval=5.0):
+        """Poll data_dir on a daemon thread until stop()"""
+        if self._thread is not None or poll_interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, args=(poll_interval,), name=f'model-registry-{self.game}', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _watch(self, poll_interval):
+        while not self._stop.wait(poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Model registry error ({self.game}): {e}")
+
+    def info(self):
+        with self._lock:
+            current = self._current.info() if self._current else None
+            retired = list(self._retired)
+        return {
+            "game": self.game,
+            "data_dir": self.data_dir,
+            "watching": self._thread is not None,
+            "active": current,
+            "retired": retired,
+            "available_versions": [version for version, _, _ in self.candidates()],
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+# Rough per-entry bookkeeping cost (OrderedDict node, tuple, float) on top of the key
+_ENTRY_OVERHEAD = 160
+
+
+def _sizeof(value):
+    """Approximate bytes held by a cached value, following arrays and nested containers"""
+    if isinstance(value, np.ndarray):
+        # A view's getsizeof leaves out the buffer it keeps alive
+        return sys.getsizeof(value) + (value.nbytes if value.base is not None else 0)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_sizeof(item) for item in value)
+    return size
+
+
+class PredictionCache:
+    """
+    Bounded LRU + TTL cache of model outputs, keyed by a hash of the
+    engineered feature vector.
+
+    With quantum set, features are rounded to multiples of it before hashing,
+    so vectors that differ by less than the tolerance share one entry.
+    Capacity is bounded both by entry count and by an approximate byte
+    ceiling; the least recently used entries go first.
+    """
+
+    def __init__(self, max_entries=4096, ttl=60.0, quantum=None, max_bytes=None, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.quantum = quantum
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        Cache configured from AEGIS_PREDICTION_CACHE_SIZE (entries, 0 disables),
+        _TTL (seconds), _QUANTUM (feature tolerance) and _MAX_BYTES.
+        Returns None when disabled.
+        """
+        size = int(os.getenv('AEGIS_PREDICTION_CACHE_SIZE', '4096'))
+        if size <= 0:
+            return None
+        quantum = os.getenv('AEGIS_PREDICTION_CACHE_QUANTUM')
+        max_bytes = os.getenv('AEGIS_PREDICTION_CACHE_MAX_BYTES')
+        return cls(
+            max_entries=size,
+            ttl=float(os.getenv('AEGIS_PREDICTION_CACHE_TTL', '60')),
+            quantum=float(quantum) if quantum else None,
+            max_bytes=int(max_bytes) if max_bytes else None,
+        )
+
+    def key(self, features, namespace=None):
+        """Digest of the (optionally quantized) feature vector, e.g. namespaced by model version."""
+        X = np.ascontiguousarray(features, dtype=np.float64)
+        if self.quantum:
+            X = np.round(X / self.quantum).astype(np.int64)
+        digest = hashlib.blake2b(X.tobytes(), digest_size=16)
+        if namespace is not None:
+            digest.update(str(namespace).encode())
+        return digest.digest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires, _ = entry
+            if self.ttl is not None and self._clock() >= expires:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        size = len(key) + _sizeof(value) + _ENTRY_OVERHEAD
+        expires = self._clock() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires, size)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or
+                (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def get_or_compute(self, features, compute, namespace=None):
+        """Cached value for these features, calling compute() on a miss."""
+        key = self.key(features, namespace)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "quantum": self.quantum,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
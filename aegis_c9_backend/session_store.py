@@ -0,0 +1,149 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Rough per-session bookkeeping cost (OrderedDict node, session object, lock) on top of its state
+_SESSION_OVERHEAD = 512
+
+
+def approx_size(value):
+    """Approximate deep size in bytes of JSON-like state (dicts, lists, scalars)"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(approx_size(v) for v in value)
+    return size
+
+
+class MatchSession:
+    """
+    Simulated state of one match. Hold `lock` while reading or evolving it;
+    requests for other sessions never wait on it.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.lock = threading.Lock()
+        self.team = None
+        self.opponent = None
+        self.team_stats = None
+        self.opponent_stats = None
+        self.team_players = None
+        self.last_update = 0
+        self.bytes = _SESSION_OVERHEAD
+
+    def measure(self):
+        """Refresh the approximate footprint used for the store's byte ceiling"""
+        self.bytes = _SESSION_OVERHEAD + sum(
+            approx_size(state) for state in (self.team_stats, self.opponent_stats, self.team_players)
+        )
+        return self.bytes
+
+
+class SessionStore:
+    """
+    Per-match sessions keyed by series id or matchup.
+
+    Sessions idle for longer than idle_ttl are dropped, and the least recently
+    used go first once max_sessions or the approximate max_bytes ceiling is
+    exceeded. The store lock only guards the index; per-session work runs
+    under each session's own lock, so concurrent matches don't serialize.
+    """
+
+    def __init__(self, max_sessions=256, idle_ttl=300.0, max_bytes=None, clock=time.monotonic):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._sessions = OrderedDict()  # key -> (session, last_seen)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_env(cls, prefix='AEGIS_LOL_SESSION'):
+        """Store configured from <prefix>S (max sessions), <prefix>_IDLE (seconds) and <prefix>_MAX_BYTES"""
+        max_bytes = os.getenv(f'{prefix}_MAX_BYTES')
+        return cls(
+            max_sessions=int(os.getenv(f'{prefix}S', '256')),
+            idle_ttl=float(os.getenv(f'{prefix}_IDLE', '300')),
+            max_bytes=int(max_bytes) if max_bytes else None,
+        )
+
+    def get(self, key):
+        """Session for key, created on first use (or after it was evicted)"""
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            entry = self._sessions.get(key)
+            if entry is None:
+                session = MatchSession(key)
+                self.created += 1
+                self._bytes += session.bytes
+            else:
+                session = entry[0]
+                self._sessions.move_to_end(key)
+            self._sessions[key] = (session, now)
+            self._evict(keep=key)
+            return session
+
+    def update_size(self, session):
+        """Re-measure a session after its state changed and enforce the byte ceiling"""
+        old = session.bytes
+        new = session.measure()
+        with self._lock:
+            entry = self._sessions.get(session.key)
+            if entry is None or entry[0] is not session:
+                return
+            self._bytes += new - old
+            self._evict(keep=session.key)
+
+    def _expire(self, now):
+        if self.idle_ttl is None:
+            return
+        # Oldest first, so stop at the first session that is still fresh
+        while self._sessions:
+            key, (session, last_seen) = next(iter(self._sessions.items()))
+            if now - last_seen <= self.idle_ttl:
+                break
+            self._remove(key)
+            self.expirations += 1
+
+    def _evict(self, keep):
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self.max_sessions or
+            (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._sessions))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        session, _ = self._sessions.pop(key)
+        self._bytes -= session.bytes
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, key):
+        return key in self._sessions
+
+    def stats(self):
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "bytes": self._bytes,
+                "max_sessions": self.max_sessions,
+                "max_bytes": self.max_bytes,
+                "idle_ttl": self.idle_ttl,
+                "created": self.created,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,205 @@
+"""
+Out-of-core training for the training scripts.
+
+The match CSVs are read in fixed-size chunks and never concatenated. One
+pass gathers what the in-memory pipeline computes over the whole frame
+(per-column mean/std for outlier clipping, a uniform row sample to fit the
+RobustScaler); XGBoost then pulls clipped, scaled chunks through a DataIter
+into an ExtMemQuantileDMatrix, whose quantized pages live in an on-disk
+cache. Memory is bounded by the chunk size plus XGBoost's per-row gradient
+and prediction buffers (a few dozen bytes per row), not by the raw data.
+"""
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+
+class CsvChunks:
+    """Re-iterable DataFrame chunks of `chunk_rows` rows over a list of CSV files"""
+
+    def __init__(self, paths, dtype=None, columns=None, chunk_rows=100_000):
+        self.paths = list(paths)
+        self.dtype = dtype
+        self.columns = columns
+        self.chunk_rows = chunk_rows
+
+    def __iter__(self):
+        wanted = set(self.columns) if self.columns else None
+        for path in self.paths:
+            reader = pd.read_csv(
+                path,
+                dtype={c: t for c, t in (self.dtype or {}).items() if wanted is None or c in wanted},
+                usecols=(lambda c: c in wanted) if wanted else None,
+                chunksize=self.chunk_rows,
+                low_memory=False,
+            )
+            with reader:
+                yield from reader
+
+
+def streaming_median(chunks, column):
+    """Exact median of a discrete-valued column (counts, kills, ...) from per-value counts"""
+    counts = Counter()
+    for chunk in chunks:
+        counts.update(chunk[column].dropna().value_counts().to_dict())
+    values = sorted(counts)
+    n = sum(counts.values())
+    if n == 0:
+        return float('nan')
+    cumulative = np.cumsum([counts[v] for v in values])
+    lower = values[int(np.searchsorted(cumulative, (n - 1) // 2, side='right'))]
+    upper = values[int(np.searchsorted(cumulative, n // 2, side='right'))]
+    return (lower + upper) / 2.0
+
+
+class FeatureStats:
+    """
+    Streaming per-column mean/std (Chan et al. pairwise merge, ddof=1) and a
+    uniform sample of at most `sample_rows` rows, fed one chunk at a time.
+    """
+
+    def __init__(self, num_features, sample_rows=100_000, seed=42):
+        self.count = 0
+        self.mean = np.zeros(num_features)
+        self.m2 = np.zeros(num_features)
+        self.sample_rows = sample_rows
+        self.sample = np.empty((0, num_features))
+        self._sample_keys = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, X):
+        n = len(X)
+        if n == 0:
+            return
+        mean = X.mean(axis=0)
+        m2 = ((X - mean) ** 2).sum(axis=0)
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (n / total)
+        self.m2 = self.m2 + m2 + delta ** 2 * (self.count * n / total)
+        self.count = total
+        # Bottom-k of uniform keys over every row seen is a uniform sample without replacement
+        keys = np.concatenate([self._sample_keys, self._rng.random(n)])
+        rows = np.concatenate([self.sample, X])
+        if len(keys) > self.sample_rows:
+            keep = np.argpartition(keys, self.sample_rows)[:self.sample_rows]
+            keys, rows = keys[keep], rows[keep]
+        self._sample_keys, self.sample = keys, rows
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.zeros_like(self.m2)
+
+    def clip_bounds(self, z=3.0):
+        """(lower, upper) per column; infinite for constant columns, like clip_outliers"""
+        spread = np.where(self.std > 0, z * self.std, np.inf)
+        return self.mean - spread, self.mean + spread
+
+
+def _holdout_mask(n, chunk_index, holdout, seed):
+    # Seeded per chunk, so every pass over the data splits the same rows
+    return np.random.default_rng([seed, chunk_index]).random(n) < holdout
+
+
+def _batches(chunks, prepare, bounds, scaler, holdout, seed, want_holdout):
+    lower, upper = bounds
+    for i, chunk in enumerate(chunks):
+        X, y = prepare(chunk)
+        mask = _holdout_mask(len(X), i, holdout, seed)
+        if not want_holdout:
+            mask = ~mask
+        if mask.any():
+            yield scaler.transform(np.clip(X[mask], lower, upper)), y[mask]
+
+
+def _data_iter(batches_factory, cache_prefix, feature_names):
+    import xgboost as xgb
+
+    class ChunkIter(xgb.DataIter):
+        def __init__(self):
+            self._batches = None
+            super().__init__(cache_prefix=cache_prefix)
+
+        def next(self, input_data):
+            if self._batches is None:
+                self._batches = batches_factory()
+            batch = next(self._batches, None)
+            if batch is None:
+                return False
+            X, y = batch
+            input_data(data=X, label=y, feature_names=feature_names)
+            return True
+
+        def reset(self):
+            self._batches = None
+
+    return ChunkIter()
+
+
+def booster_params(params):
+    """XGBClassifier keyword arguments (as the training scripts use them) as xgb.train params"""
+    params = {k: v for k, v in params.items() if k not in ('use_label_encoder', 'n_estimators')}
+    if 'random_state' in params:
+        params['seed'] = params.pop('random_state')
+    return {**params, 'tree_method': 'hist'}
+
+
+def train_streaming(chunks, prepare, feature_names, params, num_boost_round=100, holdout=0.2,
+                    z=3.0, sample_rows=100_000, max_eval_rows=1_000_000, cache_dir=None, seed=42):
+    """
+    Train on `chunks` (a re-iterable of DataFrame chunks) without holding
+    them in memory. prepare(chunk) -> (X, y) turns one raw chunk into a
+    float64 feature matrix and 0/1 labels. params are XGBClassifier keyword
+    arguments, as in the in-memory path.
+
+    Returns (booster, scaler, report); report has rows, train/holdout
+    counts, the holdout labels/probabilities (at most max_eval_rows) and
+    per-phase seconds.
+    """
+    import xgboost as xgb
+    from sklearn.preprocessing import RobustScaler
+
+    report = {"seconds": {}}
+    start = time.perf_counter()
+    stats = FeatureStats(len(feature_names), sample_rows, seed)
+    for chunk in chunks:
+        stats.update(prepare(chunk)[0])
+    bounds = stats.clip_bounds(z)
+    # Median/IQR of a uniform sample stand in for the whole-data RobustScaler fit
+    scaler = RobustScaler().fit(np.clip(stats.sample, *bounds))
+    report["rows"] = stats.count
+    report["seconds"]["stats"] = time.perf_counter() - start
+
+    cache = tempfile.mkdtemp(prefix='xgb-extmem-', dir=cache_dir)
+    try:
+        start = time.perf_counter()
+        train_iter = _data_iter(lambda: _batches(chunks, prepare, bounds, scaler, holdout, seed, False),
+                                os.path.join(cache, 'train'), feature_names)
+        dtrain = xgb.ExtMemQuantileDMatrix(train_iter, max_bin=params.get('max_bin', 256))
+        report["train_rows"] = dtrain.num_row()
+        report["seconds"]["quantize"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        booster = xgb.train(booster_params(params), dtrain, num_boost_round=num_boost_round)
+        report["seconds"]["train"] = time.perf_counter() - start
+        del dtrain
+    finally:
+        shutil.rmtree(cache, ignore_errors=True)
+
+    start = time.perf_counter()
+    labels, probabilities, holdout_rows = [], [], 0
+    for X, y in _batches(chunks, prepare, bounds, scaler, holdout, seed, True):
+        holdout_rows += len(X)
+        room = max_eval_rows - sum(len(part) for part in labels)
+        if room > 0:
+            labels.append(y[:room])
+            probabilities.append(booster.predict(xgb.DMatrix(X[:room], feature_names=feature_names)))
+    report["holdout_rows"] = holdout_rows
+    report["y_holdout"] = np.concatenate(labels) if labels else np.empty(0)
+    report["p_holdout"] = np.concatenate(probabilities) if probabilities else np.empty(0)
+    report["seconds"]["evaluate"] = time.perf_counter() - start
+    return booster, scaler, report
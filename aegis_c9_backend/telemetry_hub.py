@@ -0,0 +1,169 @@
+import asyncio
+import json
+import json_patch
+
+# Stream encodings: 'full' sends the whole document every tick; 'delta' sends a
+# keyframe every keyframe_interval ticks and JSON-Patch deltas in between
+MODE_FULL = 'full'
+MODE_DELTA = 'delta'
+MODES = (MODE_FULL, MODE_DELTA)
+
+# Delta-mode messages are new to clients, so they can drop the whitespace
+_COMPACT = (',', ':')
+
+
+class TelemetryFrame:
+    """
+    One tick of a series. Each wire encoding is serialized at most once, on
+    first use, and the same bytes object is shared by every subscriber.
+    """
+
+    __slots__ = ('seq', 'doc', 'previous', 'keyframe', '_full', '_keyframe', '_delta')
+
+    def __init__(self, seq, doc, previous, keyframe):
+        self.seq = seq
+        self.doc = doc
+        self.previous = previous
+        self.keyframe = keyframe or previous is None
+        self._full = self._keyframe = self._delta = None
+
+    def full_bytes(self):
+        if self._full is None:
+            self._full = (json.dumps(self.doc) + "\n").encode()
+        return self._full
+
+    def keyframe_bytes(self):
+        if self._keyframe is None:
+            self._keyframe = (json.dumps({"type": "keyframe", "seq": self.seq, "data": self.doc}, separators=_COMPACT) + "\n").encode()
+        return self._keyframe
+
+    def delta_bytes(self):
+        if self._delta is None:
+            ops = json_patch.diff(self.previous, self.doc)
+            self._delta = (json.dumps({"type": "delta", "seq": self.seq, "ops": ops}, separators=_COMPACT) + "\n").encode()
+        return self._delta
+
+
+class _SeriesChannel:
+    """Producer task, subscriber queues and counters for one series_id"""
+
+    def __init__(self, series_id):
+        self.series_id = series_id
+        self.subscribers = set()
+        self.task = None
+        self.last_frame = None
+        self.seq = 0
+        self.frames = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def next_frame(self, doc, keyframe_interval):
+        self.seq += 1
+        previous = self.last_frame.doc if self.last_frame is not None else None
+        return TelemetryFrame(self.seq, doc, previous, (self.seq - 1) % keyframe_interval == 0)
+
+    def publish(self, frame, queue_size):
+        self.last_frame = frame
+        self.frames += 1
+        for queue in self.subscribers:
+            if queue.full():
+                # Slow client: drop its oldest frame so it always catches up to live
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(frame)
+
+
+class TelemetryHub:
+    """
+    Fan-out of live telemetry frames, one upstream producer per series.
+
+    produce_frame(series_id) is an async callable returning the frame
+    document (a JSON-serializable dict). It runs once per interval per series,
+    no matter how many clients are watching, and each encoding of a frame is
+    serialized once and shared by every subscriber. The producer starts with
+    the first subscriber and is cancelled when the last one disconnects.
+    """
+
+    def __init__(self, produce_frame, interval=1.0, queue_size=8, keyframe_interval=10):
+        self.produce_frame = produce_frame
+        self.interval = interval
+        self.queue_size = queue_size
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._channels = {}
+
+    async def subscribe(self, series_id, mode=MODE_FULL):
+        """Async iterator of encoded frames for series_id; leaving the loop unsubscribes"""
+        if mode not in MODES:
+            raise ValueError(f"Unknown stream mode '{mode}', expected one of: {', '.join(MODES)}")
+        queue = self._join(series_id)
+        last_seq = None
+        try:
+            while True:
+                frame = await queue.get()
+                if mode == MODE_FULL:
+                    yield frame.full_bytes()
+                elif frame.keyframe or last_seq is None or frame.seq != last_seq + 1:
+                    # First frame, scheduled keyframe, or a gap after dropped frames
+                    yield frame.keyframe_bytes()
+                else:
+                    yield frame.delta_bytes()
+                last_seq = frame.seq
+        finally:
+            self._leave(series_id, queue)
+
+    def _join(self, series_id):
+        channel = self._channels.get(series_id)
+        if channel is None:
+            channel = self._channels[series_id] = _SeriesChannel(series_id)
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        if channel.last_frame is not None:
+            # Late joiners get the current frame instead of waiting a full interval
+            queue.put_nowait(channel.last_frame)
+        channel.subscribers.add(queue)
+        if channel.task is None:
+            channel.task = asyncio.create_task(self._produce(channel), name=f'telemetry-{series_id}')
+        return queue
+
+    def _leave(self, series_id, queue):
+        channel = self._channels.get(series_id)
+        if channel is None:
+            return
+        channel.subscribers.discard(queue)
+        if not channel.subscribers:
+            channel.task.cancel()
+            del self._channels[series_id]
+
+    async def _produce(self, channel):
+        while True:
+            try:
+                doc = await self.produce_frame(channel.series_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                channel.errors += 1
+                print(f"Telemetry producer error ({channel.series_id}): {e}")
+            else:
+                channel.publish(channel.next_frame(doc, self.keyframe_interval), self.queue_size)
+            # Tick on shared interval boundaries so every series fetches at the
+            # same instant and the GRID batcher can merge them into one query
+            await asyncio.sleep(self.interval - asyncio.get_running_loop().time() % self.interval)
+
+    async def close(self):
+        """Cancel every producer (server shutdown)"""
+        tasks = [channel.task for channel in self._channels.values() if channel.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._channels.clear()
+
+    def stats(self):
+        return {
+            series_id: {
+                "subscribers": len(channel.subscribers),
+                "frames": channel.frames,
+                "seq": channel.seq,
+                "dropped": channel.dropped,
+                "errors": channel.errors,
+            }
+            for series_id, channel in self._channels.items()
+        }
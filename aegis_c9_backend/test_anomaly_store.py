@@ -0,0 +1,96 @@
+import unittest
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('AEGIS_STARTUP_MODE', 'lazy')
+
+from anomaly_store import AnomalyStore
+
+def micro(player):
+    return {"type": "micro", "player": player, "message": "Low utility impact detected"}
+
+class TestAnomalyStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'anomalies.db')
+        self.store = AnomalyStore(self.path, batch_size=50, flush_interval=0.05)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_writes_are_batched(self):
+        for i in range(200):
+            self.store.add('s1', micro(f"P{i % 5}"))
+        self.store.flush()
+        stats = self.store.stats()
+        self.assertEqual((stats['written'], stats['dropped']), (200, 0))
+        self.assertLess(stats['batches'], 200)
+        with sqlite3.connect(self.path) as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+
+    def test_sessions_do_not_interfere(self):
+        early = self.store.start_session('s1')
+        self.store.add('s1', micro('A'), time.time())
+        self.store.add('s2', micro('B'), time.time())
+        time.sleep(0.01)
+        late = self.store.start_session('s1')
+        for _ in range(4):
+            self.store.add('s1', micro('C'), time.time())
+
+        summary = self.store.end_session(late)
+        self.assertEqual(summary['anomalies_by_player'], {'C': 4})
+        self.assertEqual(summary['status'], 'Ready for Export')
+        self.assertEqual(summary['drill_plan'][0]['title'], "Crosshair Placement Efficiency")
+
+        # The earlier session still sees everything on its series since it started
+        summary = self.store.summary(early)
+        self.assertEqual(summary['anomalies_by_type'], {'micro': 5})
+        self.assertEqual(summary['status'], 'In Progress')
+        self.assertIsNone(self.store.end_session('missing'))
+
+    def test_survives_restart(self):
+        session_id = self.store.start_session('s1')
+        self.store.add('s1', micro('A'))
+        self.store.close()
+        self.store = AnomalyStore(self.path)
+        self.assertEqual(self.store.end_session(session_id)['total_anomalies'], 1)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        store = AnomalyStore(self.path, max_queue=1)
+        store._ensure_writer = lambda: None  # no writer draining the queue
+        store.add('s1', micro('A'))
+        store.add('s1', micro('A'))
+        self.assertEqual(store.stats()['dropped'], 1)
+
+class TestSessionEndpoints(unittest.IsolatedAsyncioTestCase):
+    async def test_start_session_without_store_resets_tracker(self):
+        import main
+        with mock.patch.object(main, 'anomaly_store', None):
+            main.tracker.add_anomaly({**micro('A'), "timestamp": time.time()})
+            started = await main.start_session()
+            self.assertEqual(started['series_id'], main.DEFAULT_SERIES_ID)
+            self.assertNotIn('session_id', started)
+            self.assertEqual((await main.end_session())['total_anomalies'], 0)
+
+    async def test_start_session_with_store(self):
+        import main
+        with tempfile.TemporaryDirectory() as tmp:
+            store = AnomalyStore(os.path.join(tmp, 'anomalies.db'))
+            try:
+                with mock.patch.object(main, 'anomaly_store', store):
+                    started = await main.start_session('s9')
+                    store.add('s9', micro('B'))
+                    store.flush()
+                    summary = await main.end_session(started['session_id'])
+            finally:
+                store.close()
+        self.assertEqual(summary['total_anomalies'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
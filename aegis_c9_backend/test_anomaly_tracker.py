@@ -0,0 +1,51 @@
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from anomaly_tracker import AnomalyTracker
+
+def micro(player, ts):
+    return {"type": "micro", "player": player, "message": "Low utility impact detected", "timestamp": ts}
+
+class TestAnomalyTracker(unittest.TestCase):
+    def test_ring_keeps_newest(self):
+        tracker = AnomalyTracker(capacity=4)
+        for i in range(10):
+            tracker.add_anomaly(micro(f"P{i % 3}", float(i)))
+        self.assertEqual(len(tracker), 4)
+        recent = tracker.recent()
+        self.assertEqual([a['timestamp'] for a in recent], [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual(recent[-1], micro("P0", 9.0))
+        self.assertEqual([a['timestamp'] for a in tracker.recent(2)], [8.0, 9.0])
+
+    def test_summary_counts_whole_session(self):
+        tracker = AnomalyTracker(capacity=4)
+        for i in range(10):
+            tracker.add_anomaly(micro(f"P{i % 2}", float(i)))
+        tracker.add_anomaly({"type": "macro", "message": "Late rotation"})
+        summary = tracker.get_summary()
+        self.assertEqual(summary['total_anomalies'], 11)
+        self.assertEqual(summary['anomalies_by_type'], {"micro": 10, "macro": 1})
+        self.assertEqual(summary['anomalies_by_player'], {"P0": 5, "P1": 5})
+        self.assertEqual(summary['drill_plan'][0]['title'], "Crosshair Placement Efficiency")
+        self.assertIsNone(tracker.recent(1)[0]['player'])
+
+    def test_memory_is_fixed(self):
+        tracker = AnomalyTracker(capacity=1000)
+        before = tracker.nbytes
+        for i in range(5000):
+            tracker.add_anomaly(micro(f"P{i % 10}", float(i)))
+        self.assertEqual(tracker.nbytes, before)
+        self.assertEqual(len(tracker._player_names), 11)
+
+    def test_start_session_resets(self):
+        tracker = AnomalyTracker(capacity=4)
+        tracker.add_anomaly(micro("P0", 1.0))
+        tracker.start_session()
+        self.assertEqual((len(tracker), tracker.get_summary()['total_anomalies']), (0, 0))
+        self.assertEqual(tracker.get_summary()['drill_plan'][0]['title'], "Movement Accuracy Drill")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker('test', failure_threshold=2, base_backoff=1.0, max_backoff=4.0,
+                                      jitter=0, clock=self.clock)
+
+    def fail(self, times=1):
+        for _ in range(times):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+
+    def test_opens_after_threshold(self):
+        self.fail()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.fail()
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.assertEqual(self.breaker.stats()['short_circuited'], 1)
+
+    def test_success_resets_failure_count(self):
+        self.fail()
+        self.breaker.before_call()
+        self.breaker.record_success()
+        self.fail()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open_allows_single_probe(self):
+        self.fail(2)
+        self.clock.now = 1.0
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.stats()['transitions'],
+                         {'closed->open': 1, 'open->half_open': 1, 'half_open->closed': 1})
+
+    def test_backoff_doubles_until_cap(self):
+        self.fail(2)
+        retries = []
+        for _ in range(4):
+            retries.append(self.breaker.retry_at - self.clock.now)
+            self.clock.now = self.breaker.retry_at
+            self.fail()  # failed probe re-opens
+        self.assertEqual(retries, [1.0, 2.0, 4.0, 4.0])
+
+    def test_release_frees_probe(self):
+        self.fail(2)
+        self.clock.now = 1.0
+        self.breaker.before_call()
+        self.breaker.release()
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from csv_cache import load_csvs
+
+DTYPES = {'kills': 'float64', 'deaths': 'float64', 'win': 'object'}
+
+class TestCsvCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = os.path.join(self.dir, 'cache')
+        self.paths = []
+        for part in range(3):
+            path = os.path.join(self.dir, f'part{part}.csv')
+            pd.DataFrame({'kills': [part, 5], 'deaths': [1, 2], 'win': ['TRUE', 'FALSE'], 'unused': ['x', 'y']}).to_csv(path, index=False)
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def load(self, workers=2):
+        return load_csvs(self.paths, self.cache, dtype=DTYPES, columns=list(DTYPES), workers=workers)
+
+    def test_cold_then_warm(self):
+        cold, infos = self.load()
+        self.assertEqual([i['cached'] for i in infos], [False] * 3)
+        warm, infos = self.load()
+        self.assertEqual([i['cached'] for i in infos], [True] * 3)
+        pd.testing.assert_frame_equal(cold, warm)
+        self.assertEqual(list(cold.columns), ['kills', 'deaths', 'win'])
+        self.assertEqual(cold['kills'].tolist(), [0, 5, 1, 5, 2, 5])
+        self.assertEqual(cold['kills'].dtype, 'float64')
+
+    def test_only_changed_files_are_parsed(self):
+        self.load()
+        pd.DataFrame({'kills': [9], 'deaths': [0], 'win': ['TRUE']}).to_csv(self.paths[1], index=False)
+        df, infos = self.load(workers=1)
+        self.assertEqual([i['cached'] for i in infos], [True, False, True])
+        self.assertEqual(df['kills'].tolist(), [0, 5, 9, 2, 5])
+        # The stale entry of the rewritten file is gone
+        self.assertEqual(len(os.listdir(self.cache)), 3)
+
+    def test_changed_file_keeps_entries_of_similarly_named_files(self):
+        # 2024.csv and 2024-spring.csv: changing the first must not evict the second
+        season = os.path.join(self.dir, '2024.csv')
+        spring = os.path.join(self.dir, '2024-spring.csv')
+        for path in (season, spring):
+            pd.DataFrame({'kills': [1], 'deaths': [1], 'win': ['TRUE']}).to_csv(path, index=False)
+        self.paths = [season, spring]
+        self.load()
+        pd.DataFrame({'kills': [7], 'deaths': [1], 'win': ['TRUE']}).to_csv(season, index=False)
+        _, infos = self.load(workers=1)
+        self.assertEqual([i['cached'] for i in infos], [False, True])
+        self.assertEqual(len(os.listdir(self.cache)), 2)
+
+    def test_bad_file_is_reported(self):
+        with open(self.paths[2], 'w') as f:
+            f.write('kills,deaths,win\nnot-a-number,1,TRUE\n')
+        df, infos = self.load()
+        self.assertIn('error', infos[2])
+        self.assertEqual(len(df), 4)
+
+if __name__ == '__main__':
+    unittest.main()
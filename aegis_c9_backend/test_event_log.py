@@ -0,0 +1,52 @@
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from event_log import EventIngestor, SeriesEventLog
+
+def kill(n, **extra):
+    return {"id": str(n), "type": "kill", "period": 1, "time": n, **extra}
+
+class TestEventLog(unittest.TestCase):
+    def test_deduplicates_overlapping_polls(self):
+        log = SeriesEventLog()
+        self.assertEqual([e['seq'] for e in log.append([kill(1), kill(2)])], [1, 2])
+        new = log.append([kill(2), kill(3)])
+        self.assertEqual([e['id'] for e in new], ['3'])
+        self.assertEqual((log.cursor, log.duplicates), ('3', 1))
+
+    def test_events_without_id(self):
+        log = SeriesEventLog()
+        event = {"type": "round_end", "period": 3, "time": 95}
+        log.append([event])
+        self.assertEqual(log.append([dict(event)]), [])
+        self.assertIsNone(log.cursor)
+
+    def test_bounded_log(self):
+        log = SeriesEventLog(max_events=3)
+        log.append([kill(n) for n in range(1, 6)])
+        self.assertEqual([e['seq'] for e in log.since(0)], [3, 4, 5])
+        self.assertEqual((log.oldest_seq, log.evicted), (3, 2))
+        # Evicted keys are forgotten along with their events
+        self.assertEqual(len(log._keys), 3)
+
+    def test_consumers_see_each_event_once(self):
+        ingestor = EventIngestor()
+        ingestor.ingest('s1', [kill(1), kill(2)])
+        seen = ingestor.since('s1', 0)
+        ingestor.ingest('s1', [kill(2), kill(3)])
+        seen += ingestor.since('s1', seen[-1]['seq'])
+        self.assertEqual([e['id'] for e in seen], ['1', '2', '3'])
+        self.assertEqual(ingestor.cursor('s1'), '3')
+        self.assertEqual(ingestor.since('unknown'), [])
+
+    def test_max_series(self):
+        ingestor = EventIngestor(max_series=2)
+        for series_id in ['a', 'b', 'c']:
+            ingestor.ingest(series_id, [kill(1)])
+        self.assertEqual(list(ingestor.stats()), ['b', 'c'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('AEGIS_STARTUP_MODE', 'lazy')
+
+from feature_importance import FeatureImportance, display_name
+from feature_spec import VALORANT_SPEC
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'valorant', 'valorant_model.json')
+
+@unittest.skipUnless(os.path.exists(MODEL_PATH), "VALORANT model not available")
+class TestFeatureImportance(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import xgboost as xgb
+        cls.booster = xgb.Booster(model_file=MODEL_PATH)
+
+    def test_from_booster(self):
+        importance = FeatureImportance.from_booster('valorant', 'base', self.booster, VALORANT_SPEC.feature_names)
+        self.assertEqual(sorted(i['feature'] for i in importance.items), sorted(VALORANT_SPEC.feature_names))
+        gains = [i['gain'] for i in importance.items]
+        self.assertEqual(gains, sorted(gains, reverse=True))
+        self.assertAlmostEqual(sum(i['importance'] for i in importance.items), 100, delta=1)
+        self.assertEqual(json.loads(importance.body)['features'], list(importance.items))
+
+    def test_etag_tracks_content(self):
+        a = FeatureImportance.from_booster('valorant', 'base', self.booster, VALORANT_SPEC.feature_names)
+        b = FeatureImportance.from_booster('valorant', 'base', self.booster, VALORANT_SPEC.feature_names)
+        c = FeatureImportance.from_booster('valorant', 'v2', self.booster, VALORANT_SPEC.feature_names)
+        self.assertEqual(a.etag, b.etag)
+        self.assertNotEqual(a.etag, c.etag)
+
+    def test_endpoint_revalidation(self):
+        import main
+        main.valorant_predictor.registry.ensure_loaded()
+        first = asyncio.run(main.feature_importance('valorant', None))
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(json.loads(first.body)['source'], 'model')
+        etag = first.headers['etag']
+        again = asyncio.run(main.feature_importance('valorant', f'"other", {etag}'))
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(asyncio.run(main.feature_importance('chess', None)).status_code, 404)
+        # Prediction responses carry only a reference to that payload
+        ref = asyncio.run(main.get_valorant_predictions())['feature_importance']
+        self.assertEqual(ref, {"url": "/api/feature-importance/valorant", "etag": etag,
+                               "version": main.valorant_predictor.registry.current().version})
+
+    def test_display_name(self):
+        self.assertEqual(display_name('Objective_Control'), 'Objective Control')
+        self.assertEqual(display_name('kill_participation'), 'Kill Participation')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+import os
+import pandas as pd
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from feature_spec import FeatureSpec, LOL_SPEC, NUMBER, VALORANT_CSV_KEYS, VALORANT_SPEC
+
+PLAYERS = [
+    {'Kills': 20, 'Deaths': 15, 'Assists': 5, 'Headshot %': '25%',
+     'First Kills': 3, 'First Deaths': 2, 'Average Damage Per Round': 150},
+    {'Kills': 8, 'Deaths': 18, 'Assists': 11, 'Headshot %': 0.12,
+     'First Kills': 0, 'First Deaths': 4, 'Average Damage Per Round': 95},
+]
+
+class TestFeatureSpec(unittest.TestCase):
+    def setUp(self):
+        self.kernel = VALORANT_SPEC.bind(VALORANT_CSV_KEYS, defaults={name: 0 for name in VALORANT_SPEC.inputs})
+
+    def test_dict_batch_and_frame_agree(self):
+        """A single dict, a list of dicts and a DataFrame go through the same kernel"""
+        batch = self.kernel.transform(PLAYERS)
+        self.assertEqual(batch.shape, (2, len(VALORANT_SPEC.feature_names)))
+        np.testing.assert_array_equal(self.kernel.transform(PLAYERS[0])[0], batch[0])
+        frame = pd.DataFrame(PLAYERS[:1])
+        np.testing.assert_array_equal(self.kernel.transform(frame)[0], batch[0])
+
+    def test_valorant_formulas(self):
+        row = dict(zip(VALORANT_SPEC.feature_names, self.kernel.transform(PLAYERS[0])[0]))
+        self.assertEqual(row['Headshot_Pct'], 0.25)
+        self.assertEqual(row['Survival_Rate'], 1.0 / 16)
+        self.assertEqual(row['Headshot_Impact'], 0.25 * 20)
+        self.assertEqual(row['First_Engagement'], 5 / 26.0)
+        self.assertEqual(row['Clutch_Factor'], 15 / 21)
+
+    def test_lol_objective_control(self):
+        """Objective_Control uses the training formula, including heralds and inhibitors"""
+        stats = {name: 0 for name in LOL_SPEC.inputs}
+        stats.update(team_baronKills=1, team_dragonKills=2, team_riftHeraldKills=1, team_towerKills=3, team_inhibitorKills=1)
+        row = dict(zip(LOL_SPEC.feature_names, LOL_SPEC.bind().transform(stats)[0]))
+        self.assertAlmostEqual(row['Objective_Control'], (3 + 4 + 1.5 + 3 + 2) / 20.0)
+
+    def test_missing_inputs(self):
+        """Defaults fill missing keys; without one the input is required"""
+        self.assertEqual(self.kernel.transform({})[0][0], 0.0)
+        with self.assertRaises(KeyError):
+            VALORANT_SPEC.bind(VALORANT_CSV_KEYS).transform({'Kills': 1})
+
+    def test_column_selection(self):
+        kernel = VALORANT_SPEC.bind(VALORANT_CSV_KEYS, columns=['Clutch_Factor', 'Deaths'])
+        np.testing.assert_array_equal(kernel.transform(PLAYERS[0])[0], [15 / 21, 15.0])
+
+    def test_rejects_non_arithmetic(self):
+        with self.assertRaises(ValueError):
+            FeatureSpec('bad', {'x': NUMBER}, [('y', '__import__("os")')])
+        with self.assertRaises(ValueError):
+            FeatureSpec('bad', {'x': NUMBER}, [('y', 'x + z')])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+import os
+import shutil
+import sys
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from feature_store import FeatureStore, feature_key
+
+FEATURES = [('kda', '(kills + assists) / deaths'), ('gpm', 'gold_earned / duration')]
+INPUTS = {'/data/part0.csv': 'aaa', '/data/part1.csv': 'bbb'}
+
+class TestFeatureStore(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.store = FeatureStore(self.dir, keep=3)
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame(rng.normal(size=(500, 2)), columns=['kda', 'gpm'])
+        self.y = rng.integers(0, 2, 500)
+        self.sources = np.where(np.arange(500) < 300, '/data/part0.csv', '/data/part1.csv')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_key_tracks_features_inputs_and_params(self):
+        key = feature_key(FEATURES, INPUTS, {"clip_z": 3})
+        self.assertEqual(key, feature_key(FEATURES, dict(reversed(list(INPUTS.items()))), {"clip_z": 3}))
+        self.assertNotEqual(key, feature_key(FEATURES[:1], INPUTS, {"clip_z": 3}))
+        self.assertNotEqual(key, feature_key([('kda', 'kills / deaths'), FEATURES[1]], INPUTS, {"clip_z": 3}))
+        self.assertNotEqual(key, feature_key(FEATURES, {**INPUTS, '/data/part1.csv': 'ccc'}, {"clip_z": 3}))
+        self.assertNotEqual(key, feature_key(FEATURES, INPUTS, {"clip_z": 2}))
+
+    def test_round_trip_is_memory_mapped(self):
+        key = feature_key(FEATURES, INPUTS)
+        self.assertIsNone(self.store.open('lol', key))
+        self.store.save('lol', key, self.X, self.y, sources=self.sources)
+
+        stored = self.store.open('lol', key)
+        self.assertEqual(stored.feature_names, ['kda', 'gpm'])
+        self.assertEqual(stored.rows, 500)
+        self.assertIsInstance(stored.columns['kda'], np.memmap)
+        pd.testing.assert_frame_equal(stored.frame(), self.X)
+        np.testing.assert_array_equal(stored.target, self.y)
+        np.testing.assert_array_equal(stored.sources, self.sources)
+        np.testing.assert_array_equal(stored.matrix(rows=[0, 499]), self.X.to_numpy()[[0, 499]])
+        # frame() wraps the mapped columns instead of copying them
+        self.assertTrue(np.shares_memory(stored.frame()['gpm'].to_numpy(), stored.columns['gpm']))
+        # Nothing but the finished version is left behind
+        self.assertEqual(os.listdir(self.dir), [f'lol-{key}'])
+
+    def test_keeps_newest_versions_per_game(self):
+        keys = [feature_key(FEATURES, {'/data/part0.csv': str(i)}) for i in range(5)]
+        for key in keys:
+            self.store.save('lol', key, self.X, self.y)
+        self.store.save('valorant', keys[0], self.X, self.y)
+        self.assertEqual([meta["key"] for meta in self.store.versions('lol')], keys[:1:-1])
+        self.assertIsNone(self.store.open('lol', keys[0]))
+        self.assertIsNotNone(self.store.open('valorant', keys[0]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import json
+import numpy as np
+import os
+import shutil
+import sys
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from hyperparameter_search import DEFAULT_TRIAL, search, select
+from tree_engine import ENGINE_NUMPY, ENGINE_XGBOOST
+
+PARAMS = dict(objective='binary:logistic', use_label_encoder=False, eval_metric='logloss', random_state=42)
+
+def trial(n, accuracy, p50):
+    return {"trial": n, "accuracy": accuracy, "latency": {ENGINE_NUMPY: {"p50_us": p50}}}
+
+class TestHyperparameterSearch(unittest.TestCase):
+    def test_select_fastest_within_tolerance(self):
+        trials = [trial(0, 0.800, 90), trial(1, 0.812, 120), trial(2, 0.808, 60), trial(3, 0.790, 10)]
+        self.assertEqual(select(trials, 0.005, ENGINE_NUMPY)["trial"], 2)
+        self.assertEqual(select(trials, 0.0, ENGINE_NUMPY)["trial"], 1)
+        self.assertEqual(select(trials, 0.05, ENGINE_NUMPY)["trial"], 3)
+
+    def test_budgeted_search(self):
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.normal(size=(2000, 4)), columns=['a', 'b', 'c', 'd'])
+        y = ((X['a'] + X['b'] * X['c'] + rng.normal(scale=0.5, size=2000)) > 0).astype(int)
+        tmp = tempfile.mkdtemp()
+        try:
+            log_path = os.path.join(tmp, 'search_log.json')
+            model, log = search(X, y, PARAMS, budget_seconds=1.0, jobs=2, max_rounds=60,
+                                engine=ENGINE_NUMPY, log_path=log_path, latency_samples=20)
+            with open(log_path) as f:
+                self.assertEqual(json.load(f), log)
+        finally:
+            shutil.rmtree(tmp)
+
+        trials = log["trials"]
+        self.assertGreaterEqual(len(trials), 2)
+        # Numbered in submission order whatever order they finished in: the default is trial 0
+        self.assertEqual([t["trial"] for t in trials], list(range(len(trials))))
+        self.assertEqual(trials[0]["params"], DEFAULT_TRIAL)
+        for t in trials:
+            self.assertLessEqual(t["rounds"], 60)
+            self.assertGreater(t["latency"][ENGINE_XGBOOST]["p50_us"], 0)
+            self.assertGreater(t["latency"][ENGINE_NUMPY]["p50_us"], 0)
+        chosen = trials[log["selected"]]
+        self.assertGreaterEqual(chosen["accuracy"], max(t["accuracy"] for t in trials) - log["tolerance"])
+        # The returned model is the selected configuration, refit with its early-stopped round count
+        self.assertEqual(model.get_booster().num_boosted_rounds(), chosen["rounds"])
+        self.assertEqual(model.get_params()["max_depth"], chosen["params"]["max_depth"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+import os
+import shutil
+import sys
+import tempfile
+import time
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from incremental_training import (base_artifact, continue_training, file_keys, load_manifest, save_manifest,
+                                  save_pair, save_versioned, split_new_files, training_rows)
+from model_registry import BASE_VERSION
+
+PARAMS = dict(objective='binary:logistic', eval_metric='logloss', random_state=42, max_depth=3, learning_rate=0.1)
+
+def make_data(n, seed, shift=0.0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, 4)), columns=['a', 'b', 'c', 'd'])
+    y = ((X['a'] + (0.5 + shift) * X['b'] + rng.normal(scale=0.5, size=n)) > 0).astype(int)
+    return X, y
+
+class TestIncrementalTraining(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.paths = []
+        for part in range(3):
+            path = os.path.join(self.dir, f'part{part}.csv')
+            pd.DataFrame({'kills': [part]}).to_csv(path, index=False)
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_new_and_changed_files_from_manifest(self):
+        save_manifest(self.dir, BASE_VERSION, 'model.json', file_keys(self.paths[:2]))
+        pd.DataFrame({'kills': [9]}).to_csv(self.paths[0], index=False)
+        new, seen = split_new_files(self.paths, load_manifest(self.dir), None)
+        self.assertEqual(new, [self.paths[0], self.paths[2]])
+        self.assertEqual(seen, [self.paths[1]])
+
+    def test_new_files_by_mtime_without_manifest(self):
+        model_path = os.path.join(self.dir, 'model.json')
+        open(model_path, 'w').close()
+        stamp = time.time() + 10
+        os.utime(self.paths[2], (stamp, stamp))
+        new, seen = split_new_files(self.paths, None, model_path)
+        self.assertEqual(new, [self.paths[2]])
+
+    def test_training_rows_keep_new_plus_replay(self):
+        sources = pd.Series(['old.csv'] * 10000 + ['new.csv'] * 100)
+        keep = training_rows(sources, ['new.csv'], replay=0.1)
+        self.assertTrue(keep[-100:].all())
+        self.assertAlmostEqual(keep[:10000].mean(), 0.1, delta=0.02)
+        self.assertFalse(training_rows(sources, ['new.csv'], replay=0.0)[:10000].any())
+
+    def test_continued_model_extends_base(self):
+        import joblib
+        import xgboost as xgb
+        from sklearn.preprocessing import RobustScaler
+
+        X, y = make_data(2000, seed=0)
+        base = xgb.XGBClassifier(n_estimators=10, **PARAMS).fit(X, y)
+        base.save_model(os.path.join(self.dir, 'valorant_model.json'))
+        joblib.dump(RobustScaler().fit(X), os.path.join(self.dir, 'scaler.joblib'))
+        version, model_path, scaler_path = base_artifact(self.dir, 'valorant_model')
+        self.assertEqual(version, BASE_VERSION)
+
+        X_new, y_new = make_data(2000, seed=1, shift=1.5)
+        model = continue_training(model_path, X_new, y_new, 5, **PARAMS)
+        booster = model.get_booster()
+        self.assertEqual(booster.num_boosted_rounds(), 15)
+        # The first trees are the base model's, unchanged
+        np.testing.assert_allclose(
+            booster.predict(xgb.DMatrix(X_new), iteration_range=(0, 10)),
+            base.get_booster().predict(xgb.DMatrix(X_new)), rtol=1e-6)
+
+        save_versioned(model, joblib.load(scaler_path), self.dir, 'valorant_model', 'v2')
+        # Versioned pairs sort by mtime; make the new one unambiguously newest
+        stamp = time.time() + 10
+        for name in ('valorant_model-v2.json', 'scaler-v2.joblib'):
+            os.utime(os.path.join(self.dir, name), (stamp, stamp))
+        self.assertEqual(base_artifact(self.dir, 'valorant_model')[0], 'v2')
+
+        # A full retrain replaces the base pair through temporary files, leaving none behind
+        save_pair(model, joblib.load(scaler_path), model_path, scaler_path)
+        self.assertFalse([name for name in os.listdir(self.dir) if 'tmp' in name])
+        self.assertEqual(xgb.Booster(model_file=model_path).num_boosted_rounds(), 15)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('AEGIS_STARTUP_MODE', 'lazy')
+
+import main
+from feature_spec import LOL_SPEC
+from model_registry import ModelRegistry
+from prediction_cache import PredictionCache
+
+class TestLoLInsights(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import joblib
+        import pandas as pd
+        import xgboost as xgb
+        from sklearn.preprocessing import RobustScaler
+        cls.dir = tempfile.mkdtemp()
+        # Small booster on synthetic stats: winning depends on kills vs deaths and gold per minute
+        rng = np.random.default_rng(3)
+        stats = [main.LoLPredictor._generate_base_stats(None, 'Team') for _ in range(600)]
+        for s in stats:
+            s['kills'] += int(rng.integers(-6, 6))
+            s['gold_earned'] += int(rng.integers(-3000, 3000))
+        X = np.vstack([main.lol_team_kernel.transform(s) for s in stats])
+        y = ((X[:, 1] - X[:, 0]) + (X[:, 7] - X[:, 7].mean()) / 100 > 4).astype(int)
+        scaler = RobustScaler().fit(X)
+        # Fit on a named DataFrame like train_lol_model.py, so the booster stores feature names
+        X_scaled = pd.DataFrame(scaler.transform(X), columns=LOL_SPEC.feature_names)
+        model = xgb.XGBClassifier(n_estimators=30, max_depth=3).fit(X_scaled, y)
+        model.save_model(os.path.join(cls.dir, 'lol_model.json'))
+        joblib.dump(scaler, os.path.join(cls.dir, 'scaler.joblib'))
+        cls.stats = stats
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.dir)
+
+    def make_predictor(self, cache=None, engine='numpy'):
+        predictor = main.LoLPredictor(engine=engine, cache=cache, load=False)
+        predictor.registry = ModelRegistry('lol', self.dir, 'lol_model', predictor.engine, label='LoL')
+        return predictor
+
+    def test_contributions_match_prediction(self):
+        for engine in ('numpy', 'xgboost'):
+            predictor = self.make_predictor(engine=engine)
+            for stats in self.stats[:20]:
+                plain = predictor.predict(stats, {})
+                explained = predictor.predict(stats, {}, explain=True)
+                self.assertEqual(plain['win_probability'], explained['win_probability'])
+                self.assertNotIn('feature_contributions', plain)
+                self.assertNotIn('Simulated', explained['model_name'])
+                contributions = explained['feature_contributions']
+                self.assertEqual(sorted(c['feature'] for c in contributions), sorted(LOL_SPEC.feature_names))
+                impacts = [c['impact'] for c in contributions]
+                self.assertEqual(impacts, sorted(impacts))
+
+    def test_explained_predictions_are_cached(self):
+        cache = PredictionCache()
+        predictor = self.make_predictor(cache=cache)
+        first = predictor.predict(self.stats[0], {}, explain=True)
+        second = predictor.predict(self.stats[0], {}, explain=True)
+        predictor.predict(self.stats[0], {})
+        self.assertEqual(first, second)
+        # Plain and explained results are separate entries
+        self.assertEqual(cache.stats()['misses'], 2)
+
+    def test_insights_follow_weakest_contribution(self):
+        main._last_anomaly_time = 0
+        main._anomaly_history = []
+        contributions = [
+            {"feature": name, "value": 1.0, "contribution": 0.1, "impact": 1.0}
+            for name in LOL_SPEC.feature_names if name != 'Damage_Per_Gold'
+        ]
+        contributions.insert(0, {"feature": "Damage_Per_Gold", "value": 0.4, "contribution": -0.5, "impact": -6.0})
+        prediction = {"win_probability": 55.0, "feature_contributions": contributions}
+        players = main.LoLPredictor._generate_players(None, 'Team')
+        insights = main.generate_ml_tactical_insights(self.stats[0], self.stats[1], prediction, players)
+        self.assertEqual(len(insights), 1)
+        self.assertEqual(insights[0]['feature'], 'damage_per_gold')
+        self.assertEqual(insights[0]['impact'], -6.0)
+
+    def test_heuristic_impacts_are_negative(self):
+        scores = {'objective_control': 10, 'gold_efficiency': 55, 'kda_ratio': 90, 'damage_efficiency': 20,
+                  'vision_per_min': 80, 'kill_participation': 70, 'survival_rate': 75}
+        weakest = main._heuristic_weak_features(scores)
+        self.assertEqual([k for k, _ in weakest], ['objective_control', 'damage_efficiency'])
+        # Same sign convention as Tree SHAP: a weakness costs win probability
+        self.assertTrue(all(impact < 0 for _, impact in weakest))
+        self.assertEqual(dict(weakest)['objective_control'], -1.8)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,9 @@ import json
 # Add parent directory to path to import find_live_match
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from find_live_match import ValorantPredictor, get_live_predictions
+import xgboost as xgb
+
+from find_live_match import ValorantPredictor, get_live_predictions, get_predictor
 
 class TestValorantModel(unittest.TestCase):
     @classmethod
@@ -76,6 +78,27 @@ class TestValorantModel(unittest.TestCase):
         self.assertEqual(results[0]['name'], 'TestPlayer')
         self.assertIn('recommendation', results[0])
 
+    def test_batch_matches_per_player_scoring(self):
+        """Batched scoring must agree with the scale-then-DMatrix path per player"""
+        stats_list = [
+            {'Kills': 20, 'Deaths': 15, 'Assists': 5, 'Headshot %': '25%',
+             'First Kills': 3, 'First Deaths': 2, 'Average Damage Per Round': 150},
+            {'Kills': 8, 'Deaths': 18, 'Assists': 11, 'Headshot %': 0.12,
+             'First Kills': 0, 'First Deaths': 4, 'Average Damage Per Round': 95},
+            {'Kills': 31, 'Deaths': 9, 'Assists': 2, 'Headshot %': '41%',
+             'First Kills': 7, 'First Deaths': 1, 'Average Damage Per Round': 210},
+        ]
+        batch = self.predictor.predict_batch(stats_list)
+        for stats, prob in zip(stats_list, batch):
+            X = self.predictor._preprocess(stats)
+            X = pd.DataFrame(self.predictor.scaler.transform(X), columns=self.predictor.features)
+            expected = self.predictor.model.predict(xgb.DMatrix(X, feature_names=list(X.columns)))[0]
+            self.assertAlmostEqual(float(prob), float(expected), places=6)
+
+    def test_shared_predictor_is_reused(self):
+        """get_live_predictions should not reload the model on every call"""
+        self.assertIs(get_predictor(), get_predictor())
+
     def test_real_data_samples(self):
         """Verify the model against samples from the overview.csv"""
         if os.path.exists(self.data_file):
@@ -0,0 +1,126 @@
+import unittest
+import numpy as np
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from model_registry import BASE_VERSION, ModelRegistry
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'valorant')
+MODEL_PATH = os.path.join(DATA_DIR, 'valorant_model.json')
+SCALER_PATH = os.path.join(DATA_DIR, 'scaler.joblib')
+
+@unittest.skipUnless(os.path.exists(MODEL_PATH) and os.path.exists(SCALER_PATH), "VALORANT model not available")
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        shutil.copy(MODEL_PATH, os.path.join(self.dir, 'valorant_model.json'))
+        shutil.copy(SCALER_PATH, os.path.join(self.dir, 'scaler.joblib'))
+        self.registry = ModelRegistry('valorant', self.dir, 'valorant_model', 'xgboost')
+
+    def tearDown(self):
+        self.registry.stop()
+        shutil.rmtree(self.dir)
+
+    def add_version(self, version, model_src=MODEL_PATH, offset=10):
+        """Copy an artifact pair in as <version>, newer than anything already there"""
+        model_path = os.path.join(self.dir, f'valorant_model-{version}.json')
+        scaler_path = os.path.join(self.dir, f'scaler-{version}.joblib')
+        shutil.copy(model_src, model_path)
+        shutil.copy(SCALER_PATH, scaler_path)
+        stamp = time.time() + offset
+        os.utime(model_path, (stamp, stamp))
+        os.utime(scaler_path, (stamp, stamp))
+
+    def test_loads_base_pair(self):
+        self.assertTrue(self.registry.refresh())
+        bundle = self.registry.current()
+        self.assertEqual(bundle.version, BASE_VERSION)
+        self.assertTrue(bundle.scaler_folded)
+        self.assertGreater(bundle.memory_bytes, 0)
+        # Nothing changed on disk: no reload
+        self.assertFalse(self.registry.refresh())
+
+    def test_ensure_loaded_on_first_use(self):
+        """Deferred startup: nothing is loaded until the first caller asks"""
+        self.assertIsNone(self.registry.current())
+        bundle = self.registry.ensure_loaded()
+        self.assertEqual(bundle.version, BASE_VERSION)
+        self.assertIs(self.registry.ensure_loaded(), bundle)
+
+    def test_ensure_loaded_async_loads_off_the_event_loop(self):
+        import asyncio
+        import threading
+        threads = []
+        refresh = self.registry.refresh
+        self.registry.refresh = lambda: threads.append(threading.current_thread()) or refresh()
+        bundle = asyncio.run(self.registry.ensure_loaded_async())
+        self.assertEqual(bundle.version, BASE_VERSION)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+        # Already loaded: no second hop
+        self.assertIs(asyncio.run(self.registry.ensure_loaded_async()), bundle)
+        self.assertEqual(len(threads), 1)
+
+    def test_swaps_to_newer_version(self):
+        swaps = []
+        self.registry.on_swap(lambda old, new: swaps.append((old, new)))
+        self.registry.refresh()
+        old = self.registry.current()
+        self.add_version('v2')
+        self.assertTrue(self.registry.refresh())
+
+        new = self.registry.current()
+        self.assertEqual(new.version, 'v2')
+        self.assertNotEqual(new.generation, old.generation)
+        self.assertEqual(swaps[-1], (old, new))
+        # The retired bundle still scores for requests that grabbed it
+        X = np.ones((1, old.num_features))
+        np.testing.assert_allclose(old.predict_proba(X), new.predict_proba(X))
+
+        info = self.registry.info()
+        self.assertEqual(info['active']['version'], 'v2')
+        self.assertEqual(info['retired'][0]['version'], BASE_VERSION)
+        self.assertEqual(sorted(info['available_versions']), [BASE_VERSION, 'v2'])
+
+    def test_bad_artifact_keeps_serving(self):
+        self.registry.refresh()
+        old = self.registry.current()
+        broken = os.path.join(self.dir, 'broken.json')
+        with open(broken, 'w') as f:
+            f.write('{"not": "a model"')
+        self.add_version('v3', model_src=broken)
+
+        self.assertFalse(self.registry.refresh())
+        self.assertIs(self.registry.current(), old)
+        self.assertIn('valorant_model-v3.json', self.registry.info()['last_error'])
+
+    def test_pair_replaced_while_loading_waits_for_next_poll(self):
+        """A retrain renames the model, then the scaler: a load that straddles them isn't swapped in"""
+        import model_registry
+        load = model_registry.load_bundle
+
+        def scaler_lands_mid_load(*args):
+            bundle = load(*args)
+            stamp = time.time() + 10
+            os.utime(os.path.join(self.dir, 'scaler.joblib'), (stamp, stamp))
+            return bundle
+
+        with mock.patch.object(model_registry, 'load_bundle', scaler_lands_mid_load):
+            self.assertFalse(self.registry.refresh())
+        self.assertIsNone(self.registry.current())
+        self.assertTrue(self.registry.refresh())
+        self.assertEqual(self.registry.current().version, BASE_VERSION)
+
+    def test_missing_artifacts(self):
+        empty = ModelRegistry('lol', tempfile.mkdtemp(), 'lol_model', 'xgboost')
+        self.assertFalse(empty.refresh())
+        self.assertIsNone(empty.current())
+
+if __name__ == '__main__':
+    unittest.main()
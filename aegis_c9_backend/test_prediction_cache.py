@@ -0,0 +1,94 @@
+import unittest
+import numpy as np
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from prediction_cache import PredictionCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestPredictionCache(unittest.TestCase):
+    def setUp(self):
+        self.calls = 0
+
+    def compute(self, value=42.0):
+        def fn():
+            self.calls += 1
+            return value
+        return fn
+
+    def test_hit_after_miss(self):
+        cache = PredictionCache()
+        x = np.array([[1.0, 2.0, 3.0]])
+        self.assertEqual(cache.get_or_compute(x, self.compute()), 42.0)
+        self.assertEqual(cache.get_or_compute(x.copy(), self.compute()), 42.0)
+        self.assertEqual(self.calls, 1)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = PredictionCache(ttl=3.0, clock=clock)
+        x = np.zeros(4)
+        cache.get_or_compute(x, self.compute())
+        clock.now = 2.9
+        cache.get_or_compute(x, self.compute())
+        clock.now = 3.0
+        cache.get_or_compute(x, self.compute())
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(cache.stats()['expirations'], 1)
+
+    def test_quantized_keys(self):
+        """Vectors within the tolerance share an entry; exact keys do not"""
+        a, b = np.array([1.0, 2.0]), np.array([1.0004, 1.9996])
+        quantized = PredictionCache(quantum=1e-2)
+        self.assertEqual(quantized.key(a), quantized.key(b))
+        exact = PredictionCache()
+        self.assertNotEqual(exact.key(a), exact.key(b))
+
+    def test_lru_eviction_by_count(self):
+        cache = PredictionCache(max_entries=2)
+        for i in range(3):
+            cache.put(bytes([i]), float(i))
+        cache.get(bytes([1]))
+        cache.put(bytes([3]), 3.0)
+        self.assertIsNone(cache.get(bytes([0])))
+        self.assertEqual(cache.get(bytes([1])), 1.0)
+        self.assertIsNone(cache.get(bytes([2])))
+        self.assertEqual(cache.stats()['evictions'], 2)
+
+    def test_memory_ceiling(self):
+        cache = PredictionCache(max_entries=10_000, max_bytes=2_000)
+        for i in range(100):
+            cache.put(cache.key(np.array([float(i)])), float(i))
+        stats = cache.stats()
+        self.assertLessEqual(stats['bytes'], 2_000)
+        self.assertGreater(stats['evictions'], 0)
+        self.assertEqual(stats['entries'] + stats['evictions'], 100)
+
+    def test_nested_values_are_sized_by_contents(self):
+        """Tuples of arrays or dicts count what they hold, so max_bytes still bounds memory"""
+        cache = PredictionCache()
+        row = np.zeros((1, 1000))[0]  # a view: getsizeof alone leaves out its buffer
+        cache.put(b'row', (0.5, row))
+        self.assertGreater(cache.stats()['bytes'], row.nbytes)
+        cache.clear()
+        cache.put(b'dicts', (0.5, [{"feature": f"f{i}", "impact": float(i)} for i in range(50)]))
+        self.assertGreater(cache.stats()['bytes'], 50 * sys.getsizeof({}))
+
+    def test_from_env_disabled(self):
+        os.environ['AEGIS_PREDICTION_CACHE_SIZE'] = '0'
+        try:
+            self.assertIsNone(PredictionCache.from_env())
+        finally:
+            del os.environ['AEGIS_PREDICTION_CACHE_SIZE']
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import os
+import sys
+import threading
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('AEGIS_STARTUP_MODE', 'lazy')
+
+from session_store import SessionStore
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestSessionStore(unittest.TestCase):
+    def test_same_key_same_session(self):
+        store = SessionStore()
+        self.assertIs(store.get('a'), store.get('a'))
+        self.assertIsNot(store.get('a'), store.get('b'))
+        self.assertEqual(store.stats()['created'], 2)
+
+    def test_lru_eviction(self):
+        store = SessionStore(max_sessions=2)
+        store.get('a')
+        store.get('b')
+        store.get('a')
+        store.get('c')
+        self.assertEqual(('a' in store, 'b' in store, 'c' in store), (True, False, True))
+        self.assertEqual(store.stats()['evictions'], 1)
+
+    def test_idle_expiry(self):
+        clock = FakeClock()
+        store = SessionStore(idle_ttl=300, clock=clock)
+        first = store.get('a')
+        store.get('b')
+        clock.now = 200
+        store.get('b')
+        clock.now = 400
+        self.assertIsNot(store.get('a'), first)
+        self.assertIn('b', store)
+        self.assertEqual(store.stats()['expirations'], 1)
+
+    def test_byte_ceiling(self):
+        store = SessionStore(max_bytes=15000)
+        for key in 'abc':
+            session = store.get(key)
+            session.team_stats = {f'stat{i}': i for i in range(50)}
+            store.update_size(session)
+        stats = store.stats()
+        self.assertLessEqual(stats["bytes"], 15000)
+        self.assertIn('c', store)
+        self.assertGreater(stats['evictions'], 0)
+
+    def test_concurrent_gets_share_session(self):
+        store = SessionStore()
+        sessions = []
+        threads = [threading.Thread(target=lambda: sessions.append(store.get('m'))) for _ in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len({id(s) for s in sessions}), 1)
+        self.assertEqual(store.stats()['created'], 1)
+
+class TestLoLSessions(unittest.TestCase):
+    def setUp(self):
+        from main import LoLPredictor
+        self.predictor = LoLPredictor(load=False)
+
+    def test_matchups_do_not_reset_each_other(self):
+        first, _, _ = self.predictor.get_stable_stats('Cloud9', 'T1')
+        self.predictor.get_stable_stats('G2 Esports', 'Fnatic')
+        again, _, _ = self.predictor.get_stable_stats('Cloud9', 'T1')
+        self.assertEqual(first, again)
+        self.assertEqual(len(self.predictor.sessions), 2)
+
+    def test_series_id_keys_session(self):
+        self.predictor.get_stable_stats('Cloud9', 'T1', session_id='s1')
+        self.predictor.get_stable_stats('Cloud9', 'T1', session_id='s2')
+        self.assertEqual(len(self.predictor.sessions), 2)
+
+if __name__ == '__main__':
+    unittest.main()
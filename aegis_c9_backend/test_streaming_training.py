@@ -0,0 +1,74 @@
+import unittest
+import numpy as np
+import os
+import shutil
+import sys
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from streaming_training import CsvChunks, FeatureStats, streaming_median, train_streaming
+
+PARAMS = dict(objective='binary:logistic', use_label_encoder=False, eval_metric='logloss',
+              random_state=42, max_depth=3, learning_rate=0.1)
+
+class TestStreamingTraining(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        self.paths = []
+        for part in range(3):
+            df = pd.DataFrame(rng.normal(size=(1500, 3)), columns=['a', 'b', 'c'])
+            df['win'] = np.where(df['a'] + 0.5 * df['b'] + rng.normal(scale=0.5, size=1500) > 0, 'TRUE', 'FALSE')
+            df['unused'] = 'x'
+            path = os.path.join(self.dir, f'part{part}.csv')
+            df.to_csv(path, index=False)
+            self.paths.append(path)
+        self.chunks = CsvChunks(self.paths, columns=['a', 'b', 'c', 'win'], chunk_rows=400)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_chunks_cover_every_row_in_order(self):
+        full = pd.concat([pd.read_csv(p, usecols=['a', 'b', 'c', 'win']) for p in self.paths], ignore_index=True)
+        chunks = list(self.chunks)
+        self.assertLessEqual(max(len(c) for c in chunks), 400)
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), full)
+        # Re-iterable: XGBoost makes several passes
+        self.assertEqual(sum(len(c) for c in self.chunks), 4500)
+
+    def test_feature_stats_match_whole_data(self):
+        X = np.random.default_rng(1).normal(3.0, 2.0, size=(5000, 4))
+        X[:, 3] = 7.0
+        stats = FeatureStats(4, sample_rows=500)
+        for start in range(0, 5000, 700):
+            stats.update(X[start:start + 700])
+        np.testing.assert_allclose(stats.mean, X.mean(axis=0))
+        np.testing.assert_allclose(stats.std, X.std(axis=0, ddof=1), atol=1e-12)
+        self.assertEqual(stats.sample.shape, (500, 4))
+        lower, upper = stats.clip_bounds()
+        self.assertTrue(np.isinf(lower[3]) and np.isinf(upper[3]))
+
+    def test_streaming_median(self):
+        for values in ([3, 1, 2], [4, 1, 3, 2], [5, 5, 5, 1, 9, 9]):
+            chunks = [pd.DataFrame({'Assists': values[i:i + 2]}) for i in range(0, len(values), 2)]
+            self.assertEqual(streaming_median(chunks, 'Assists'), pd.Series(values).median())
+
+    def test_train_streaming(self):
+        def prepare(chunk):
+            return chunk[['a', 'b', 'c']].to_numpy(), (chunk['win'] == 'TRUE').astype(int).to_numpy()
+
+        booster, scaler, report = train_streaming(self.chunks, prepare, ['a', 'b', 'c'], PARAMS,
+                                                  num_boost_round=20, cache_dir=self.dir)
+        self.assertEqual(report['rows'], 4500)
+        self.assertEqual(report['train_rows'] + report['holdout_rows'], 4500)
+        self.assertEqual(booster.num_boosted_rounds(), 20)
+        self.assertEqual(booster.feature_names, ['a', 'b', 'c'])
+        accuracy = ((report['p_holdout'] > 0.5) == report['y_holdout']).mean()
+        self.assertGreater(accuracy, 0.8)
+        # The on-disk page cache is cleaned up
+        self.assertEqual(sorted(os.listdir(self.dir)), ['part0.csv', 'part1.csv', 'part2.csv'])
+
+if __name__ == '__main__':
+    unittest.main()
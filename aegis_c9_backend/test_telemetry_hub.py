@@ -0,0 +1,113 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json_patch
+from telemetry_hub import MODE_DELTA, TelemetryHub
+
+class TestTelemetryHub(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.calls = {}
+
+    async def produce(self, series_id):
+        n = self.calls[series_id] = self.calls.get(series_id, 0) + 1
+        return {
+            "series": series_id,
+            "tick": n,
+            "players": [{"name": "A", "kills": n // 3}, {"name": "B", "kills": 4}],
+            "mie_analysis": {"summary": "Macro Anomalies Detected"},
+        }
+
+    async def test_one_producer_fans_out_to_all_subscribers(self):
+        hub = TelemetryHub(self.produce, interval=0.01)
+        streams = [hub.subscribe('s1') for _ in range(5)]
+        frames = await asyncio.gather(*(anext(s) for s in streams))
+        # Every client got the very same serialized frame from a single fetch
+        self.assertEqual(self.calls, {'s1': 1})
+        self.assertTrue(all(f is frames[0] for f in frames))
+        self.assertEqual(json.loads(frames[0])['tick'], 1)
+        self.assertEqual(hub.stats()['s1']['subscribers'], 5)
+        for s in streams:
+            await s.aclose()
+        await hub.close()
+
+    async def test_producer_stops_with_last_subscriber(self):
+        hub = TelemetryHub(self.produce, interval=0.01)
+        first, second = hub.subscribe('s1'), hub.subscribe('s1')
+        await anext(first)
+        await anext(second)
+        await first.aclose()
+        self.assertIn('s1', hub.stats())
+        await second.aclose()
+        self.assertEqual(hub.stats(), {})
+
+        produced = self.calls['s1']
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.calls['s1'], produced)
+
+    async def test_series_are_independent(self):
+        hub = TelemetryHub(self.produce, interval=0.01)
+        a, b = hub.subscribe('a'), hub.subscribe('b')
+        self.assertEqual(json.loads(await anext(a))['series'], 'a')
+        self.assertEqual(json.loads(await anext(b))['series'], 'b')
+        await a.aclose()
+        self.assertEqual(list(hub.stats()), ['b'])
+        await b.aclose()
+
+    async def test_slow_subscriber_drops_oldest(self):
+        hub = TelemetryHub(self.produce, interval=0.001, queue_size=2)
+        slow = hub.subscribe('s1')
+        await anext(slow)
+        await asyncio.sleep(0.05)
+        # Only the newest queue_size frames are kept for a client that fell behind
+        frames = [json.loads(await anext(slow)) for _ in range(2)]
+        self.assertEqual(frames[1]['tick'] - frames[0]['tick'], 1)
+        self.assertGreater(hub.stats()['s1']['dropped'], 0)
+        await slow.aclose()
+
+    async def test_delta_stream_reconstructs_documents(self):
+        """Keyframes every N ticks, patches in between, same documents as full mode"""
+        hub = TelemetryHub(self.produce, interval=0.001, queue_size=64, keyframe_interval=4)
+        full, delta = hub.subscribe('s1'), hub.subscribe('s1', MODE_DELTA)
+        doc, kinds = None, []
+        for expected_seq in range(1, 10):
+            expected = json.loads(await anext(full))
+            message = json.loads(await anext(delta))
+            self.assertEqual(message['seq'], expected_seq)
+            kinds.append(message['type'])
+            doc = message['data'] if message['type'] == 'keyframe' else json_patch.apply(doc, message['ops'])
+            self.assertEqual(doc, expected)
+        self.assertEqual([i + 1 for i, k in enumerate(kinds) if k == 'keyframe'], [1, 5, 9])
+        await full.aclose()
+        await delta.aclose()
+
+    async def test_delta_gap_sends_keyframe(self):
+        hub = TelemetryHub(self.produce, interval=0.001, queue_size=2, keyframe_interval=1000)
+        delta = hub.subscribe('s1', MODE_DELTA)
+        self.assertEqual(json.loads(await anext(delta))['type'], 'keyframe')
+        await asyncio.sleep(0.05)
+        # Frames were dropped while this client lagged: it resyncs on a keyframe
+        self.assertEqual(json.loads(await anext(delta))['type'], 'keyframe')
+        self.assertEqual(json.loads(await anext(delta))['type'], 'delta')
+        await delta.aclose()
+
+class TestJsonPatch(unittest.TestCase):
+    def test_round_trip(self):
+        old = {"a": 1, "b": {"c": [1, 2, 3], "d": "x"}, "e/f": True, "gone": None}
+        new = {"a": 1.5, "b": {"c": [1, 5, 3], "d": "x"}, "e/f": 1, "list": [1, 2], "h": {"k": []}}
+        ops = json_patch.diff(old, new)
+        self.assertEqual(json_patch.apply(old, ops), new)
+        self.assertIn({'op': 'replace', 'path': '/b/c/1', 'value': 5}, ops)
+        self.assertIn({'op': 'replace', 'path': '/e~1f', 'value': 1}, ops)
+        self.assertEqual(json_patch.diff(new, new), [])
+
+    def test_resized_list_is_replaced(self):
+        ops = json_patch.diff({"p": [1, 2]}, {"p": [1, 2, 3]})
+        self.assertEqual(ops, [{'op': 'replace', 'path': '/p', 'value': [1, 2, 3]}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+import os
+import sys
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from training_prep import clean_boolean, clean_numeric, clean_percentage, clip_outliers
+
+# The per-row helpers the training scripts used before, as the reference
+def row_percentage(val):
+    if pd.isna(val):
+        return 0.0
+    try:
+        return float(str(val).replace('%', '').strip()) / 100.0
+    except:
+        return 0.0
+
+def row_numeric(val):
+    if pd.isna(val):
+        return 0.0
+    try:
+        return float(str(val).replace('inf', '0').strip())
+    except:
+        return 0.0
+
+def row_boolean(val):
+    if pd.isna(val):
+        return 0
+    if isinstance(val, bool):
+        return 1 if val else 0
+    return 1 if str(val).upper().strip() in ['TRUE', '1', 'YES', 'WIN'] else 0
+
+def row_clip(X):
+    X = X.copy()
+    for col in X.columns:
+        mean, std = X[col].mean(), X[col].std()
+        if std > 0:
+            X[col] = X[col].clip(mean - 3*std, mean + 3*std)
+    return X
+
+class TestTrainingPrep(unittest.TestCase):
+    def assertSameValues(self, vectorized, series, reference):
+        expected = series.apply(reference).to_numpy(dtype=np.float64)
+        actual = vectorized(series).to_numpy(dtype=np.float64)
+        # Bitwise, so -0.0 vs 0.0 and last-digit parse differences would show
+        self.assertEqual(actual.tobytes(), expected.tobytes(), list(zip(series, actual, expected)))
+
+    def test_percentage(self):
+        rng = np.random.default_rng(0)
+        values = [f'{v}%' for v in rng.random(500) * 100] + ['25%', ' 3.5 % ', '', 'abc', np.nan, '0%', '100', '1_000%', '-NaN%']
+        self.assertSameValues(clean_percentage, pd.Series(values, dtype=object), row_percentage)
+        # Without unparsable entries the whole column converts in one pass
+        self.assertSameValues(clean_percentage, pd.Series(values[:-6] + [' 7 %', np.nan, '-NaN%'], dtype=object), row_percentage)
+        self.assertSameValues(clean_percentage, pd.Series([12.5, np.nan, 0.0]), row_percentage)
+
+    def test_numeric(self):
+        rng = np.random.default_rng(1)
+        values = [str(v) for v in rng.normal(0, 5, 500)] + ['inf', '-inf', ' 4 ', 'x', np.nan, 7, -2.5, '1__0', 'Infinity']
+        self.assertSameValues(clean_numeric, pd.Series(values, dtype=object), row_numeric)
+        self.assertSameValues(clean_numeric, pd.Series(values[:-6] + [' 4 ', np.nan, 7, 'Infinity'], dtype=object), row_numeric)
+        self.assertSameValues(clean_numeric, pd.Series([1.5, np.inf, -np.inf, np.nan]), row_numeric)
+
+    def test_boolean(self):
+        values = ['TRUE', 'false', ' yes ', 'Win', '1', '0', 1, 1.0, True, False, np.nan, 'maybe']
+        self.assertSameValues(clean_boolean, pd.Series(values, dtype=object), row_boolean)
+        self.assertSameValues(clean_boolean, pd.Series([True, False]), row_boolean)
+        self.assertSameValues(clean_boolean, pd.Series([1.0, 0.0, np.nan]), row_boolean)
+
+    def test_clip_outliers(self):
+        rng = np.random.default_rng(2)
+        X = pd.DataFrame({'a': rng.standard_cauchy(1000), 'b': np.ones(1000), 'c': rng.normal(size=1000)})
+        pd.testing.assert_frame_equal(clip_outliers(X), row_clip(X), check_exact=True)
+
+if __name__ == '__main__':
+    unittest.main()
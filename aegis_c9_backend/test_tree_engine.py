@@ -0,0 +1,96 @@
+import unittest
+import joblib
+import numpy as np
+import os
+import pandas as pd
+import sys
+import xgboost as xgb
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from find_live_match import ValorantPredictor
+from tree_engine import TreeEnsemble, load_folded_booster, resolve_engine, scaler_affine
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'valorant')
+MODEL_PATH = os.path.join(DATA_DIR, 'valorant_model.json')
+SCALER_PATH = os.path.join(DATA_DIR, 'scaler.joblib')
+OVERVIEW_PATH = os.path.join(DATA_DIR, 'vct_2025', 'matches', 'overview.csv')
+RAW_COLUMNS = ['Kills', 'Deaths', 'Assists', 'Headshot %', 'First Kills', 'First Deaths', 'Average Damage Per Round']
+
+def historical_samples(n=5000, seed=11):
+    """Raw stat lines from overview.csv when available, else a synthetic VCT-like spread"""
+    if os.path.exists(OVERVIEW_PATH):
+        df = pd.read_csv(OVERVIEW_PATH, usecols=RAW_COLUMNS, nrows=n).dropna()
+        return df.to_dict('records')
+    rng = np.random.default_rng(seed)
+    return [{
+        'Kills': int(rng.integers(0, 35)), 'Deaths': int(rng.integers(0, 25)),
+        'Assists': int(rng.integers(0, 15)), 'Headshot %': f"{int(rng.integers(0, 60))}%",
+        'First Kills': int(rng.integers(0, 8)), 'First Deaths': int(rng.integers(0, 8)),
+        'Average Damage Per Round': float(rng.integers(400, 2600)) / 10.0
+    } for _ in range(n)]
+
+class TestTreeEnsemble(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = xgb.XGBClassifier()
+        cls.model.load_model(MODEL_PATH)
+        cls.ensemble = TreeEnsemble.from_booster(cls.model)
+
+    def test_compiled_layout(self):
+        """All boosting rounds are packed into the flat node arrays"""
+        self.assertEqual(self.ensemble.num_trees, self.model.get_booster().num_boosted_rounds())
+        self.assertEqual(self.ensemble.num_features, 11)
+        self.assertEqual(len(self.ensemble.feature), len(self.ensemble.threshold))
+
+    def test_matches_booster(self):
+        """Probabilities agree with XGBClassifier.predict_proba, including missing values"""
+        rng = np.random.default_rng(7)
+        X = rng.normal(scale=2.0, size=(2000, 11))
+        X[rng.random(X.shape) < 0.05] = np.nan
+        expected = self.model.predict_proba(X)[:, 1]
+        np.testing.assert_allclose(self.ensemble.predict_proba(X), expected, atol=1e-6)
+
+    def test_single_row(self):
+        """A 1-D feature vector is scored as one row"""
+        x = np.linspace(-1, 1, 11)
+        expected = self.model.predict_proba(x[None, :])[0][1]
+        self.assertAlmostEqual(float(self.ensemble.predict_proba(x)[0]), float(expected), places=6)
+
+    def test_from_file_matches_from_booster(self):
+        x = np.zeros((1, 11))
+        from_file = TreeEnsemble.from_file(MODEL_PATH)
+        self.assertAlmostEqual(float(from_file.predict_proba(x)[0]), float(self.ensemble.predict_proba(x)[0]), places=9)
+
+    def test_engine_switch(self):
+        self.assertEqual(resolve_engine('NumPy'), 'numpy')
+        with self.assertRaises(ValueError):
+            resolve_engine('onnx')
+
+class TestScalerFolding(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = xgb.XGBClassifier()
+        cls.model.load_model(MODEL_PATH)
+        cls.scaler = joblib.load(SCALER_PATH)
+        X, valid = ValorantPredictor()._feature_matrix(historical_samples())
+        cls.X = X[valid]
+        # Current serving path: scale, then predict
+        cls.expected = cls.model.predict_proba(cls.scaler.transform(cls.X))[:, 1]
+
+    def test_folded_booster_parity(self):
+        folded = xgb.XGBClassifier()
+        folded.load_model(MODEL_PATH)
+        self.assertIsNotNone(load_folded_booster(folded, self.scaler))
+        np.testing.assert_allclose(folded.predict_proba(self.X)[:, 1], self.expected, atol=1e-6)
+
+    def test_folded_ensemble_parity(self):
+        ensemble = TreeEnsemble.from_booster(self.model).fold_scaler(*scaler_affine(self.scaler))
+        np.testing.assert_allclose(ensemble.predict_proba(self.X), self.expected, atol=1e-6)
+
+    def test_unfoldable_scaler(self):
+        self.assertIsNone(scaler_affine(None))
+        self.assertIsNone(scaler_affine(object()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Column-wise cleaning shared by the training scripts.
+
+Each function gives the same values as the per-row helpers it replaced
+(clean_percentage / clean_numeric / clean_boolean applied with .apply, and
+the per-column z-score clipping loop), using whole-column string and numeric
+operations instead.
+"""
+import numpy as np
+import pandas as pd
+
+TRUE_VALUES = ['TRUE', '1', 'YES', 'WIN']
+# What float() accepts from stripped text (decimal, exponent, inf/nan); float() strips whitespace itself
+_DIGITS = r'\d+(?:_\d+)*'
+FLOAT_PATTERN = rf'[+-]?(?:(?:{_DIGITS}(?:\.(?:{_DIGITS})?)?|\.{_DIGITS})(?:[eE][+-]?{_DIGITS})?|(?i:inf|infinity|nan))'
+
+
+def _as_text(series):
+    # Same text as str(val) per element; missing values stay missing
+    return series.astype(str).where(series.notna())
+
+
+def _parse_floats(text):
+    """float(text) per element; 0.0 where text is missing or float() would raise"""
+    # Object -> float64 calls float() on each element (to_numeric can be off by an ulp), so
+    # a clean column converts in one pass; only columns with junk pay for the regex check
+    try:
+        return text.fillna('0').astype(object).astype('float64')
+    except (TypeError, ValueError):
+        pass
+    text = text.str.strip()
+    valid = text.str.fullmatch(FLOAT_PATTERN).fillna(False).astype(bool)
+    values = pd.Series(0.0, index=text.index)
+    values[valid] = text[valid].astype(object).astype('float64')
+    return values
+
+
+def clean_percentage(series):
+    """'45%' -> 0.45; missing or unparsable -> 0.0"""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return (series.astype('float64') / 100.0).fillna(0.0)
+    text = _as_text(series).str.replace('%', '', regex=False)
+    return _parse_floats(text) / 100.0
+
+
+def clean_numeric(series):
+    """Number with 'inf' read as 0 ('-inf' -> -0.0); missing or unparsable -> 0.0"""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = series.astype('float64')
+        return values.mask(np.isinf(values), np.copysign(0.0, values)).fillna(0.0)
+    text = _as_text(series).str.replace('inf', '0', regex=False)
+    return _parse_floats(text)
+
+
+def clean_boolean(series):
+    """1 for True / 'TRUE' / '1' / 'YES' / 'WIN' (any case), else 0"""
+    if pd.api.types.is_bool_dtype(series):
+        return series.astype('int64')
+    text = _as_text(series).str.upper().str.strip()
+    return text.isin(TRUE_VALUES).astype('int64')
+
+
+def clip_outliers(X, z=3.0):
+    """Clip every column with a non-zero std to mean +/- z * std (computed before clipping)"""
+    mean, std = X.mean(), X.std()
+    spread = std.where(std > 0)
+    # Infinite bounds leave constant (and all-missing) columns untouched
+    lower = (mean - z * spread).fillna(-np.inf).to_numpy()
+    upper = (mean + z * spread).fillna(np.inf).to_numpy()
+    values = np.clip(X.to_numpy(dtype='float64'), lower, upper)
+    return pd.DataFrame(values, index=X.index, columns=X.columns)
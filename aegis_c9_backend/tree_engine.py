@@ -0,0 +1,283 @@
+import json
+import math
+import os
+import numpy as np
+
+# Inference engines selectable for the win-probability predictors
+ENGINE_XGBOOST = 'xgboost'
+ENGINE_NUMPY = 'numpy'
+ENGINES = (ENGINE_XGBOOST, ENGINE_NUMPY)
+
+
+def resolve_engine(engine=None):
+    """
+    Pick the inference engine: explicit argument first, then the
+    AEGIS_INFERENCE_ENGINE environment variable, then the XGBoost default.
+    """
+    engine = (engine or os.getenv('AEGIS_INFERENCE_ENGINE') or ENGINE_XGBOOST).lower()
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown inference engine '{engine}', expected one of {ENGINES}")
+    return engine
+
+
+class TreeEnsemble:
+    """
+    Flat-array evaluator for a binary:logistic XGBoost gbtree model.
+
+    Every tree is packed into shared node arrays (split feature, threshold,
+    left/right child, default direction, leaf value). Leaves point back at
+    themselves, so all rows walk all trees in lock-step for max_depth
+    vectorized steps with no per-node Python work.
+    """
+
+    def __init__(self, feature, threshold, left, right, default_left, value,
+                 roots, max_depth, base_margin, num_features, dtype=np.float32):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.base_margin = base_margin
+        self.num_features = num_features
+        # XGBoost compares float32 inputs against float32 thresholds
+        self.dtype = dtype
+
+    @classmethod
+    def from_booster(cls, booster):
+        """Compile an xgb.Booster (or anything with get_booster()) into flat arrays."""
+        if hasattr(booster, 'get_booster'):
+            booster = booster.get_booster()
+        return cls.from_json(json.loads(bytes(booster.save_raw(raw_format='json'))))
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r') as f:
+            return cls.from_json(json.load(f))
+
+    @classmethod
+    def from_json(cls, model):
+        """Compile a parsed XGBoost JSON model document."""
+        learner = model['learner']
+        objective = learner['objective']['name']
+        if objective != 'binary:logistic':
+            raise ValueError(f"TreeEnsemble only supports binary:logistic, got '{objective}'")
+        booster = learner['gradient_booster']
+        if booster.get('name') != 'gbtree':
+            raise ValueError(f"TreeEnsemble only supports gbtree boosters, got '{booster.get('name')}'")
+
+        # base_score is stored as a probability; trees add to its logit
+        base_score = float(learner['learner_model_param']['base_score'].strip('[]'))
+        base_margin = math.log(base_score / (1.0 - base_score))
+
+        trees = booster['model']['trees']
+        feature, threshold, left, right, default_left, value = [], [], [], [], [], []
+        roots = []
+        max_depth = 0
+        offset = 0
+        for tree in trees:
+            if any(tree.get('split_type', [])):
+                raise ValueError("Categorical splits are not supported by TreeEnsemble")
+            lc = np.asarray(tree['left_children'], dtype=np.int32)
+            rc = np.asarray(tree['right_children'], dtype=np.int32)
+            cond = np.asarray(tree['split_conditions'], dtype=np.float32)
+            n = len(lc)
+            is_leaf = lc == -1
+            idx = np.arange(n, dtype=np.int32)
+
+            feature.append(np.where(is_leaf, 0, tree['split_indices']).astype(np.int32))
+            threshold.append(np.where(is_leaf, np.inf, cond).astype(np.float32))
+            left.append(np.where(is_leaf, idx, lc) + offset)
+            right.append(np.where(is_leaf, idx, rc) + offset)
+            default_left.append(np.asarray(tree['default_left'], dtype=bool))
+            # split_conditions holds the leaf weight on leaf nodes
+            value.append(np.where(is_leaf, cond, 0.0).astype(np.float64))
+            roots.append(offset)
+            max_depth = max(max_depth, _tree_depth(lc, rc))
+            offset += n
+
+        return cls(
+            feature=np.concatenate(feature),
+            threshold=np.concatenate(threshold),
+            left=np.concatenate(left),
+            right=np.concatenate(right),
+            default_left=np.concatenate(default_left),
+            value=np.concatenate(value),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            base_margin=base_margin,
+            num_features=int(learner['learner_model_param']['num_feature']),
+        )
+
+    @property
+    def num_trees(self):
+        return len(self.roots)
+
+    def _leaves(self, X):
+        """Leaf node index reached by every (row, tree) pair."""
+        X = np.asarray(X, dtype=self.dtype)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != self.num_features:
+            raise ValueError(f"Expected {self.num_features} features, got {X.shape[1]}")
+
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.num_trees)).copy()
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]]
+            go_left = np.where(np.isnan(x), self.default_left[nodes], x < self.threshold[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def fold_scaler(self, center, scale):
+        """
+        Return a copy whose thresholds accept raw (unscaled) features.
+        See fold_thresholds for how the per-feature affine map is folded.
+        """
+        is_split = self.left != np.arange(len(self.left))
+        threshold = self.threshold.astype(np.float64)
+        threshold[is_split] = fold_thresholds(
+            self.threshold[is_split], self.feature[is_split], center, scale
+        )
+        return TreeEnsemble(
+            feature=self.feature,
+            threshold=threshold,
+            left=self.left,
+            right=self.right,
+            default_left=self.default_left,
+            value=self.value,
+            roots=self.roots,
+            max_depth=self.max_depth,
+            base_margin=self.base_margin,
+            num_features=self.num_features,
+            # Folded thresholds are exact float64 boundaries on raw inputs
+            dtype=np.float64,
+        )
+
+    def predict_margin(self, X):
+        return self.value[self._leaves(X)].sum(axis=1) + self.base_margin
+
+    def predict_proba(self, X):
+        """Positive-class probability for each row of X."""
+        return 1.0 / (1.0 + np.exp(-self.predict_margin(X)))
+
+
+def scaler_affine(scaler):
+    """
+    (center, scale) arrays of a fitted RobustScaler or StandardScaler, such
+    that scaler.transform(X) == (X - center) / scale. None if the scaler is
+    missing or not a per-feature affine map.
+    """
+    if scaler is None:
+        return None
+    scale = getattr(scaler, 'scale_', None)
+    if scale is None:
+        return None
+    scale = np.asarray(scale, dtype=np.float64)
+
+    center = None
+    if getattr(scaler, 'with_centering', getattr(scaler, 'with_mean', True)):
+        center = getattr(scaler, 'center_', getattr(scaler, 'mean_', None))
+        if center is None:
+            return None
+    center = np.zeros_like(scale) if center is None else np.asarray(center, dtype=np.float64)
+    return center, scale
+
+
+def fold_thresholds(thresholds, features, center, scale):
+    """
+    Map float32 split thresholds on scaled features to float64 thresholds on
+    raw features.
+
+    The original test is float32((x - c) / s) < t. For s > 0 that is monotone
+    in x, so it is equivalent to x < T for the smallest raw T where the test
+    turns false. T is found by bisection, which also absorbs the float32
+    rounding of the scaled value, so raw scoring matches scale-then-predict
+    exactly for every float64 input.
+    """
+    t = np.asarray(thresholds, dtype=np.float32)
+    c = np.asarray(center, dtype=np.float64)[features]
+    s = np.asarray(scale, dtype=np.float64)[features]
+    if np.any(s <= 0):
+        raise ValueError("Scaler folding requires strictly positive scale factors")
+
+    def goes_left(x):
+        return ((x - c) / s).astype(np.float32) < t
+
+    # lo maps to the float32 just below t (goes left), hi maps to t (goes right)
+    lo = np.nextafter(t, np.float32(-np.inf)).astype(np.float64) * s + c
+    hi = t.astype(np.float64) * s + c
+    # Float64 error can leave either end on the wrong side; widen until bracketed
+    step = np.maximum(np.abs(hi - lo), np.spacing(np.abs(hi)))
+    while True:
+        bad_lo = ~goes_left(lo)
+        bad_hi = goes_left(hi)
+        if not (bad_lo.any() or bad_hi.any()):
+            break
+        lo = np.where(bad_lo, lo - step, lo)
+        hi = np.where(bad_hi, hi + step, hi)
+        step *= 2
+
+    for _ in range(128):
+        mid = lo + (hi - lo) / 2
+        active = (mid > lo) & (mid < hi)
+        if not active.any():
+            break
+        left = goes_left(mid)
+        lo = np.where(active & left, mid, lo)
+        hi = np.where(active & ~left, mid, hi)
+    return hi
+
+
+def fold_scaler_into_model(model, center, scale):
+    """
+    Rewrite the split conditions of a parsed XGBoost JSON model so the
+    booster scores raw features directly. Returns a new document.
+
+    XGBoost keeps thresholds as float32 and casts inputs to float32. Hist
+    split points sit on training values, so each exact raw threshold lies just
+    below such a value; rounding it to the nearest float32 is monotone and keeps
+    that value (and everything below the previous value) on the same branch.
+    Only inputs within half a float32 ulp of a threshold can differ.
+    """
+    model = json.loads(json.dumps(model))
+    for tree in model['learner']['gradient_booster']['model']['trees']:
+        left = np.asarray(tree['left_children'])
+        is_split = left != -1
+        cond = np.asarray(tree['split_conditions'], dtype=np.float32)
+        features = np.asarray(tree['split_indices'])[is_split]
+        cond[is_split] = fold_thresholds(cond[is_split], features, center, scale).astype(np.float32)
+        tree['split_conditions'] = [float(v) for v in cond]
+    return model
+
+
+def load_folded_booster(model, scaler):
+    """
+    Reload an XGBClassifier/Booster in place with the scaler folded into its
+    thresholds. Returns the (center, scale) pair used, or None if the scaler
+    cannot be folded and must still be applied at predict time.
+    """
+    affine = scaler_affine(scaler)
+    if affine is None:
+        return None
+    booster = model.get_booster() if hasattr(model, 'get_booster') else model
+    doc = json.loads(bytes(booster.save_raw(raw_format='json')))
+    folded = fold_scaler_into_model(doc, *affine)
+    model.load_model(bytearray(json.dumps(folded).encode('utf-8')))
+    return affine
+
+
+def _tree_depth(left, right):
+    depth = 0
+    frontier = [0]
+    while frontier:
+        children = []
+        for node in frontier:
+            if left[node] != -1:
+                children.extend((left[node], right[node]))
+        if children:
+            depth += 1
+        frontier = children
+    return depth
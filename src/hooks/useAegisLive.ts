@@ -1,7 +1,11 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useMemo } from 'react';
 import { PlayerData, GameState, Anomaly } from '@/types';
+import { createDeltaDecoder, TelemetryMessage } from '@/utils/jsonPatch';
+import { createFeatureImportanceLoader } from '@/utils/featureImportance';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_BACKEND_URL || 'http://localhost:8000';
+// 'delta' streams keyframes plus JSON-Patch deltas instead of full documents
+const STREAM_MODE = process.env.NEXT_PUBLIC_STREAM_MODE === 'delta' ? 'delta' : 'full';
 
 // LoL Game State Interface (matching Valorant structure)
 interface LoLGameData {
@@ -54,6 +58,7 @@ export const useAegisLive = (teamName: string = 'Cloud9', opponentName: string =
   const [lolGameData, setLolGameData] = useState<LoLGameData | null>(null);
   const [prediction, setPrediction] = useState<LoLPrediction | null>(null);
   const [featureImportance, setFeatureImportance] = useState<FeatureImportance[]>([]);
+  const loadFeatureImportance = useMemo(() => createFeatureImportanceLoader(API_BASE_URL), []);
 
   const fetchLolPredictions = useCallback(async () => {
     try {
@@ -90,9 +95,10 @@ export const useAegisLive = (teamName: string = 'Cloud9', opponentName: string =
         }));
       }
 
-      // Update feature importance
-      if (data.feature_importance) {
-        setFeatureImportance(data.feature_importance);
+      // Update feature importance (referenced by ETag; only re-fetched after a model reload)
+      const features = await loadFeatureImportance(data.feature_importance);
+      if (features) {
+        setFeatureImportance(features);
       }
 
       // Update players
@@ -130,7 +136,7 @@ export const useAegisLive = (teamName: string = 'Cloud9', opponentName: string =
         winProbability: Math.min(95, Math.max(5, prev.winProbability + (Math.random() * 4 - 2)))
       }));
     }
-  }, [teamName, opponentName, game]);
+  }, [teamName, opponentName, game, loadFeatureImportance]);
 
   useEffect(() => {
     // Initial fetch
@@ -148,7 +154,7 @@ export const useAegisLive = (teamName: string = 'Cloud9', opponentName: string =
 
     const connectToStream = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/stream-telemetry`, {
+        const response = await fetch(`${API_BASE_URL}/stream-telemetry?mode=${STREAM_MODE}`, {
           signal: controller.signal
         });
         
@@ -160,19 +166,25 @@ export const useAegisLive = (teamName: string = 'Cloud9', opponentName: string =
         if (!reader) return;
 
         const decoder = new TextDecoder();
+        const decodeDelta = createDeltaDecoder();
+        let buffered = '';
 
         while (isMounted) {
           const { done, value } = await reader.read();
           if (done) break;
 
-          const chunk = decoder.decode(value);
-          const lines = chunk.split('\n');
+          // Frames can span reads; keep the trailing partial line for the next one
+          buffered += decoder.decode(value, { stream: true });
+          const lines = buffered.split('\n');
+          buffered = lines.pop() ?? '';
 
           for (const line of lines) {
             if (!line.trim()) continue;
             try {
-              const data = JSON.parse(line);
+              const message = JSON.parse(line);
+              const data = STREAM_MODE === 'delta' ? decodeDelta(message as TelemetryMessage) : message;
               if (!isMounted) break;
+              if (!data) continue;
 
               setTelemetry(data);
 
@@ -1,5 +1,6 @@
 import { useState, useEffect, useMemo, useCallback } from 'react';
 import { ValorantPlayerData, ValorantGameState } from '@/types/valorant';
+import { createFeatureImportanceLoader } from '@/utils/featureImportance';
 
 // API Base URL - uses environment variable or falls back to localhost for development
 const API_BASE_URL = process.env.NEXT_PUBLIC_BACKEND_URL || 'http://localhost:8000';
@@ -280,6 +281,8 @@ export const useValorantData = (teamName: string = 'Cloud9', opponentName: strin
   );
   const [isConnected, setIsConnected] = useState(false);
 
+  const loadFeatureImportance = useMemo(() => createFeatureImportanceLoader(API_BASE_URL), []);
+
   // Fetch predictions from backend API
   const fetchPredictions = useCallback(async () => {
     try {
@@ -291,6 +294,8 @@ export const useValorantData = (teamName: string = 'Cloud9', opponentName: strin
       
       const data = await response.json();
       setIsConnected(true);
+      // Referenced by ETag; only re-fetched after a model reload
+      const features = await loadFeatureImportance(data.feature_importance);
       
       // Update predictions from backend
       if (data.prediction) {
@@ -308,8 +313,8 @@ export const useValorantData = (teamName: string = 'Cloud9', opponentName: strin
             time: new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' }),
             probability: data.prediction.win_probability
           }],
-          topFeatures: data.feature_importance?.slice(0, 5) || prev.topFeatures,
-          allFeatures: data.feature_importance || prev.allFeatures,
+          topFeatures: features?.slice(0, 5) || prev.topFeatures,
+          allFeatures: features || prev.allFeatures,
         }));
       }
       
@@ -366,7 +371,7 @@ export const useValorantData = (teamName: string = 'Cloud9', opponentName: strin
         };
       });
     }
-  }, [teamName, opponentName]);
+  }, [teamName, opponentName, loadFeatureImportance]);
 
   // Initial fetch and setup polling
   useEffect(() => {
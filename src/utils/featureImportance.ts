@@ -0,0 +1,25 @@
+// Prediction responses reference the model's feature importance instead of
+// embedding it: { url, etag, version } pointing at /api/feature-importance/<game>.
+
+export interface FeatureImportanceRef {
+  url: string;
+  etag: string;
+  version: string | null;
+}
+
+// Fetches the referenced payload when its ETag changes (i.e. after a model
+// reload) and returns its features, or null when nothing changed or the fetch
+// failed. The server sends Cache-Control: no-cache, so the browser revalidates
+// with If-None-Match and a 304 costs no body.
+export const createFeatureImportanceLoader = (baseUrl: string) => {
+  let etag: string | null = null;
+
+  return async (ref?: FeatureImportanceRef): Promise<any[] | null> => {
+    if (!ref || ref.etag === etag) return null;
+    const response = await fetch(`${baseUrl}${ref.url}`);
+    if (!response.ok) return null;
+    const body = await response.json();
+    etag = ref.etag;
+    return body.features;
+  };
+};
@@ -0,0 +1,70 @@
+// Applies the JSON-Patch-style deltas sent by /stream-telemetry?mode=delta
+// ('add', 'remove' and 'replace' with JSON Pointer paths).
+
+export type PatchOperation =
+  | { op: 'add' | 'replace'; path: string; value: unknown }
+  | { op: 'remove'; path: string };
+
+export type TelemetryMessage =
+  | { type: 'keyframe'; seq: number; data: any }
+  | { type: 'delta'; seq: number; ops: PatchOperation[] };
+
+const unescapeToken = (token: string) =>
+  token.replace(/~1/g, '/').replace(/~0/g, '~');
+
+const shallowCopy = (value: any) =>
+  Array.isArray(value) ? [...value] : { ...value };
+
+// Returns a new document; only containers along each patched path are copied,
+// so unchanged branches keep their identity for React memoization.
+export const applyPatch = (doc: any, ops: PatchOperation[]): any => {
+  let root = doc;
+  for (const operation of ops) {
+    if (operation.path === '') {
+      root = operation.op === 'remove' ? undefined : operation.value;
+      continue;
+    }
+    const tokens = operation.path.split('/').slice(1).map(unescapeToken);
+    root = shallowCopy(root);
+    let parent = root;
+    for (const token of tokens.slice(0, -1)) {
+      const key = Array.isArray(parent) ? Number(token) : token;
+      parent[key] = shallowCopy(parent[key]);
+      parent = parent[key];
+    }
+    const last = tokens[tokens.length - 1];
+    if (Array.isArray(parent)) {
+      const index = last === '-' ? parent.length : Number(last);
+      if (operation.op === 'add') parent.splice(index, 0, operation.value);
+      else if (operation.op === 'remove') parent.splice(index, 1);
+      else parent[index] = operation.value;
+    } else if (operation.op === 'remove') {
+      delete parent[last];
+    } else {
+      parent[last] = operation.value;
+    }
+  }
+  return root;
+};
+
+// Tracks the current document of a delta stream. Returns the updated document,
+// or null while waiting for a keyframe after a sequence gap.
+export const createDeltaDecoder = () => {
+  let doc: any = null;
+  let lastSeq: number | null = null;
+
+  return (message: TelemetryMessage): any => {
+    if (message.type === 'keyframe') {
+      doc = message.data;
+    } else if (doc !== null && lastSeq !== null && message.seq === lastSeq + 1) {
+      doc = applyPatch(doc, message.ops);
+    } else {
+      // Missed a frame: the server resends a keyframe after any gap
+      doc = null;
+      lastSeq = null;
+      return null;
+    }
+    lastSeq = message.seq;
+    return doc;
+  };
+};